@@ -1,9 +1,10 @@
 # AI Prompts
-from .scenario_ranking import SCENARIO_RANKING_PROMPT, format_scenario_ranking_prompt
+from .scenario_ranking import SCENARIO_RANKING_PROMPT, format_scenario_line, format_scenario_ranking_prompt
 from .lesson_personalization import LESSON_PERSONALIZATION_PROMPT
 
 __all__ = [
     'SCENARIO_RANKING_PROMPT',
+    'format_scenario_line',
     'format_scenario_ranking_prompt',
     'LESSON_PERSONALIZATION_PROMPT',
 ]
@@ -44,6 +44,12 @@ Only include scenario IDs that exist in the list. Return ALL IDs in ranked order
 """
 
 
+def format_scenario_line(scenario: Dict[str, Any]) -> str:
+    """One scenario as listed in the prompt"""
+    tags_str = ', '.join(scenario.get('tags', []))
+    return f"- ID {scenario['id']}: {scenario['name']} (tags: {tags_str})"
+
+
 def format_scenario_ranking_prompt(
     user_profile: Dict[str, Any],
     scenarios: List[Dict[str, Any]]
@@ -79,10 +85,7 @@ def format_scenario_ranking_prompt(
     hobbies_str = ', '.join(hobbies) if hobbies else "Not specified"
     
     # Format scenarios list
-    scenarios_lines = []
-    for s in scenarios:
-        tags_str = ', '.join(s.get('tags', []))
-        scenarios_lines.append(f"- ID {s['id']}: {s['name']} (tags: {tags_str})")
+    scenarios_lines = [format_scenario_line(s) for s in scenarios]
     
     return SCENARIO_RANKING_PROMPT.format(
         cefr_level=user_profile.get('cefr_level', 'A1'),
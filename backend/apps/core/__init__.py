@@ -0,0 +1,2 @@
+# Core
+# Cross-app HTTP plumbing: catalogue version and conditional GET
@@ -0,0 +1,15 @@
+"""
+Core App Configuration
+"""
+
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Core'
+
+    def ready(self):
+        from .catalogue import connect_signals
+        connect_signals()
@@ -0,0 +1,86 @@
+"""
+Catalogue Version
+One cheap token that changes whenever near-static content changes
+"""
+import hashlib
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+# Models whose rows make up "the catalogue"
+CATALOGUE_MODELS = [
+    'memory_palace.Scenario',
+    'memory_palace.Milestone',
+    'memory_palace.Tag',
+    'onboarding.OnboardingStep',
+    'onboarding.VAKAssessmentQuestion',
+]
+
+
+class CatalogueVersion:
+    """
+    Validator for responses built only from catalogue models.
+
+    The version hashes max(updated_at) and the row count of every
+    catalogue model, plus the row count and max id of the scenario-tag
+    link table (tagging a scenario saves neither side). Everything comes
+    from the database, so every process derives the same version, and
+    edits made outside the app servers (scripts) count too; bulk
+    queryset.update() calls must set updated_at themselves. The version
+    is kept in the shared cache for TTL_SECONDS; post_save / post_delete
+    on a catalogue model drop it after commit, so app edits show at
+    once and script edits within TTL_SECONDS.
+
+    Usage:
+        catalogue_version.get()   # e.g. '3f2a9c0d1b7e4a58'
+        catalogue_version.bump()  # called by the signals
+    """
+
+    VERSION_KEY = 'catalogue:version'
+    TTL_SECONDS = 60
+
+    def get(self) -> str:
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            version = self._compute()
+            cache.set(self.VERSION_KEY, version, self.TTL_SECONDS)
+        return version
+
+    def bump(self):
+        cache.delete(self.VERSION_KEY)
+
+    def _compute(self) -> str:
+        parts = []
+        for label in CATALOGUE_MODELS:
+            stats = apps.get_model(label).objects.aggregate(updated=Max('updated_at'), count=Count('pk'))
+            parts.append(f"{stats['updated'].isoformat() if stats['updated'] else ''}:{stats['count']}")
+
+        links = apps.get_model('memory_palace.Scenario').tags.through.objects.aggregate(
+            last=Max('pk'), count=Count('pk')
+        )
+        parts.append(f"{links['last'] or 0}:{links['count']}")
+
+        return hashlib.md5('|'.join(parts).encode()).hexdigest()[:16]
+
+
+catalogue_version = CatalogueVersion()
+
+
+def _bump_catalogue(sender, **kwargs):
+    # After commit: a request computing the version before then would
+    # cache it with the old content
+    transaction.on_commit(catalogue_version.bump)
+
+
+def connect_signals():
+    for label in CATALOGUE_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(_bump_catalogue, sender=model, dispatch_uid=f'catalogue:save:{label}')
+        post_delete.connect(_bump_catalogue, sender=model, dispatch_uid=f'catalogue:delete:{label}')
+
+    # Tagging a scenario saves neither the scenario nor the tag
+    scenario = apps.get_model('memory_palace.Scenario')
+    m2m_changed.connect(_bump_catalogue, sender=scenario.tags.through, dispatch_uid='catalogue:scenario_tags')
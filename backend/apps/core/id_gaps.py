@@ -0,0 +1,69 @@
+"""
+Id Gap Tracking
+Reads an append-only table by primary key without losing late commits
+"""
+import time
+from operator import attrgetter
+from typing import Callable, Dict, List, Tuple
+
+
+class IdGapTracker:
+    """
+    Incremental reader for tables consumed by ascending id.
+
+    Ids are assigned at insert but become visible at commit, so a reader
+    can see id 12 while 11 belongs to a transaction that is still open.
+    Advancing a plain `id > position` watermark past 11 would skip it
+    forever. Instead, every id missing below the newest one read is kept
+    as a gap (id -> first seen, epoch seconds) next to the position and
+    looked up again on each batch until it shows up. Gaps older than
+    timeout_seconds are dropped: those inserts were rolled back.
+
+    A jump of more than MAX_GAP_SPAN ids at once (deleted rows, a reset
+    sequence) is not tracked.
+
+    Usage:
+        rows, position, gaps = IdGapTracker().next_batch(queryset, mark.position, mark.gaps, 1000)
+    """
+
+    TIMEOUT_SECONDS = 60 * 60
+    MAX_GAP_SPAN = 10000
+
+    def __init__(self, timeout_seconds: float = None):
+        self.timeout_seconds = timeout_seconds or self.TIMEOUT_SECONDS
+
+    def next_batch(
+        self,
+        queryset,
+        position: int,
+        gaps: Dict[str, float],
+        batch_size: int,
+        id_of: Callable = attrgetter('id'),
+    ) -> Tuple[List, int, Dict[str, float]]:
+        """
+        Rows that filled a gap (ascending id), then up to batch_size rows
+        after position. Returns (rows, new position, new gaps); the
+        caller stores both with the work done on the rows.
+        """
+        now = time.time()
+        pending = {
+            int(row_id): seen for row_id, seen in (gaps or {}).items()
+            if now - seen < self.timeout_seconds
+        }
+
+        late = list(queryset.filter(id__in=list(pending)).order_by('id')) if pending else []
+        for row in late:
+            pending.pop(id_of(row), None)
+
+        rows = list(queryset.filter(id__gt=position).order_by('id')[:batch_size])
+        expected = position + 1
+        for row in rows:
+            row_id = id_of(row)
+            if row_id - expected <= self.MAX_GAP_SPAN:
+                for missing in range(expected, row_id):
+                    pending[missing] = now
+            expected = row_id + 1
+
+        if rows:
+            position = id_of(rows[-1])
+        return late + rows, position, {str(row_id): seen for row_id, seen in pending.items()}
@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.memory_palace.models import Scenario, Tag
+from apps.onboarding.models import OnboardingStep
+
+from .catalogue import catalogue_version
+from .http_cache import conditional_get
+
+User = get_user_model()
+
+state = {'version': '1', 'calls': 0, 'status': status.HTTP_200_OK}
+
+
+def version(request, **kwargs) -> str:
+    return state['version']
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@conditional_get(version, max_age=60)
+def catalogue_view(request):
+    state['calls'] += 1
+    return Response({'version': state['version']}, status=state['status'])
+
+
+@api_view(['GET'])
+@conditional_get(version, private=True)
+def private_view(request):
+    return Response({'user': request.user.pk})
+
+
+class ConditionalGetTests(SimpleTestCase):
+
+    def setUp(self):
+        state.update(version='1', calls=0, status=status.HTTP_200_OK)
+        self.factory = APIRequestFactory()
+
+    def get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return catalogue_view(self.factory.get('/catalogue/', **headers))
+
+    def test_matching_etag_returns_304_without_running_the_view(self):
+        first = self.get()
+
+        second = self.get(first['ETag'])
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second['Cache-Control'], 'public, max-age=60, must-revalidate')
+        self.assertEqual(state['calls'], 1)
+
+    def test_changed_validator_changes_the_etag(self):
+        first = self.get()
+        state['version'] = '2'
+
+        second = self.get(first['ETag'])
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(state['calls'], 2)
+
+    def test_error_responses_are_not_tagged(self):
+        state['status'] = status.HTTP_404_NOT_FOUND
+
+        response = self.get()
+
+        self.assertFalse(response.has_header('ETag'))
+
+
+class PrivateConditionalGetTests(TestCase):
+
+    def test_etag_differs_per_user(self):
+        factory = APIRequestFactory()
+        etags = []
+        for username in ('ana', 'ben'):
+            request = factory.get('/progress/')
+            force_authenticate(request, user=User.objects.create_user(username=username, password='x'))
+            response = private_view(request)
+            self.assertIn('Authorization', response['Vary'])
+            etags.append(response['ETag'])
+
+        self.assertNotEqual(etags[0], etags[1])
+
+
+class CatalogueVersionTests(TestCase):
+
+    def setUp(self):
+        cache.delete(catalogue_version.VERSION_KEY)
+        self.tag = Tag.objects.create(type='domain', value='food')
+        self.scenario = Scenario.objects.create(name='Restaurant', slug='restaurant', icon='', description='')
+
+    def expire(self):
+        """What another process sees once its cached version expires"""
+        cache.delete(catalogue_version.VERSION_KEY)
+        return catalogue_version.get()
+
+    def test_edits_without_signals_change_the_version(self):
+        before = self.expire()
+
+        Tag.objects.filter(pk=self.tag.pk).update(display_name='Comida', updated_at=timezone.now())
+
+        self.assertNotEqual(self.expire(), before)
+
+    def test_every_catalogue_model_counts(self):
+        before = self.expire()
+
+        OnboardingStep.objects.create(
+            order=1, step_type='welcome', title='Welcome', description='', component_name='Welcome',
+        )
+
+        self.assertNotEqual(self.expire(), before)
+
+    def test_tagging_a_scenario_changes_the_version(self):
+        travel = Tag.objects.create(type='domain', value='travel')
+        before = self.expire()
+        self.scenario.tags.add(self.tag)
+        tagged = self.expire()
+        self.scenario.tags.remove(self.tag)
+        self.scenario.tags.add(travel)
+
+        self.assertNotEqual(tagged, before)
+        self.assertNotEqual(self.expire(), tagged)  # same count, new link
+
+    def test_cached_version_is_dropped_after_commit(self):
+        cached = catalogue_version.get()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.tag.save()
+        self.assertEqual(catalogue_version.get(), cached)  # not committed yet
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(catalogue_version.get(), cached)
@@ -0,0 +1,2 @@
+# Learning Event Log
+# Append-only stream of learning facts, read by projection consumers
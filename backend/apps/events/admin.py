@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import ConsumerOffset, LearningEvent
+
+
+@admin.register(LearningEvent)
+class LearningEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'user', 'created_at']
+    list_filter = ['kind']
+    raw_id_fields = ['user']
+
+
+@admin.register(ConsumerOffset)
+class ConsumerOffsetAdmin(admin.ModelAdmin):
+    list_display = ['name', 'position', 'updated_at']
@@ -0,0 +1,50 @@
+"""
+Advance event log consumers, or rebuild their projections from event zero.
+Run with: python manage.py run_event_consumers [name ...] [--rebuild] [--follow 5]
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.services import ConsumerRunner, get_consumers
+
+
+class Command(BaseCommand):
+    help = 'Apply new learning events to the configured projections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*',
+                            help='Consumers to run (default: all configured)')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Empty the projections and replay the whole log')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Events per transaction')
+        parser.add_argument('--follow', type=float, default=None, metavar='SECONDS',
+                            help='Keep polling the log at this interval')
+
+    def handle(self, *args, **options):
+        consumers = get_consumers()
+        names = options['names'] or list(consumers)
+
+        unknown = set(names) - set(consumers)
+        if unknown:
+            raise CommandError(f"Unknown consumers: {', '.join(sorted(unknown))}")
+
+        runner = ConsumerRunner(batch_size=options['batch_size'])
+
+        if options['rebuild']:
+            for name in names:
+                read = runner.rebuild(consumers[name])
+                self.stdout.write(self.style.SUCCESS(f"Rebuilt {name} from {read} events"))
+            return
+
+        while True:
+            for name in names:
+                read = runner.run(consumers[name])
+                if read or options['follow'] is None:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{name}: applied {read} events, {runner.lag(consumers[name])} pending"
+                    ))
+            if options['follow'] is None:
+                return
+            time.sleep(options['follow'])
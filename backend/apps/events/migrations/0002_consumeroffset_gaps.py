@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consumeroffset',
+            name='gaps',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
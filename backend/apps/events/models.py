@@ -0,0 +1,58 @@
+"""
+Event Log Models
+"""
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class LearningEvent(models.Model):
+    """
+    One learning fact, appended in the same transaction as the write it
+    describes and never updated.
+
+    Compact on purpose: small-int kind, a short JSON payload and no
+    secondary indexes - consumers only ever scan by primary key.
+    """
+
+    class Kind(models.IntegerChoices):
+        ATTEMPT_RECORDED = 1, 'Attempt recorded'
+        MILESTONE_COMPLETED = 2, 'Milestone completed'
+        REVIEW_GRADED = 3, 'Review graded'
+        XP_GRANTED = 4, 'XP granted'
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='learning_events',
+        db_index=False,  # read by id, never by user
+    )
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'learning_event_log'
+
+    def __str__(self):
+        return f"#{self.id} {self.get_kind_display()} (user {self.user_id})"
+
+
+class ConsumerOffset(models.Model):
+    """
+    Last event id a consumer has applied to its projection, plus the ids
+    below it not committed yet when it was read (see apps.core.id_gaps).
+    Advanced in the same transaction as the projection writes.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    position = models.BigIntegerField(default=0)
+    gaps = models.JSONField(default=dict, blank=True)  # id -> first seen (epoch seconds)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'event_consumer_offsets'
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
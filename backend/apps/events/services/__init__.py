@@ -0,0 +1,12 @@
+# Event Log Services
+from .consumers import ConsumerRunner, EventConsumer, add_counters, get_consumers
+from .log import EventLog, event_log
+
+__all__ = [
+    'ConsumerRunner',
+    'EventConsumer',
+    'add_counters',
+    'get_consumers',
+    'EventLog',
+    'event_log',
+]
@@ -0,0 +1,175 @@
+"""
+Event Consumers
+Batch readers that keep projections in step with the event log
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from apps.core.id_gaps import IdGapTracker
+from ..models import ConsumerOffset, LearningEvent
+
+
+class EventConsumer:
+    """
+    Base class for a projection fed by the event log.
+
+    Subclasses set a unique `name`, the event `kinds` they care about
+    (empty: all) and implement handle() / reset(). handle() runs in the
+    transaction that advances the consumer's offset, so each event is
+    applied to the projection exactly once.
+    """
+
+    name: str = None
+    kinds: Sequence[int] = ()
+
+    def handle(self, events: List[LearningEvent]):
+        """
+        Apply a batch of events (ascending id) to the projection. Events
+        that committed late arrive after ones with higher ids.
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        """Empty the projection before a rebuild from event zero"""
+        raise NotImplementedError
+
+    def wants(self, event: LearningEvent) -> bool:
+        return not self.kinds or event.kind in self.kinds
+
+
+def get_consumers() -> Dict[str, EventConsumer]:
+    """Consumers listed in settings.EVENT_LOG['consumers'], by name"""
+    paths = getattr(settings, 'EVENT_LOG', {}).get('consumers', [])
+    consumers = [import_string(path)() for path in paths]
+    return {consumer.name: consumer for consumer in consumers}
+
+
+class ConsumerRunner:
+    """
+    Moves consumers forward through the event log.
+
+    Each batch locks the consumer's offset row, reads the next events by
+    primary key and advances the offset with the projection writes in
+    one transaction. Ids skipped below the offset (inserts not committed
+    yet when the batch was read) are stored with it and read again by
+    later batches until they show up, see IdGapTracker.
+
+    Usage:
+        runner = ConsumerRunner()
+        runner.run_all()                          # every configured consumer
+        runner.rebuild(get_consumers()['learning_stats'])
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, batch_size: int = None):
+        config = getattr(settings, 'EVENT_LOG', {})
+        self.batch_size = batch_size or config.get('batch_size', self.BATCH_SIZE)
+        self.gap_tracker = IdGapTracker()
+
+    def run_all(self, names: Iterable[str] = None, max_batches: int = None) -> Dict[str, int]:
+        """Run the named (default: all) consumers. Returns events read per consumer."""
+        consumers = get_consumers()
+        names = list(names) if names else list(consumers)
+
+        unknown = set(names) - set(consumers)
+        if unknown:
+            raise ValueError(f"Unknown event consumers: {', '.join(sorted(unknown))}")
+
+        return {name: self.run(consumers[name], max_batches) for name in names}
+
+    def run(self, consumer: EventConsumer, max_batches: int = None) -> int:
+        """Process batches until caught up. Returns events read."""
+        read = batches = 0
+        while max_batches is None or batches < max_batches:
+            count = self._run_batch(consumer)
+            if not count:
+                break
+            read += count
+            batches += 1
+        return read
+
+    def rebuild(self, consumer: EventConsumer, max_batches: int = None) -> int:
+        """Empty the projection, rewind to event zero and replay"""
+        with transaction.atomic():
+            offset = self._lock_offset(consumer)
+            consumer.reset()
+            offset.position, offset.gaps = 0, {}
+            offset.save(update_fields=['position', 'gaps', 'updated_at'])
+        return self.run(consumer, max_batches)
+
+    def lag(self, consumer: EventConsumer) -> int:
+        """Events in the log after the consumer's offset"""
+        position = (
+            ConsumerOffset.objects.filter(name=consumer.name)
+            .values_list('position', flat=True).first()
+        ) or 0
+        return LearningEvent.objects.filter(id__gt=position).count()
+
+    @transaction.atomic
+    def _run_batch(self, consumer: EventConsumer) -> int:
+        offset = self._lock_offset(consumer)
+
+        events, position, gaps = self.gap_tracker.next_batch(
+            LearningEvent.objects.all(), offset.position, offset.gaps, self.batch_size
+        )
+        if not events:
+            if gaps != offset.gaps:  # expired gaps
+                offset.gaps = gaps
+                offset.save(update_fields=['gaps', 'updated_at'])
+            return 0
+
+        relevant = [e for e in events if consumer.wants(e)]
+        if relevant:
+            consumer.handle(relevant)
+
+        offset.position, offset.gaps = position, gaps
+        offset.save(update_fields=['position', 'gaps', 'updated_at'])
+        return len(events)
+
+    @staticmethod
+    def _lock_offset(consumer: EventConsumer) -> ConsumerOffset:
+        offset, _ = ConsumerOffset.objects.select_for_update().get_or_create(name=consumer.name)
+        return offset
+
+
+# ----------------------------------------------------------------------
+# Projection helpers
+# ----------------------------------------------------------------------
+
+MAX_ROWS_PER_STATEMENT = 500
+
+
+def add_counters(model, key_columns: Sequence[str], fields: Sequence[str],
+                 rows: List[Tuple[tuple, dict]]):
+    """
+    Additive upsert of counter rows: ((key values), {field: delta}).
+    One INSERT ... ON CONFLICT DO UPDATE per MAX_ROWS_PER_STATEMENT rows.
+    """
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    keys = [qn(c) for c in key_columns]
+    columns = [qn(f) for f in fields]
+
+    for start in range(0, len(rows), MAX_ROWS_PER_STATEMENT):
+        chunk = rows[start:start + MAX_ROWS_PER_STATEMENT]
+
+        first = 'SELECT ' + ', '.join(f'%s AS {c}' for c in keys + columns)
+        other = 'SELECT ' + ', '.join(['%s'] * (len(keys) + len(columns)))
+        source = ' UNION ALL '.join([first] + [other] * (len(chunk) - 1))
+
+        params = []
+        for key, counts in chunk:
+            params += list(key) + [counts.get(f, 0) for f in fields]
+
+        sql = (
+            f"INSERT INTO {table} ({', '.join(keys + columns)}) "
+            f"SELECT * FROM ({source}) v WHERE 1=1 "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+            + ', '.join(f"{c} = {table}.{c} + EXCLUDED.{c}" for c in columns)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
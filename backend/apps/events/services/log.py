@@ -0,0 +1,44 @@
+"""
+Event Log
+Appends learning events; the only write hot paths make for projections
+"""
+from typing import Iterable, Tuple
+
+from django.utils import timezone
+
+from ..models import LearningEvent
+
+# (kind, user or user_id, payload)
+Event = Tuple[int, object, dict]
+
+
+class EventLog:
+    """
+    Append-only writer for LearningEvent.
+
+    Call it inside the transaction of the write being described, so an
+    event exists exactly when its write committed. Consumers turn the
+    stream into projections later (see ConsumerRunner).
+
+    Usage:
+        event_log.append(LearningEvent.Kind.XP_GRANTED, user, {'amount': 10, 'source': 'exercise'})
+        event_log.append_many([(kind, user_id, payload), ...])
+    """
+
+    MAX_ROWS_PER_STATEMENT = 500
+
+    def append(self, kind: int, user, payload: dict):
+        self.append_many([(kind, user, payload)])
+
+    def append_many(self, events: Iterable[Event]) -> int:
+        """Append a batch in one INSERT per MAX_ROWS_PER_STATEMENT events"""
+        now = timezone.now()
+        rows = [
+            LearningEvent(kind=kind, user_id=getattr(user, 'id', user), payload=payload, created_at=now)
+            for kind, user, payload in events
+        ]
+        LearningEvent.objects.bulk_create(rows, batch_size=self.MAX_ROWS_PER_STATEMENT)
+        return len(rows)
+
+
+event_log = EventLog()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WordOrderExercise, FillBlankExercise, MultipleChoiceExercise, MatchingExercise, ExerciseAttempt
+from .models import WordOrderExercise, FillBlankExercise, MultipleChoiceExercise, MatchingExercise, ExerciseStats, UserTopicAbility
 
 
 @admin.register(WordOrderExercise)
@@ -30,8 +30,15 @@ class MatchingExerciseAdmin(admin.ModelAdmin):
     search_fields = ['context']
 
 
-@admin.register(ExerciseAttempt)
-class ExerciseAttemptAdmin(admin.ModelAdmin):
-    list_display = ['id', 'user', 'exercise_type', 'exercise_id', 'is_correct', 'xp_earned', 'completed_at']
-    list_filter = ['exercise_type', 'is_correct', 'completed_at']
+@admin.register(ExerciseStats)
+class ExerciseStatsAdmin(admin.ModelAdmin):
+    list_display = ['exercise_type', 'exercise_id', 'attempts', 'correct', 'calibrated_difficulty', 'updated_at']
+    list_filter = ['exercise_type']
+    readonly_fields = ['time_histogram', 'updated_at']
+
+
+@admin.register(UserTopicAbility)
+class UserTopicAbilityAdmin(admin.ModelAdmin):
+    list_display = ['user', 'grammar_topic', 'rating', 'attempts', 'updated_at']
+    list_filter = ['grammar_topic']
     search_fields = ['user__username']
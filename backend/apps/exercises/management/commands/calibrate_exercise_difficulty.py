@@ -0,0 +1,33 @@
+"""
+Roll new exercise attempts into ExerciseStats and recalibrate difficulty.
+Run with: python manage.py calibrate_exercise_difficulty
+"""
+from django.core.management.base import BaseCommand
+
+from apps.exercises.services import DifficultyCalibrator
+
+
+class Command(BaseCommand):
+    help = 'Incrementally calibrate exercise difficulty from new attempts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Attempts read per batch')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Stop after this many batches')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Drop stats and recalibrate from the first attempt')
+
+    def handle(self, *args, **options):
+        calibrator = DifficultyCalibrator(batch_size=options['batch_size'])
+
+        if options['rebuild']:
+            calibrator.reset()
+            self.stdout.write('Stats cleared, recalibrating from scratch')
+
+        summary = calibrator.run(max_batches=options['max_batches'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {summary['attempts']} attempts, "
+            f"{summary['stats']} stats rows updated"
+        ))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalibrationWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExerciseStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exercise_type', models.CharField(max_length=50)),
+                ('exercise_id', models.PositiveIntegerField()),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('attempts_with_hints', models.PositiveIntegerField(default=0)),
+                ('time_histogram', models.JSONField(default=list)),
+                ('calibrated_difficulty', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Exercise Stats',
+                'verbose_name_plural': 'Exercise Stats',
+                'unique_together': {('exercise_type', 'exercise_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_grammartopic_grammarlesson_milestonegrammar_and_more'),
+        ('exercises', '0002_exercisestats_calibrationwatermark'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTopicAbility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(default=0.0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('grammar_topic', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='user_abilities', to='content.grammartopic')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='topic_abilities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Topic Ability',
+                'verbose_name_plural': 'User Topic Abilities',
+                'unique_together': {('user', 'grammar_topic')},
+            },
+        ),
+    ]
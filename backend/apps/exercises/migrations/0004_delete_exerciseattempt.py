@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0003_usertopicability'),
+        # Rows are copied into progress.AttemptLog first
+        ('progress', '0003_copy_legacy_attempts'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='ExerciseAttempt',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0004_delete_exerciseattempt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calibrationwatermark',
+            name='gaps',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
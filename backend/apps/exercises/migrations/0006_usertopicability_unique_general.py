@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:13
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicate_general_rows(apps, schema_editor):
+    """Keep the most-practised general row per user (duplicates came from racing first answers)"""
+    UserTopicAbility = apps.get_model('exercises', 'UserTopicAbility')
+    general = UserTopicAbility.objects.filter(grammar_topic__isnull=True)
+
+    duplicated = general.values('user_id').annotate(rows=Count('id')).filter(rows__gt=1)
+    for user_id in duplicated.values_list('user_id', flat=True):
+        keep = general.filter(user_id=user_id).order_by('-attempts', 'id').first()
+        general.filter(user_id=user_id).exclude(id=keep.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_grammartopic_grammarlesson_milestonegrammar_and_more'),
+        ('exercises', '0005_calibrationwatermark_gaps'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='usertopicability',
+            unique_together=set(),
+        ),
+        migrations.RunPython(drop_duplicate_general_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='usertopicability',
+            constraint=models.UniqueConstraint(condition=models.Q(('grammar_topic__isnull', False)), fields=('user', 'grammar_topic'), name='unique_user_topic_ability'),
+        ),
+        migrations.AddConstraint(
+            model_name='usertopicability',
+            constraint=models.UniqueConstraint(condition=models.Q(('grammar_topic__isnull', True)), fields=('user',), name='unique_user_general_ability'),
+        ),
+    ]
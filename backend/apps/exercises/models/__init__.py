@@ -6,6 +6,8 @@ from .word_order import WordOrderExercise
 from .fill_blank import FillBlankExercise
 from .multiple_choice import MultipleChoiceExercise
 from .matching import MatchingExercise
+from .stats import ExerciseStats, CalibrationWatermark
+from .ability import UserTopicAbility
 
 __all__ = [
     'ExerciseBase',
@@ -14,4 +16,7 @@ __all__ = [
     'FillBlankExercise', 
     'MultipleChoiceExercise',
     'MatchingExercise',
+    'ExerciseStats',
+    'CalibrationWatermark',
+    'UserTopicAbility',
 ]
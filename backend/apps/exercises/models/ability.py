@@ -0,0 +1,48 @@
+"""
+User Topic Ability - Per-user skill estimate used by adaptive selection
+"""
+from django.db import models
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class UserTopicAbility(models.Model):
+    """
+    Elo/IRT ability of a user on one grammar topic (logit scale).
+    A row with no grammar_topic holds the ability for untagged exercises.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='topic_abilities')
+    grammar_topic = models.ForeignKey(
+        'content.GrammarTopic',
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='user_abilities'
+    )
+
+    # 0.0 = even odds on an exercise of average difficulty
+    rating = models.FloatField(default=0.0)
+    attempts = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'grammar_topic'],
+                condition=models.Q(grammar_topic__isnull=False),
+                name='unique_user_topic_ability',
+            ),
+            # NULLs never conflict, so the general row needs its own constraint
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(grammar_topic__isnull=True),
+                name='unique_user_general_ability',
+            ),
+        ]
+        verbose_name = 'User Topic Ability'
+        verbose_name_plural = 'User Topic Abilities'
+
+    def __str__(self):
+        topic = self.grammar_topic.slug if self.grammar_topic_id else 'general'
+        return f"{self.user.username} - {topic}: {self.rating:.2f}"
@@ -2,10 +2,6 @@
 Base Exercise Model - Abstract base for all exercise types
 """
 from django.db import models
-from django.contrib.auth import get_user_model
-from django.utils import timezone
-
-User = get_user_model()
 
 
 class ExerciseBase(models.Model):
@@ -78,53 +74,15 @@ class ExerciseBase(models.Model):
         raise NotImplementedError("Subclasses must implement get_display_data()")
 
 
-class ExerciseAttempt(models.Model):
+class ExerciseAttempt:
     """
-    Tracks user attempts at exercises.
-    Generic relation to any exercise type.
+    Compatibility shim - attempts are stored in progress.AttemptLog.
+    Keeps the old ExerciseAttempt.record_attempt() entry point working.
     """
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='exercise_attempts')
-    
-    # Generic reference to any exercise type
-    exercise_type = models.CharField(max_length=50)  # 'word_order', 'fill_blank', etc.
-    exercise_id = models.PositiveIntegerField()
-    
-    # Attempt data
-    user_answer = models.JSONField()  # What the user submitted
-    is_correct = models.BooleanField()
-    
-    # Timing
-    started_at = models.DateTimeField()
-    completed_at = models.DateTimeField(auto_now_add=True)
-    time_spent_seconds = models.PositiveIntegerField(default=0)
-    
-    # Rewards
-    xp_earned = models.PositiveIntegerField(default=0)
-    
-    class Meta:
-        ordering = ['-completed_at']
-        indexes = [
-            models.Index(fields=['user', 'exercise_type', 'exercise_id']),
-            models.Index(fields=['user', 'completed_at']),
-        ]
-    
-    def __str__(self):
-        status = "✅" if self.is_correct else "❌"
-        return f"{self.user.username} - {self.exercise_type} #{self.exercise_id} {status}"
     
-    @classmethod
-    def record_attempt(cls, user, exercise, user_answer, is_correct, started_at):
+    @staticmethod
+    def record_attempt(user, exercise, user_answer, is_correct, started_at):
         """Helper to record an attempt"""
-        time_spent = int((timezone.now() - started_at).total_seconds())
-        xp = exercise.xp_reward if is_correct else 0
+        from apps.progress.models import AttemptLog
         
-        return cls.objects.create(
-            user=user,
-            exercise_type=exercise.__class__.__name__.lower().replace('exercise', ''),
-            exercise_id=exercise.id,
-            user_answer=user_answer,
-            is_correct=is_correct,
-            started_at=started_at,
-            time_spent_seconds=time_spent,
-            xp_earned=xp,
-        )
+        return AttemptLog.record(user, exercise, user_answer, is_correct, started_at)
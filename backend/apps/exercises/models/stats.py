@@ -0,0 +1,97 @@
+"""
+Exercise Stats - Running per-exercise statistics used to calibrate difficulty
+"""
+from django.db import models
+
+
+class ExerciseStats(models.Model):
+    """
+    Aggregated attempt statistics for one exercise.
+    Maintained incrementally by the difficulty calibrator, never
+    recomputed from the full attempt history.
+    """
+    # Upper bounds (seconds) of the time histogram buckets.
+    # The last bucket catches everything above the final bound.
+    TIME_BUCKETS = [5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300]
+
+    # Generic reference to any exercise type (same keys as attempts)
+    exercise_type = models.CharField(max_length=50)
+    exercise_id = models.PositiveIntegerField()
+
+    # Counters
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    attempts_with_hints = models.PositiveIntegerField(default=0)
+
+    # Time spent histogram, one count per TIME_BUCKETS entry (+1 overflow)
+    time_histogram = models.JSONField(default=list)
+
+    # Difficulty on the 1.0-5.0 scale of ExerciseBase.DIFFICULTY_CHOICES.
+    # Kept here: the exercise's own difficulty stays as authored
+    calibrated_difficulty = models.FloatField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['exercise_type', 'exercise_id']
+        verbose_name = 'Exercise Stats'
+        verbose_name_plural = 'Exercise Stats'
+
+    def __str__(self):
+        return f"{self.exercise_type} #{self.exercise_id} ({self.attempts} attempts)"
+
+    @property
+    def success_rate(self):
+        return self.correct / self.attempts if self.attempts else 0.0
+
+    @property
+    def hint_rate(self):
+        return self.attempts_with_hints / self.attempts if self.attempts else 0.0
+
+    @property
+    def median_time_seconds(self):
+        """Median time spent, resolved to the upper bound of its bucket"""
+        return self.histogram_median(self.time_histogram)
+
+    @classmethod
+    def empty_histogram(cls):
+        return [0] * (len(cls.TIME_BUCKETS) + 1)
+
+    @classmethod
+    def bucket_for(cls, seconds):
+        """Index of the histogram bucket for a time spent"""
+        for i, bound in enumerate(cls.TIME_BUCKETS):
+            if seconds <= bound:
+                return i
+        return len(cls.TIME_BUCKETS)
+
+    @classmethod
+    def histogram_median(cls, histogram):
+        total = sum(histogram)
+        if not total:
+            return 0
+
+        half = total / 2
+        seen = 0
+        for i, count in enumerate(histogram):
+            seen += count
+            if seen >= half:
+                if i < len(cls.TIME_BUCKETS):
+                    return cls.TIME_BUCKETS[i]
+                return cls.TIME_BUCKETS[-1]
+        return cls.TIME_BUCKETS[-1]
+
+
+class CalibrationWatermark(models.Model):
+    """
+    Last attempt id consumed by an incremental job, plus the ids below it
+    not committed yet when it was read (see apps.core.id_gaps).
+    One row per job name.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    gaps = models.JSONField(default=dict, blank=True)  # id -> first seen (epoch seconds)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
@@ -0,0 +1,47 @@
+"""
+Exercise Registry - Maps attempt exercise types to exercise models
+"""
+from django.apps import apps
+
+
+# Attempt type name -> model label
+# Type names match what attempts store: class name, lowercased, without 'exercise'
+EXERCISE_TYPES = {
+    'wordorder': 'exercises.WordOrderExercise',
+    'fillblank': 'exercises.FillBlankExercise',
+    'multiplechoice': 'exercises.MultipleChoiceExercise',
+    'matching': 'exercises.MatchingExercise',
+}
+
+# Compact codes stored in the attempt log (never reuse a retired code)
+EXERCISE_TYPE_CODES = {
+    'wordorder': 1,
+    'fillblank': 2,
+    'multiplechoice': 3,
+    'matching': 4,
+}
+EXERCISE_TYPE_NAMES = {code: name for name, code in EXERCISE_TYPE_CODES.items()}
+EXERCISE_TYPE_CHOICES = [(code, name) for name, code in EXERCISE_TYPE_CODES.items()]
+
+
+def get_exercise_type(exercise):
+    """Type name stored in attempts for an exercise instance"""
+    return exercise.__class__.__name__.lower().replace('exercise', '')
+
+
+def get_type_code(exercise_type):
+    """Attempt log code for a type name (None if unknown)"""
+    return EXERCISE_TYPE_CODES.get(exercise_type)
+
+
+def get_type_name(code):
+    """Type name for an attempt log code (None if unknown)"""
+    return EXERCISE_TYPE_NAMES.get(code)
+
+
+def get_exercise_model(exercise_type):
+    """Exercise model for an attempt type name (None if unknown)"""
+    label = EXERCISE_TYPES.get(exercise_type)
+    if label is None:
+        return None
+    return apps.get_model(label)
@@ -0,0 +1,10 @@
+# Exercise Services
+from .calibration import DifficultyCalibrator
+from .selection import AdaptiveSelector, ExerciseIndex, exercise_index
+
+__all__ = [
+    'DifficultyCalibrator',
+    'AdaptiveSelector',
+    'ExerciseIndex',
+    'exercise_index',
+]
@@ -0,0 +1,197 @@
+"""
+Difficulty Calibration
+Rolls new attempts into ExerciseStats, next to the authored difficulty
+"""
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from apps.core.id_gaps import IdGapTracker
+from apps.progress.models import AttemptLog
+from ..models import ExerciseStats, CalibrationWatermark
+from ..registry import get_type_name
+
+
+class DifficultyCalibrator:
+    """
+    Incremental difficulty calibration.
+
+    Each run reads only the attempts recorded after the watermark (and
+    any below it that committed late, see IdGapTracker) and folds them
+    into the running ExerciseStats rows, calibrated difficulty included.
+
+    ExerciseBase.difficulty stays as authored: ExerciseIndex uses it as
+    the prior and the stats counters as the evidence, so writing the
+    calibrated value back would count the attempts twice.
+
+    Usage:
+        DifficultyCalibrator().run()
+    """
+
+    WATERMARK_NAME = 'exercise_difficulty'
+    BATCH_SIZE = 5000
+
+    # Bayesian prior: every exercise starts as if it had PRIOR_ATTEMPTS
+    # attempts at PRIOR_SUCCESS rate, so a few answers can't swing it
+    PRIOR_ATTEMPTS = 10
+    PRIOR_SUCCESS = 0.7
+
+    # Median time (seconds) considered "slow" for the time component
+    SLOW_TIME_SECONDS = 60
+
+    # Weights of each signal in the 0-1 difficulty score
+    WEIGHT_FAILURE = 0.7
+    WEIGHT_HINTS = 0.2
+    WEIGHT_TIME = 0.1
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.gap_tracker = IdGapTracker()
+
+    def run(self, max_batches: int = None) -> Dict[str, int]:
+        """
+        Process pending attempts in batches.
+
+        Returns:
+            Dict with attempts processed and stats rows touched
+        """
+        summary = {'attempts': 0, 'stats': 0}
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            result = self._run_batch()
+            if result is None:
+                break
+
+            summary['attempts'] += result['attempts']
+            summary['stats'] += result['stats']
+            batches += 1
+
+        if summary['attempts']:
+            # Selection in this process should see the new stats
+            from .selection import exercise_index
+            exercise_index.invalidate()
+
+        return summary
+
+    def reset(self):
+        """Drop all stats and rewind the watermark (full recalibration)"""
+        with transaction.atomic():
+            ExerciseStats.objects.all().delete()
+            CalibrationWatermark.objects.filter(name=self.WATERMARK_NAME).update(last_id=0, gaps={})
+
+    @transaction.atomic
+    def _run_batch(self):
+        mark, _ = CalibrationWatermark.objects.select_for_update().get_or_create(
+            name=self.WATERMARK_NAME
+        )
+
+        attempts = AttemptLog.objects.values_list(
+            'id', 'exercise_type', 'exercise_id',
+            'is_correct', 'time_spent_seconds', 'hints_used',
+        )
+        rows, last_id, gaps = self.gap_tracker.next_batch(
+            attempts, mark.last_id, mark.gaps, self.batch_size, id_of=itemgetter(0)
+        )
+        if not rows:
+            if gaps != mark.gaps:  # expired gaps
+                mark.gaps = gaps
+                mark.save(update_fields=['gaps', 'updated_at'])
+            return None
+
+        stats = self._merge(self._aggregate(rows))
+
+        mark.last_id, mark.gaps = last_id, gaps
+        mark.save(update_fields=['last_id', 'gaps', 'updated_at'])
+
+        return {'attempts': len(rows), 'stats': len(stats)}
+
+    def _aggregate(self, rows) -> Dict[Tuple[str, int], dict]:
+        """Fold a batch of attempt rows into per-exercise deltas"""
+        deltas = {}
+
+        for _, type_code, ex_id, is_correct, time_spent, hints in rows:
+            key = (get_type_name(type_code), ex_id)
+            delta = deltas.get(key)
+            if delta is None:
+                delta = deltas[key] = {
+                    'attempts': 0,
+                    'correct': 0,
+                    'attempts_with_hints': 0,
+                    'histogram': ExerciseStats.empty_histogram(),
+                }
+
+            delta['attempts'] += 1
+            delta['correct'] += 1 if is_correct else 0
+            delta['attempts_with_hints'] += 1 if hints else 0
+            delta['histogram'][ExerciseStats.bucket_for(time_spent)] += 1
+
+        return deltas
+
+    def _merge(self, deltas: Dict[Tuple[str, int], dict]) -> List[ExerciseStats]:
+        """Apply deltas to the stored stats rows in bulk"""
+        ids_by_type = defaultdict(list)
+        for ex_type, ex_id in deltas:
+            ids_by_type[ex_type].append(ex_id)
+
+        query = Q()
+        for ex_type, ids in ids_by_type.items():
+            query |= Q(exercise_type=ex_type, exercise_id__in=ids)
+
+        existing = {
+            (s.exercise_type, s.exercise_id): s
+            for s in ExerciseStats.objects.filter(query)
+        }
+
+        to_create, to_update = [], []
+        for key, delta in deltas.items():
+            stats = existing.get(key)
+            if stats is None:
+                stats = ExerciseStats(exercise_type=key[0], exercise_id=key[1])
+                to_create.append(stats)
+            else:
+                to_update.append(stats)
+
+            histogram = stats.time_histogram or ExerciseStats.empty_histogram()
+            if len(histogram) < len(delta['histogram']):
+                histogram = histogram + [0] * (len(delta['histogram']) - len(histogram))
+
+            stats.attempts += delta['attempts']
+            stats.correct += delta['correct']
+            stats.attempts_with_hints += delta['attempts_with_hints']
+            stats.time_histogram = [a + b for a, b in zip(histogram, delta['histogram'])]
+            stats.calibrated_difficulty = self.calculate_difficulty(stats)
+
+        ExerciseStats.objects.bulk_create(to_create)
+        ExerciseStats.objects.bulk_update(
+            to_update,
+            ['attempts', 'correct', 'attempts_with_hints', 'time_histogram', 'calibrated_difficulty'],
+        )
+
+        return to_create + to_update
+
+    def calculate_difficulty(self, stats: ExerciseStats) -> float:
+        """
+        Difficulty on the 1.0-5.0 scale.
+
+        Mostly driven by the (smoothed) failure rate, nudged up by hint
+        usage and slow answers.
+        """
+        success = (
+            (stats.correct + self.PRIOR_SUCCESS * self.PRIOR_ATTEMPTS)
+            / (stats.attempts + self.PRIOR_ATTEMPTS)
+        )
+        time_factor = min(
+            ExerciseStats.histogram_median(stats.time_histogram) / self.SLOW_TIME_SECONDS,
+            1.0
+        )
+
+        score = (
+            self.WEIGHT_FAILURE * (1 - success)
+            + self.WEIGHT_HINTS * stats.hint_rate
+            + self.WEIGHT_TIME * time_factor
+        )
+        return round(1 + 4 * min(max(score, 0.0), 1.0), 2)
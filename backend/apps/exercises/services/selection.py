@@ -0,0 +1,289 @@
+"""
+Adaptive Exercise Selection
+Picks exercises near a target success probability (Elo / 1PL IRT model)
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from ..models import ExerciseStats, UserTopicAbility
+from ..registry import EXERCISE_TYPES, get_exercise_model, get_exercise_type, get_type_name
+
+
+def success_probability(ability: float, difficulty: float) -> float:
+    """P(correct) for a user ability and item difficulty (logit scale)"""
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+
+def logit(p: float) -> float:
+    return math.log(p / (1.0 - p))
+
+
+class ExerciseIndex:
+    """
+    In-memory index of active exercises sorted by IRT difficulty.
+
+    One bucket per (level, grammar_topic_id), plus a (level, None) bucket
+    holding the whole level, so a pick is a bisect instead of a table scan.
+    Rebuilt from the database every REFRESH_SECONDS (5 queries).
+    """
+
+    REFRESH_SECONDS = 300
+
+    # Hand-set difficulty 1-5 mapped to logits around 3 (= 0.0)
+    LOGITS_PER_DIFFICULTY_STEP = 0.8
+
+    # Pseudo-attempts given to the hand-set difficulty when smoothing
+    PRIOR_ATTEMPTS = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at = 0.0
+        self._buckets: Dict[Tuple[str, Optional[int]], Tuple[List[float], List[Tuple[str, int]]]] = {}
+        self._difficulty: Dict[Tuple[str, int], float] = {}
+
+    def invalidate(self):
+        """Force a rebuild on next use (e.g. after a calibration run)"""
+        self._built_at = 0.0
+
+    def bucket(self, level: str, grammar_topic_id: Optional[int] = None):
+        """(sorted difficulties, matching (type, id) keys) for a bucket"""
+        self._ensure_fresh()
+        return self._buckets.get((level, grammar_topic_id), ([], []))
+
+    def difficulty_of(self, exercise_type: str, exercise_id: int) -> Optional[float]:
+        self._ensure_fresh()
+        return self._difficulty.get((exercise_type, exercise_id))
+
+    @classmethod
+    def prior_difficulty(cls, hand_set: int) -> float:
+        return (hand_set - 3) * cls.LOGITS_PER_DIFFICULTY_STEP
+
+    @classmethod
+    def item_difficulty(cls, hand_set: int, correct: int = 0, attempts: int = 0) -> float:
+        """
+        Item difficulty from attempts, smoothed toward the hand-set value.
+        With no attempts this is just the hand-set prior.
+        """
+        prior_success = success_probability(0.0, cls.prior_difficulty(hand_set))
+        success = (
+            (correct + prior_success * cls.PRIOR_ATTEMPTS)
+            / (attempts + cls.PRIOR_ATTEMPTS)
+        )
+        success = min(max(success, 0.01), 0.99)
+        return -logit(success)
+
+    def _ensure_fresh(self):
+        if time.monotonic() - self._built_at < self.REFRESH_SECONDS:
+            return
+
+        with self._lock:
+            if time.monotonic() - self._built_at < self.REFRESH_SECONDS:
+                return
+            self._build()
+            self._built_at = time.monotonic()
+
+    def _build(self):
+        stats = {
+            (ex_type, ex_id): (correct, attempts)
+            for ex_type, ex_id, correct, attempts in ExerciseStats.objects.values_list(
+                'exercise_type', 'exercise_id', 'correct', 'attempts'
+            )
+        }
+
+        entries = defaultdict(list)
+        difficulty = {}
+
+        for ex_type in EXERCISE_TYPES:
+            model = get_exercise_model(ex_type)
+            rows = model.objects.filter(is_active=True).values_list(
+                'id', 'level', 'grammar_topic_id', 'difficulty'
+            )
+            for ex_id, level, topic_id, hand_set in rows:
+                correct, attempts = stats.get((ex_type, ex_id), (0, 0))
+                b = self.item_difficulty(hand_set, correct, attempts)
+
+                difficulty[(ex_type, ex_id)] = b
+                entries[(level, topic_id)].append((b, ex_type, ex_id))
+                if topic_id is not None:
+                    entries[(level, None)].append((b, ex_type, ex_id))
+
+        buckets = {}
+        for key, items in entries.items():
+            items.sort()
+            buckets[key] = (
+                [b for b, _, _ in items],
+                [(ex_type, ex_id) for _, ex_type, ex_id in items],
+            )
+
+        # Swap in one go so readers never see a half-built index
+        self._buckets = buckets
+        self._difficulty = difficulty
+
+
+exercise_index = ExerciseIndex()
+
+
+class AdaptiveSelector:
+    """
+    Selects the next exercises for a user so each one is answered
+    correctly with roughly TARGET_SUCCESS probability.
+
+    Usage:
+        selector = AdaptiveSelector()
+        exercises = selector.select(user, level='A1', grammar_topic=topic, count=5)
+
+        # After each answer
+        selector.observe(user, exercise, is_correct)
+    """
+
+    TARGET_SUCCESS = 0.75
+
+    # Recent attempts excluded from selection
+    RECENT_WINDOW = 50
+
+    # Elo step size, shrinking as evidence accumulates
+    K_MAX = 0.6
+    K_MIN = 0.1
+    K_DECAY_ATTEMPTS = 20
+
+    def __init__(self, index: ExerciseIndex = None):
+        self.index = index or exercise_index
+
+    def select(
+        self,
+        user,
+        level: str,
+        grammar_topic=None,
+        count: int = 5,
+        target_success: float = None,
+    ) -> list:
+        """
+        Pick up to `count` exercises closest to the target difficulty.
+
+        Queries: ability (1), recent attempts (1), exercise loads
+        (1 per exercise type picked).
+        """
+        topic_id = self._topic_id(grammar_topic)
+        target = self.target_difficulty(self.get_ability(user, topic_id), target_success)
+
+        picked = self.pick(level, topic_id, target, count, self._recent_keys(user))
+        return self._load(picked)
+
+    def pick(
+        self,
+        level: str,
+        grammar_topic_id: Optional[int],
+        target: float,
+        count: int,
+        exclude=frozenset(),
+    ) -> List[Tuple[str, int]]:
+        """(type, id) keys nearest to a target difficulty, nearest first"""
+        difficulties, keys = self.index.bucket(level, grammar_topic_id)
+
+        picked = []
+        right = bisect_left(difficulties, target)
+        left = right - 1
+
+        while len(picked) < count and (left >= 0 or right < len(keys)):
+            take_left = right >= len(keys) or (
+                left >= 0 and target - difficulties[left] <= difficulties[right] - target
+            )
+            if take_left:
+                key, left = keys[left], left - 1
+            else:
+                key, right = keys[right], right + 1
+
+            if key not in exclude:
+                picked.append(key)
+
+        return picked
+
+    def target_difficulty(self, ability: float, target_success: float = None) -> float:
+        """Item difficulty answered correctly with the target probability"""
+        return ability - logit(target_success or self.TARGET_SUCCESS)
+
+    def get_ability(self, user, grammar_topic_id: Optional[int] = None) -> float:
+        rating = UserTopicAbility.objects.filter(
+            user=user, grammar_topic_id=grammar_topic_id
+        ).values_list('rating', flat=True).first()
+        return rating if rating is not None else 0.0
+
+    def observe(self, user, exercise, is_correct: bool) -> float:
+        """
+        Elo update of the user's ability after one answer.
+
+        Returns:
+            The new ability rating
+        """
+        return self.observe_item(
+            user.id,
+            get_exercise_type(exercise),
+            exercise.id,
+            exercise.grammar_topic_id,
+            exercise.difficulty,
+            is_correct,
+        )
+
+    def observe_item(
+        self,
+        user_id: int,
+        exercise_type: str,
+        exercise_id: int,
+        grammar_topic_id: Optional[int],
+        hand_set_difficulty: int,
+        is_correct: bool,
+    ) -> float:
+        """observe() for callers holding ids rather than instances"""
+        difficulty = self.index.difficulty_of(exercise_type, exercise_id)
+        if difficulty is None:
+            difficulty = self.index.prior_difficulty(hand_set_difficulty)
+
+        with transaction.atomic():
+            ability, _ = UserTopicAbility.objects.select_for_update().get_or_create(
+                user_id=user_id,
+                grammar_topic_id=grammar_topic_id,
+            )
+
+            expected = success_probability(ability.rating, difficulty)
+            k = max(self.K_MIN, self.K_MAX / (1 + ability.attempts / self.K_DECAY_ATTEMPTS))
+
+            ability.rating += k * ((1.0 if is_correct else 0.0) - expected)
+            ability.attempts += 1
+            ability.save(update_fields=['rating', 'attempts', 'updated_at'])
+
+        return ability.rating
+
+    def _recent_keys(self, user) -> set:
+        from apps.progress.models import AttemptLog
+
+        return {
+            (get_type_name(type_code), ex_id)
+            for type_code, ex_id in AttemptLog.objects.filter(user=user)
+            .order_by('-completed_at')
+            .values_list('exercise_type', 'exercise_id')[:self.RECENT_WINDOW]
+        }
+
+    def _load(self, picked: List[Tuple[str, int]]) -> list:
+        """Fetch exercise instances, one query per type, keeping pick order"""
+        ids_by_type = defaultdict(list)
+        for ex_type, ex_id in picked:
+            ids_by_type[ex_type].append(ex_id)
+
+        loaded = {}
+        for ex_type, ids in ids_by_type.items():
+            for ex_id, exercise in get_exercise_model(ex_type).objects.in_bulk(ids).items():
+                loaded[(ex_type, ex_id)] = exercise
+
+        return [loaded[key] for key in picked if key in loaded]
+
+    @staticmethod
+    def _topic_id(grammar_topic) -> Optional[int]:
+        if grammar_topic is None:
+            return None
+        return getattr(grammar_topic, 'id', grammar_topic)
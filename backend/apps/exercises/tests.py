@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.progress.models import AttemptLog
+
+from .models import ExerciseStats, FillBlankExercise
+from .registry import get_exercise_type
+from .services import DifficultyCalibrator
+from .services.selection import ExerciseIndex
+
+User = get_user_model()
+
+
+class DifficultyCalibratorTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='ana', password='x')
+        self.exercise = FillBlankExercise.objects.create(
+            level='A1',
+            difficulty=2,
+            sentence_with_blanks='I ___ happy',
+            sentence_complete='I am happy',
+            correct_answers=['am'],
+        )
+        now = timezone.now()
+        AttemptLog.objects.bulk_create([
+            AttemptLog.build(user, self.exercise, 'is', False, now, completed_at=now) for _ in range(30)
+        ])
+
+    def test_calibrated_difficulty_is_kept_apart_from_the_authored_one(self):
+        summary = DifficultyCalibrator().run()
+
+        self.assertEqual(summary, {'attempts': 30, 'stats': 1})
+        stats = ExerciseStats.objects.get(exercise_type=get_exercise_type(self.exercise), exercise_id=self.exercise.id)
+        self.assertGreater(stats.calibrated_difficulty, 3)
+        self.exercise.refresh_from_db()
+        self.assertEqual(self.exercise.difficulty, 2)
+
+    def test_index_counts_the_attempts_once(self):
+        DifficultyCalibrator().run()
+        index = ExerciseIndex()
+
+        self.assertAlmostEqual(
+            index.difficulty_of(get_exercise_type(self.exercise), self.exercise.id),
+            ExerciseIndex.item_difficulty(2, correct=0, attempts=30),
+        )
@@ -26,6 +26,7 @@ class Tag(models.Model):
     value = models.CharField(max_length=50)
     display_name = models.CharField(max_length=100, blank=True)
     icon = models.CharField(max_length=10, blank=True)  # emoji
+    updated_at = models.DateTimeField(auto_now=True)  # catalogue version
     
     class Meta:
         unique_together = ['type', 'value']
@@ -113,6 +114,8 @@ class Milestone(models.Model):
     # Cuántas palabras nuevas introduce este milestone
     new_vocab_count = models.PositiveIntegerField(default=20)
     
+    updated_at = models.DateTimeField(auto_now=True)  # catalogue version
+    
     class Meta:
         unique_together = ['scenario', 'level', 'order']
         ordering = ['scenario', 'level', 'order']
@@ -0,0 +1,141 @@
+"""
+Onboarding bootstrap bundle.
+The whole onboarding configuration as one precomputed, content-hashed payload.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.core.catalogue import catalogue_version
+
+
+# Hardcoded for now, later from database
+AVAILABLE_LANGUAGES = [
+    {'code': 'en', 'name': 'English', 'native_name': 'English', 'flag': '🇺🇸'},
+    {'code': 'es', 'name': 'Spanish', 'native_name': 'Español', 'flag': '🇪🇸'},
+    {'code': 'de', 'name': 'German', 'native_name': 'Deutsch', 'flag': '🇩🇪'},
+    {'code': 'fr', 'name': 'French', 'native_name': 'Français', 'flag': '🇫🇷'},
+    {'code': 'pt', 'name': 'Portuguese', 'native_name': 'Português', 'flag': '🇧🇷'},
+    {'code': 'it', 'name': 'Italian', 'native_name': 'Italiano', 'flag': '🇮🇹'},
+    {'code': 'ja', 'name': 'Japanese', 'native_name': '日本語', 'flag': '🇯🇵'},
+    {'code': 'zh', 'name': 'Chinese', 'native_name': '中文', 'flag': '🇨🇳'},
+    {'code': 'ko', 'name': 'Korean', 'native_name': '한국어', 'flag': '🇰🇷'},
+]
+
+TARGET_LANGUAGES = ['en']  # Start with English only
+
+# Tag type -> key in the options payload
+OPTION_GROUPS = {
+    'goal': 'goals',
+    'interest': 'interests',
+    'domain': 'domains',
+    'work_domain': 'work_domains',
+    'skill': 'skills',
+}
+
+VAK_INSTRUCTIONS = 'Choose the option that best describes how you learn.'
+
+
+def get_languages() -> Dict[str, List[dict]]:
+    return {
+        'native_languages': AVAILABLE_LANGUAGES,
+        'target_languages': [l for l in AVAILABLE_LANGUAGES if l['code'] in TARGET_LANGUAGES],
+    }
+
+
+def get_tag_options() -> Dict[str, List[dict]]:
+    """Onboarding options (goals, interests, ...) from all tags in one query"""
+    from apps.memory_palace.models import Tag
+
+    options = {key: [] for key in OPTION_GROUPS.values()}
+    for tag in Tag.objects.filter(type__in=OPTION_GROUPS).order_by('type', 'value'):
+        options[OPTION_GROUPS[tag.type]].append({
+            'id': tag.value,
+            'icon': tag.icon,
+            'label': tag.display_name,
+        })
+    return options
+
+
+class OnboardingBootstrap:
+    """
+    Builds steps, VAK questions, languages and options once, renders them
+    to JSON and keeps the bytes plus a strong ETag (SHA-256 of the
+    bytes) in process memory.
+
+    The bundle is rebuilt when the catalogue version changes and at the
+    latest after MAX_AGE_SECONDS. The version is derived from the
+    OnboardingStep, VAKAssessmentQuestion and Tag rows themselves, so
+    every worker picks up an edit once its cached version expires
+    (CatalogueVersion.TTL_SECONDS), whichever process or script made it.
+
+    Usage:
+        bundle = onboarding_bootstrap.get()
+        bundle['content'], bundle['etag']
+    """
+
+    MAX_AGE_SECONDS = 300
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bundle: Optional[dict] = None
+        self._built_at = 0.0
+        self._version = None
+
+    def get(self) -> dict:
+        """{'content': bytes, 'etag': str} - no model queries while cached"""
+        version = catalogue_version.get()
+        if not self._stale(version):
+            return self._bundle
+
+        with self._lock:
+            if self._stale(version):
+                content = json.dumps(
+                    self.build(), cls=DjangoJSONEncoder, ensure_ascii=False, sort_keys=True
+                ).encode('utf-8')
+                self._bundle = {
+                    'content': content,
+                    'etag': hashlib.sha256(content).hexdigest()[:32],
+                }
+                self._built_at = time.monotonic()
+                self._version = version
+            return self._bundle
+
+    def _stale(self, version: str) -> bool:
+        return (
+            self._bundle is None
+            or self._version != version
+            or time.monotonic() - self._built_at >= self.MAX_AGE_SECONDS
+        )
+
+    def invalidate(self):
+        with self._lock:
+            self._bundle = None
+
+    def build(self) -> dict:
+        """Uncached payload. Queries: steps (1), VAK questions (1-2), tags (1)"""
+        from .models import OnboardingStep
+        from .serializers import OnboardingStepSerializer
+        from .services import OnboardingService
+
+        steps = OnboardingStep.objects.filter(is_active=True).order_by('order')
+        questions = OnboardingService.get_default_vak_questions()
+
+        return {
+            'steps': OnboardingStepSerializer(steps, many=True).data,
+            'vak_assessment': {
+                'questions': questions,
+                'total_questions': len(questions),
+                'instructions': VAK_INSTRUCTIONS,
+            },
+            'languages': get_languages(),
+            'options': get_tag_options(),
+        }
+
+
+onboarding_bootstrap = OnboardingBootstrap()
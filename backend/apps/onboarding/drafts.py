@@ -0,0 +1,92 @@
+"""
+Onboarding drafts.
+Steps staged in the cache and written to the database at checkpoints only.
+"""
+
+from typing import Dict, Optional
+
+from django.core.cache import cache
+
+from .models import UserOnboardingProgress
+from .services import OnboardingService
+
+
+class OnboardingDraft:
+    """
+    Batch-friendly onboarding: stage() merges a step into a cached draft
+    (no database write) and every CHECKPOINT_EVERY steps, or when the
+    client asks, commit() replays the staged steps onto the stored
+    progress with one partial UPDATE. complete() commits and completes
+    without re-reading the progress.
+
+    The draft keeps the staged steps, not just the merged result, so a
+    commit never overwrites progress written in between (e.g. by the
+    placement test).
+
+    Usage:
+        drafts = OnboardingDraft()
+        drafts.stage(user, 'goal_select', {'goals': {'work': 1}})
+        drafts.stage(user, 'level_select', {'initial_level': 2}, checkpoint=True)
+        profile, summary = drafts.complete(user)
+    """
+
+    CACHE_PREFIX = 'onboarding_draft'
+    TTL_SECONDS = 24 * 60 * 60
+
+    # Staged steps a lost cache entry can cost at most
+    CHECKPOINT_EVERY = 4
+
+    def get(self, user) -> Dict:
+        """Draft as the client sees it: progress state plus staged steps"""
+        draft = cache.get(self._key(user))
+        if draft is None:
+            progress = UserOnboardingProgress.objects.filter(user=user).first()
+            draft = {'state': OnboardingService.progress_state(progress), 'steps': []}
+        return draft
+
+    def stage(self, user, step_type: str, data: Dict, checkpoint: bool = False) -> Dict:
+        draft = self.get(user)
+        draft['state'] = OnboardingService.merge_step_data(draft['state'], step_type, data)
+        draft['steps'].append([step_type, data])
+
+        if checkpoint or len(draft['steps']) >= self.CHECKPOINT_EVERY:
+            return self._commit(user, draft)
+
+        cache.set(self._key(user), draft, self.TTL_SECONDS)
+        return self._public(draft, committed=False)
+
+    def commit(self, user) -> Dict:
+        return self._commit(user, self.get(user))
+
+    def complete(self, user):
+        """Commit whatever is staged, then complete onboarding (raises ValueError like the service)"""
+        draft = cache.get(self._key(user))
+        progress = None
+        if draft and draft['steps']:
+            progress = OnboardingService.save_steps(user, draft['steps'])
+        cache.delete(self._key(user))
+        return OnboardingService.complete_onboarding(user, progress=progress)
+
+    def discard(self, user):
+        cache.delete(self._key(user))
+
+    def _commit(self, user, draft: Dict) -> Dict:
+        if draft['steps']:
+            progress = OnboardingService.save_steps(user, draft['steps'])
+            draft = {'state': OnboardingService.progress_state(progress), 'steps': []}
+        cache.set(self._key(user), draft, self.TTL_SECONDS)
+        return self._public(draft, committed=True)
+
+    @staticmethod
+    def _public(draft: Dict, committed: bool) -> Dict:
+        return {
+            **draft['state'],
+            'staged_steps': len(draft['steps']),
+            'committed': committed,
+        }
+
+    def _key(self, user) -> str:
+        return f"{self.CACHE_PREFIX}:{user.id}"
+
+
+onboarding_drafts = OnboardingDraft()
@@ -40,6 +40,7 @@ class OnboardingStep(models.Model):
     icon = models.CharField(max_length=10, default='📝')
     
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)  # catalogue version
     
     class Meta:
         db_table = 'onboarding_steps'
@@ -66,6 +67,7 @@ class VAKAssessmentQuestion(models.Model):
     kinesthetic_option = models.CharField(max_length=255)
     
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)  # catalogue version
     
     class Meta:
         db_table = 'vak_assessment_questions'
@@ -4,6 +4,7 @@ Handles business logic for onboarding flow and VAK assessment calculation.
 """
 
 from typing import Dict, List, Tuple, Optional
+from django.db import transaction
 from django.utils import timezone
 from apps.users.models import User, LearningProfile
 from .models import UserOnboardingProgress, VAKAssessmentQuestion
@@ -117,18 +118,23 @@ class OnboardingService:
         return profile
     
     @staticmethod
-    def complete_onboarding(user: User) -> Tuple[LearningProfile, Dict]:
+    def complete_onboarding(user: User, progress: UserOnboardingProgress = None) -> Tuple[LearningProfile, Dict]:
         """
         Complete the onboarding process for a user.
-        Creates learning profile from collected data.
+        Creates learning profile from collected data and, once that is
+        committed, warms the user's recommendations in the background.
+        
+        Args:
+            progress: The user's progress if the caller just saved it (skips the re-read)
         
         Returns:
             Tuple of (LearningProfile, summary dict)
         """
-        try:
-            progress = UserOnboardingProgress.objects.get(user=user)
-        except UserOnboardingProgress.DoesNotExist:
-            raise ValueError("User has no onboarding progress")
+        if progress is None:
+            try:
+                progress = UserOnboardingProgress.objects.get(user=user)
+            except UserOnboardingProgress.DoesNotExist:
+                raise ValueError("User has no onboarding progress")
         
         if progress.is_completed:
             raise ValueError("Onboarding already completed")
@@ -142,7 +148,10 @@ class OnboardingService:
         # Mark onboarding as completed
         progress.is_completed = True
         progress.completed_at = timezone.now()
-        progress.save()
+        progress.save(update_fields=['is_completed', 'completed_at', 'updated_at'])
+        
+        from apps.recommendations.services import recommendation_warmer
+        transaction.on_commit(lambda: recommendation_warmer.schedule(user.id))
         
         # Calculate VAK results for summary
         vak_results = OnboardingService.calculate_vak_scores(
@@ -158,6 +167,9 @@ class OnboardingService:
             'starting_level': profile.current_level,
         }
     
+    # UserOnboardingProgress fields a step changes
+    STATE_FIELDS = ['collected_data', 'completed_steps', 'current_step']
+    
     @staticmethod
     def save_step_data(user: User, step_type: str, data: Dict) -> UserOnboardingProgress:
         """
@@ -171,10 +183,48 @@ class OnboardingService:
         Returns:
             Updated UserOnboardingProgress
         """
+        return OnboardingService.save_steps(user, [(step_type, data)])
+    
+    @staticmethod
+    def save_steps(user: User, steps: List[Tuple[str, Dict]], state: Dict = None) -> UserOnboardingProgress:
+        """
+        Merge any number of steps (or an already merged `state`, e.g. a
+        draft) and write them with one partial UPDATE.
+        
+        Queries: progress get_or_create (1-2) + 1 update
+        """
         progress, created = UserOnboardingProgress.objects.get_or_create(user=user)
         
-        # Merge new data into collected_data
-        collected = progress.collected_data or {}
+        if state is None:
+            state = OnboardingService.progress_state(progress)
+        for step_type, data in steps:
+            state = OnboardingService.merge_step_data(state, step_type, data)
+        
+        for field in OnboardingService.STATE_FIELDS:
+            setattr(progress, field, state[field])
+        progress.save(update_fields=OnboardingService.STATE_FIELDS + ['updated_at'])
+        
+        return progress
+    
+    @staticmethod
+    def progress_state(progress: Optional[UserOnboardingProgress]) -> Dict:
+        """The step-related fields of a progress row (defaults if None)"""
+        if progress is None:
+            return {'collected_data': {}, 'completed_steps': [], 'current_step': 1}
+        return {
+            'collected_data': dict(progress.collected_data or {}),
+            'completed_steps': list(progress.completed_steps or []),
+            'current_step': progress.current_step,
+        }
+    
+    @staticmethod
+    def merge_step_data(state: Dict, step_type: str, data: Dict) -> Dict:
+        """
+        Pure merge of one step into a progress state
+        ({'collected_data', 'completed_steps', 'current_step'}).
+        Returns a new state; nothing is saved.
+        """
+        collected = dict(state['collected_data'])
         
         if step_type == 'language_select':
             collected['native_language'] = data.get('native_language')
@@ -218,6 +268,8 @@ class OnboardingService:
             collected['hobbies'] = data.get('hobbies', [])
         elif step_type == 'level_select':
             collected['initial_level'] = data.get('initial_level')
+            if data.get('placement'):
+                collected['placement'] = data['placement']  # adaptive test result (placement.py)
         elif step_type == 'time_commitment':
             collected['daily_goal_minutes'] = data.get('daily_goal_minutes')
         elif step_type == 'style_assessment':
@@ -225,19 +277,17 @@ class OnboardingService:
         elif step_type == 'avatar_create':
             collected['avatar_name'] = data.get('avatar_name')
         
-        progress.collected_data = collected
-        
         # Track completed steps
-        completed = progress.completed_steps or []
+        completed = list(state['completed_steps'])
         if step_type not in completed:
             completed.append(step_type)
-        progress.completed_steps = completed
         
         # Advance current step
-        progress.current_step += 1
-        progress.save()
-        
-        return progress
+        return {
+            'collected_data': collected,
+            'completed_steps': completed,
+            'current_step': state['current_step'] + 1,
+        }
     
     @staticmethod
     def get_user_progress(user: User) -> Optional[UserOnboardingProgress]:
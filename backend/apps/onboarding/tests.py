@@ -1,3 +1,38 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.catalogue import catalogue_version
+
+from .bootstrap import OnboardingBootstrap
+from .models import OnboardingStep
+
+
+class OnboardingBootstrapTests(TestCase):
+
+    def setUp(self):
+        cache.delete(catalogue_version.VERSION_KEY)
+        self.step = OnboardingStep.objects.create(
+            order=1, step_type='welcome', title='Welcome', description='', component_name='Welcome',
+        )
+        self.bootstrap = OnboardingBootstrap()
+
+    def test_bundle_is_reused_while_the_catalogue_is_unchanged(self):
+        first = self.bootstrap.get()
+
+        with mock.patch.object(self.bootstrap, 'build') as build:
+            self.assertIs(self.bootstrap.get(), first)
+        build.assert_not_called()
+
+    def test_edit_by_another_process_rebuilds_the_bundle(self):
+        first = self.bootstrap.get()
+
+        # No signal reaches this process: only the rows change
+        OnboardingStep.objects.filter(pk=self.step.pk).update(title='Hello', updated_at=timezone.now())
+        cache.delete(catalogue_version.VERSION_KEY)  # cached version expired
 
-# Create your tests here.
+        second = self.bootstrap.get()
+        self.assertNotEqual(second['etag'], first['etag'])
+        self.assertIn('Hello', second['content'].decode())
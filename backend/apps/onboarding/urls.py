@@ -8,11 +8,16 @@ from .views import (
     OnboardingStepsView,
     OnboardingProgressView,
     CompleteStepView,
+    OnboardingDraftView,
+    SubmitAllStepsView,
     VAKAssessmentView,
     SubmitVAKAssessmentView,
     CompleteOnboardingView,
+    StartPlacementView,
+    AnswerPlacementView,
     AvailableLanguagesView,
     OnboardingOptionsView,
+    OnboardingBootstrapView,
 )
 
 urlpatterns = [
@@ -25,11 +30,20 @@ urlpatterns = [
     path('complete-step/', CompleteStepView.as_view(), name='complete-step'),
     path('complete/', CompleteOnboardingView.as_view(), name='complete-onboarding'),
     
+    # Batched flow: staged draft or everything at once
+    path('draft/', OnboardingDraftView.as_view(), name='onboarding-draft'),
+    path('submit-all/', SubmitAllStepsView.as_view(), name='submit-all-steps'),
+    
     # VAK Assessment
     path('vak-assessment/', VAKAssessmentView.as_view(), name='vak-assessment'),
     path('submit-vak/', SubmitVAKAssessmentView.as_view(), name='submit-vak'),
     
+    # Adaptive level test
+    path('placement/start/', StartPlacementView.as_view(), name='placement-start'),
+    path('placement/answer/', AnswerPlacementView.as_view(), name='placement-answer'),
+    
     # Helper endpoints
     path('languages/', AvailableLanguagesView.as_view(), name='available-languages'),
     path('options/', OnboardingOptionsView.as_view(), name='onboarding-options'),
+    path('bootstrap/', OnboardingBootstrapView.as_view(), name='onboarding-bootstrap'),
 ]
@@ -9,7 +9,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.http import HttpResponse
 
+from apps.core.http_cache import catalogue, conditional_get
 from .models import OnboardingStep, VAKAssessmentQuestion
 from .serializers import (
     UserRegistrationSerializer,
@@ -19,6 +21,9 @@ from .serializers import (
     UserOnboardingProgressSerializer,
     VAKResultSerializer,
 )
+from .drafts import onboarding_drafts
+from .bootstrap import VAK_INSTRUCTIONS, get_languages, get_tag_options, onboarding_bootstrap
+from .placement import PlacementNotFound, PlacementTest
 from .services import OnboardingService
 
 
@@ -134,6 +139,78 @@ class CompleteStepView(APIView):
         })
 
 
+class OnboardingDraftView(APIView):
+    """
+    Stage onboarding steps in a server-side draft; the database is
+    written at checkpoints (every few steps, or when asked) and on
+    completion.
+    GET    /api/v1/onboarding/draft/
+    POST   /api/v1/onboarding/draft/   {"step_type", "data", "checkpoint": false}
+    DELETE /api/v1/onboarding/draft/
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        draft = onboarding_drafts.get(request.user)
+        return Response({**draft['state'], 'staged_steps': len(draft['steps'])})
+    
+    def post(self, request):
+        serializer = OnboardingStepCompleteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(onboarding_drafts.stage(
+            request.user,
+            serializer.validated_data['step_type'],
+            serializer.validated_data['data'],
+            checkpoint=bool(request.data.get('checkpoint', False)),
+        ))
+    
+    def delete(self, request):
+        onboarding_drafts.discard(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SubmitAllStepsView(APIView):
+    """
+    Save every onboarding step in one request (one database write),
+    optionally completing onboarding too.
+    POST /api/v1/onboarding/submit-all/
+    
+    Body: {"steps": [{"step_type": "...", "data": {...}}, ...], "complete": false}
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = OnboardingStepCompleteSerializer(data=request.data.get('steps'), many=True)
+        if not serializer.is_valid() or not serializer.validated_data:
+            return Response(
+                {'steps': serializer.errors or ['At least one step is required']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        progress = OnboardingService.save_steps(
+            request.user,
+            [(step['step_type'], step['data']) for step in serializer.validated_data],
+        )
+        onboarding_drafts.discard(request.user)
+        
+        response = {
+            'success': True,
+            'current_step': progress.current_step,
+            'completed_steps': progress.completed_steps,
+        }
+        
+        if request.data.get('complete'):
+            try:
+                profile, summary = OnboardingService.complete_onboarding(request.user, progress=progress)
+            except ValueError as e:
+                return Response({**response, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            response.update({'summary': summary, 'next_step': 'world_map'})
+        
+        return Response(response)
+
+
 class VAKAssessmentView(APIView):
     """
     Get VAK assessment questions.
@@ -141,12 +218,13 @@ class VAKAssessmentView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    @conditional_get(catalogue, private=True)
     def get(self, request):
         questions = OnboardingService.get_default_vak_questions()
         return Response({
             'questions': questions,
             'total_questions': len(questions),
-            'instructions': 'Choose the option that best describes how you learn.',
+            'instructions': VAK_INSTRUCTIONS,
         })
 
 
@@ -208,7 +286,8 @@ class CompleteOnboardingView(APIView):
     
     def post(self, request):
         try:
-            profile, summary = OnboardingService.complete_onboarding(request.user)
+            # Writes any staged draft steps first (one partial update)
+            profile, summary = onboarding_drafts.complete(request.user)
             
             return Response({
                 'success': True,
@@ -223,6 +302,43 @@ class CompleteOnboardingView(APIView):
             )
 
 
+class StartPlacementView(APIView):
+    """
+    Start the adaptive level test (replaces the self-reported level).
+    POST /api/v1/onboarding/placement/start/
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        try:
+            return Response(PlacementTest().start(request.user))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AnswerPlacementView(APIView):
+    """
+    Answer the current placement item; returns the next one or the result.
+    POST /api/v1/onboarding/placement/answer/
+    
+    Body: {"session_id": "...", "answer": <as the exercise type expects>}
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        session_id = request.data.get('session_id')
+        if not session_id or 'answer' not in request.data:
+            return Response(
+                {'error': 'session_id and answer are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            return Response(PlacementTest().answer(request.user, session_id, request.data['answer']))
+        except PlacementNotFound:
+            return Response({'error': 'Placement test not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
 class AvailableLanguagesView(APIView):
     """
     Get available languages for learning.
@@ -230,24 +346,9 @@ class AvailableLanguagesView(APIView):
     """
     permission_classes = [AllowAny]
     
+    @conditional_get(max_age=300)
     def get(self, request):
-        # Hardcoded for now, later from database
-        languages = [
-            {'code': 'en', 'name': 'English', 'native_name': 'English', 'flag': '🇺🇸'},
-            {'code': 'es', 'name': 'Spanish', 'native_name': 'Español', 'flag': '🇪🇸'},
-            {'code': 'de', 'name': 'German', 'native_name': 'Deutsch', 'flag': '🇩🇪'},
-            {'code': 'fr', 'name': 'French', 'native_name': 'Français', 'flag': '🇫🇷'},
-            {'code': 'pt', 'name': 'Portuguese', 'native_name': 'Português', 'flag': '🇧🇷'},
-            {'code': 'it', 'name': 'Italian', 'native_name': 'Italiano', 'flag': '🇮🇹'},
-            {'code': 'ja', 'name': 'Japanese', 'native_name': '日本語', 'flag': '🇯🇵'},
-            {'code': 'zh', 'name': 'Chinese', 'native_name': '中文', 'flag': '🇨🇳'},
-            {'code': 'ko', 'name': 'Korean', 'native_name': '한국어', 'flag': '🇰🇷'},
-        ]
-        
-        return Response({
-            'native_languages': languages,
-            'target_languages': [l for l in languages if l['code'] == 'en'],  # Start with English only
-        })
+        return Response(get_languages())
 
 
 class OnboardingOptionsView(APIView):
@@ -259,24 +360,20 @@ class OnboardingOptionsView(APIView):
     """
     permission_classes = [AllowAny]
     
+    @conditional_get(catalogue, max_age=300)
     def get(self, request):
-        from apps.memory_palace.models import Tag
-        
-        # Get all tags grouped by type
-        def get_tags_by_type(tag_type):
-            return [
-                {
-                    'id': tag.value,
-                    'icon': tag.icon,
-                    'label': tag.display_name,
-                }
-                for tag in Tag.objects.filter(type=tag_type).order_by('value')
-            ]
-        
-        return Response({
-            'goals': get_tags_by_type('goal'),
-            'interests': get_tags_by_type('interest'),
-            'domains': get_tags_by_type('domain'),
-            'work_domains': get_tags_by_type('work_domain'),
-            'skills': get_tags_by_type('skill'),
-        })
+        return Response(get_tag_options())
+
+
+class OnboardingBootstrapView(APIView):
+    """
+    Whole onboarding configuration in one response: steps, VAK questions,
+    languages and options. Precomputed and served with a strong ETag.
+    GET /api/v1/onboarding/bootstrap/
+    """
+    permission_classes = [AllowAny]
+    
+    @conditional_get(lambda request: onboarding_bootstrap.get()['etag'])
+    def get(self, request):
+        bundle = onboarding_bootstrap.get()
+        return HttpResponse(bundle['content'], content_type='application/json')
@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import AttemptLog
 
-# Register your models here.
+
+@admin.register(AttemptLog)
+class AttemptLogAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'exercise_type', 'exercise_id', 'is_correct', 'xp_earned', 'completed_at']
+    list_filter = ['exercise_type', 'is_correct', 'completed_at']
+    search_fields = ['user__username']
+    raw_id_fields = ['user', 'milestone_progress']
@@ -0,0 +1,30 @@
+"""
+Move attempts older than the retention window into the archive table.
+Run with: python manage.py archive_attempts --keep-months 3
+"""
+from django.core.management.base import BaseCommand
+
+from apps.progress.services import AttemptLogArchiver
+
+
+class Command(BaseCommand):
+    help = 'Archive AttemptLog rows older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-months', type=int, default=None,
+                            help='Calendar months kept in the hot log')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows moved per transaction')
+
+    def handle(self, *args, **options):
+        archiver = AttemptLogArchiver(
+            retention_months=options['keep_months'],
+            batch_size=options['batch_size'],
+        )
+        cutoff = archiver.cutoff()
+        summary = archiver.archive()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {summary['archived']} attempts completed before "
+            f"{cutoff:%Y-%m-%d} in {summary['batches']} batches"
+        ))
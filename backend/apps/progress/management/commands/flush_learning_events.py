@@ -0,0 +1,24 @@
+"""
+Replay learning events left in spool files by stopped or crashed processes.
+Run with: python manage.py flush_learning_events --prune-days 7
+"""
+from django.core.management.base import BaseCommand
+
+from apps.progress.models import ProcessedEvent
+from apps.progress.services import learning_events
+
+
+class Command(BaseCommand):
+    help = 'Apply orphaned learning event spools and prune old receipts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune-days', type=int, default=7,
+                            help='Keep idempotency receipts this many days')
+
+    def handle(self, *args, **options):
+        replayed = learning_events.replay_orphans()
+        pruned = ProcessedEvent.prune(days=options['prune_days'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {replayed} spooled events, pruned {pruned} receipts"
+        ))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttemptArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exercise_type', models.PositiveSmallIntegerField(choices=[(1, 'wordorder'), (2, 'fillblank'), (3, 'multiplechoice'), (4, 'matching')])),
+                ('exercise_id', models.PositiveIntegerField()),
+                ('user_answer', models.JSONField()),
+                ('is_correct', models.BooleanField()),
+                ('score', models.PositiveSmallIntegerField(default=0)),
+                ('hints_used', models.PositiveSmallIntegerField(default=0)),
+                ('xp_earned', models.PositiveSmallIntegerField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField()),
+                ('time_spent_seconds', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='attempt_archive', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'completed_at'], name='progress_at_user_id_7e2808_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AttemptLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exercise_type', models.PositiveSmallIntegerField(choices=[(1, 'wordorder'), (2, 'fillblank'), (3, 'multiplechoice'), (4, 'matching')])),
+                ('exercise_id', models.PositiveIntegerField()),
+                ('user_answer', models.JSONField()),
+                ('is_correct', models.BooleanField()),
+                ('score', models.PositiveSmallIntegerField(default=0)),
+                ('hints_used', models.PositiveSmallIntegerField(default=0)),
+                ('xp_earned', models.PositiveSmallIntegerField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('time_spent_seconds', models.PositiveIntegerField(default=0)),
+                ('milestone_progress', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attempt_log', to='progress.usermilestoneprogress')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='attempt_log', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-completed_at'],
+                'indexes': [models.Index(fields=['user', 'completed_at'], name='progress_at_user_id_8d54e7_idx'), models.Index(fields=['user', 'exercise_type', 'exercise_id'], name='progress_at_user_id_2ec96f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Copies exercises.ExerciseAttempt and progress.UserExerciseAttempt into AttemptLog
+
+from django.db import migrations
+
+
+# Frozen copy of apps.exercises.registry.EXERCISE_TYPE_CODES
+TYPE_CODES = {
+    'wordorder': 1,
+    'fillblank': 2,
+    'multiplechoice': 3,
+    'matching': 4,
+}
+
+BATCH_SIZE = 2000
+
+
+def copy_attempts(apps, schema_editor):
+    AttemptLog = apps.get_model('progress', 'AttemptLog')
+    sources = [
+        (apps.get_model('progress', 'UserExerciseAttempt'), True),
+        (apps.get_model('exercises', 'ExerciseAttempt'), False),
+    ]
+
+    for model, has_extras in sources:
+        batch = []
+        for old in model.objects.order_by('id').iterator(chunk_size=BATCH_SIZE):
+            code = TYPE_CODES.get(old.exercise_type)
+            if code is None:
+                continue
+
+            batch.append(AttemptLog(
+                user_id=old.user_id,
+                milestone_progress_id=old.milestone_progress_id if has_extras else None,
+                exercise_type=code,
+                exercise_id=old.exercise_id,
+                user_answer=old.user_answer,
+                is_correct=old.is_correct,
+                score=min(old.score, 100) if has_extras else (100 if old.is_correct else 0),
+                hints_used=min(old.hints_used, 32767) if has_extras else 0,
+                xp_earned=min(old.xp_earned, 32767),
+                started_at=old.started_at,
+                completed_at=old.completed_at,
+                time_spent_seconds=old.time_spent_seconds,
+            ))
+            if len(batch) >= BATCH_SIZE:
+                AttemptLog.objects.bulk_create(batch)
+                batch = []
+
+        if batch:
+            AttemptLog.objects.bulk_create(batch)
+
+    # Calibration watermarked the old table's ids: recalibrate from the log
+    apps.get_model('exercises', 'ExerciseStats').objects.all().delete()
+    apps.get_model('exercises', 'CalibrationWatermark').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0002_attemptlog_attemptarchive'),
+        ('exercises', '0003_usertopicability'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_attempts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0003_copy_legacy_attempts'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='UserExerciseAttempt',
+        ),
+    ]
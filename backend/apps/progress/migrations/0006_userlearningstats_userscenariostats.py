@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memory_palace', '0003_scenario_remove_room_prerequisite_room_and_more'),
+        ('progress', '0005_processedevent'),
+        ('users', '0006_monthlyactivity_weeklyactivity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLearningStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='learning_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct_attempts', models.PositiveIntegerField(default=0)),
+                ('reviews', models.PositiveIntegerField(default=0)),
+                ('words_mastered', models.PositiveIntegerField(default=0)),
+                ('milestones_completed', models.PositiveIntegerField(default=0)),
+                ('xp_earned', models.PositiveIntegerField(default=0)),
+                ('xp_spent', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'user_learning_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserScenarioStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct_attempts', models.PositiveIntegerField(default=0)),
+                ('milestones_completed', models.PositiveIntegerField(default=0)),
+                ('xp_earned', models.PositiveIntegerField(default=0)),
+                ('scenario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_stats', to='memory_palace.scenario')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='scenario_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_scenario_stats',
+                'unique_together': {('user', 'scenario')},
+            },
+        ),
+    ]
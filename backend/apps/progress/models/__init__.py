@@ -1,9 +1,17 @@
 """
 Progress Models - User progress tracking
 """
-from .milestone_progress import UserMilestoneProgress, UserExerciseAttempt
+from .milestone_progress import UserMilestoneProgress
+from .attempt_log import AttemptLog, AttemptArchive, UserExerciseAttempt
+from .processed_event import ProcessedEvent
+from .learning_stats import UserLearningStats, UserScenarioStats
 
 __all__ = [
     'UserMilestoneProgress',
     'UserExerciseAttempt',
+    'AttemptLog',
+    'AttemptArchive',
+    'ProcessedEvent',
+    'UserLearningStats',
+    'UserScenarioStats',
 ]
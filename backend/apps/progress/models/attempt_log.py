@@ -0,0 +1,177 @@
+"""
+Attempt Log - Single append-only log of exercise attempts
+"""
+from django.db import models, transaction
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.exercises.registry import (
+    EXERCISE_TYPE_CHOICES,
+    get_exercise_type,
+    get_type_code,
+    get_type_name,
+)
+
+User = get_user_model()
+
+
+class AttemptLog(models.Model):
+    """
+    Every exercise attempt, appended once and never updated.
+    Replaces exercises.ExerciseAttempt and progress.UserExerciseAttempt.
+
+    Compact on purpose: small-int type code, small-int counters and only
+    the two composite indexes (both lead with user, so the FK needs no
+    index of its own). Old months move to AttemptArchive so the hot
+    table and its indexes stay bounded.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='attempt_log',
+        db_index=False,  # covered by the composite indexes
+    )
+    milestone_progress = models.ForeignKey(
+        'progress.UserMilestoneProgress',
+        on_delete=models.SET_NULL,
+        related_name='attempt_log',
+        null=True, blank=True
+    )
+
+    # Exercise reference (code from apps.exercises.registry)
+    exercise_type = models.PositiveSmallIntegerField(choices=EXERCISE_TYPE_CHOICES)
+    exercise_id = models.PositiveIntegerField()
+
+    # Attempt data
+    user_answer = models.JSONField()
+    is_correct = models.BooleanField()
+    score = models.PositiveSmallIntegerField(default=0)  # 0-100
+    hints_used = models.PositiveSmallIntegerField(default=0)
+    xp_earned = models.PositiveSmallIntegerField(default=0)
+
+    # Timing
+    started_at = models.DateTimeField()
+    completed_at = models.DateTimeField(default=timezone.now)
+    time_spent_seconds = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-completed_at']
+        indexes = [
+            models.Index(fields=['user', 'completed_at']),
+            models.Index(fields=['user', 'exercise_type', 'exercise_id']),
+        ]
+
+    def __str__(self):
+        status = "✅" if self.is_correct else "❌"
+        return f"{self.user.username} - {self.exercise_type_name} #{self.exercise_id} {status}"
+
+    @property
+    def exercise_type_name(self):
+        return get_type_name(self.exercise_type)
+
+    def event_payload(self, milestone_id=None) -> dict:
+        """Payload of this attempt's ATTEMPT_RECORDED log event"""
+        return {
+            'exercise_type': self.exercise_type,
+            'exercise_id': self.exercise_id,
+            'milestone': milestone_id,
+            'correct': self.is_correct,
+            'xp': self.xp_earned,
+            'seconds': self.time_spent_seconds,
+        }
+
+    @classmethod
+    def build(cls, user, exercise, user_answer, is_correct, started_at,
+              milestone_progress=None, hints_used=0, completed_at=None):
+        """Unsaved log row for an attempt"""
+        completed_at = completed_at or timezone.now()
+        return cls(
+            user=user,
+            milestone_progress=milestone_progress,
+            exercise_type=get_type_code(get_exercise_type(exercise)),
+            exercise_id=exercise.id,
+            user_answer=user_answer,
+            is_correct=is_correct,
+            score=100 if is_correct else 0,
+            hints_used=hints_used,
+            xp_earned=exercise.xp_reward if is_correct else 0,
+            started_at=started_at,
+            completed_at=completed_at,
+            time_spent_seconds=max(int((completed_at - started_at).total_seconds()), 0),
+        )
+
+    @classmethod
+    def record(cls, user, exercise, user_answer, is_correct, started_at,
+               milestone_progress=None, hints_used=0):
+        """
+        Helper to record an attempt.
+        The row and all its effects (ability, XP, activity, event) commit
+        together or not at all. Milestone counters follow the event log.
+        """
+        from ..services.attempts import apply_attempt_effects
+
+        with transaction.atomic():
+            attempt = cls.build(
+                user, exercise, user_answer, is_correct, started_at,
+                milestone_progress=milestone_progress,
+                hints_used=hints_used,
+            )
+            attempt.save()
+
+            apply_attempt_effects([attempt], [{
+                'exercise_type': get_exercise_type(exercise),
+                'grammar_topic_id': exercise.grammar_topic_id,
+                'difficulty': exercise.difficulty,
+                'milestone_id': milestone_progress.milestone_id if milestone_progress else None,
+            }])
+
+        return attempt
+
+
+class AttemptArchive(models.Model):
+    """
+    Attempts moved out of AttemptLog once their month is past retention.
+    Same compact columns, written a whole month at a time.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='attempt_archive',
+        db_index=False,  # covered by the composite index
+    )
+    exercise_type = models.PositiveSmallIntegerField(choices=EXERCISE_TYPE_CHOICES)
+    exercise_id = models.PositiveIntegerField()
+
+    user_answer = models.JSONField()
+    is_correct = models.BooleanField()
+    score = models.PositiveSmallIntegerField(default=0)
+    hints_used = models.PositiveSmallIntegerField(default=0)
+    xp_earned = models.PositiveSmallIntegerField(default=0)
+
+    started_at = models.DateTimeField()
+    completed_at = models.DateTimeField()
+    time_spent_seconds = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'completed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {get_type_name(self.exercise_type)} #{self.exercise_id} (archived)"
+
+
+class UserExerciseAttempt:
+    """
+    Compatibility shim - attempts are stored in AttemptLog.
+    Keeps the old UserExerciseAttempt.record() entry point working.
+    """
+
+    @staticmethod
+    def record(user, exercise, user_answer, is_correct, started_at,
+               milestone_progress=None, hints_used=0):
+        return AttemptLog.record(
+            user, exercise, user_answer, is_correct, started_at,
+            milestone_progress=milestone_progress,
+            hints_used=hints_used,
+        )
@@ -0,0 +1,71 @@
+"""
+Learning Stats - Projections of the learning event log
+"""
+from django.db import models
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+class UserLearningStats(models.Model):
+    """
+    Lifetime counters per user, maintained by LearningStatsProjection and
+    shown in the dashboard. Never written by request code: rebuild it with
+    `python manage.py run_event_consumers --rebuild learning_stats`.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='learning_stats',
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    correct_attempts = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+    words_mastered = models.PositiveIntegerField(default=0)
+    milestones_completed = models.PositiveIntegerField(default=0)
+    xp_earned = models.PositiveIntegerField(default=0)
+    xp_spent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_learning_stats'
+
+    def __str__(self):
+        return f"{self.user_id} - {self.attempts} attempts, {self.xp_earned} XP"
+
+    @property
+    def accuracy_rate(self):
+        return round(self.correct_attempts / self.attempts, 2) if self.attempts else 0.0
+
+
+class UserScenarioStats(models.Model):
+    """
+    Per-user, per-scenario counters, maintained by ScenarioStatsProjection
+    and shown by the scenario progress view.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='scenario_stats',
+        db_index=False,  # covered by unique_together
+    )
+    scenario = models.ForeignKey(
+        'memory_palace.Scenario',
+        on_delete=models.CASCADE,
+        related_name='user_stats',
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    correct_attempts = models.PositiveIntegerField(default=0)
+    milestones_completed = models.PositiveIntegerField(default=0)
+    xp_earned = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_scenario_stats'
+        unique_together = ['user', 'scenario']
+
+    def __str__(self):
+        return f"{self.user_id} - scenario {self.scenario_id}: {self.attempts} attempts"
+
+    @property
+    def accuracy_rate(self):
+        return round(self.correct_attempts / self.attempts, 2) if self.attempts else 0.0
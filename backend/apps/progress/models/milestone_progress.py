@@ -1,7 +1,8 @@
 """
 Milestone Progress - Track user progress through milestones and exercises
 """
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -64,6 +65,12 @@ class UserMilestoneProgress(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.milestone} ({self.status})"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        from ..services.dashboard import invalidate_dashboards
+        transaction.on_commit(lambda: invalidate_dashboards([self.user_id]))
+    
     def start(self):
         """Mark milestone as started"""
         if self.status == 'not_started':
@@ -72,7 +79,10 @@ class UserMilestoneProgress(models.Model):
             self.save()
     
     def complete(self, score=100, time_spent=0):
-        """Mark milestone as completed"""
+        """
+        Mark milestone as completed.
+        The row, the XP grant, the activity and the event commit together.
+        """
         self.status = 'completed'
         self.completed_at = timezone.now()
         self.progress_percent = 100
@@ -81,11 +91,25 @@ class UserMilestoneProgress(models.Model):
         self.attempts += 1
         self.total_time_seconds += time_spent
         
-        # Award XP (from milestone)
-        if self.xp_earned == 0:  # First completion
-            self.xp_earned = self.milestone.xp_reward or 10
+        # Award XP on first completion (ledger key makes retries count once)
+        first_completion = self.xp_earned == 0
+        if first_completion:
+            self.xp_earned = settings.LEARNING_CONFIG['xp_per_lesson']
         
-        self.save()
+        from apps.events.models import LearningEvent
+        from apps.events.services import event_log
+        from apps.users.services import XPLedger, record_activity
+
+        with transaction.atomic():
+            self.save()
+            if first_completion:
+                XPLedger().grant(self.user_id, self.xp_earned, 'milestone', key=f'milestone:{self.id}')
+            record_activity(self.user_id, lessons_completed=1)
+            event_log.append(LearningEvent.Kind.MILESTONE_COMPLETED, self.user_id, {
+                'milestone': self.milestone_id,
+                'score': score,
+                'xp': self.xp_earned if first_completion else 0,
+            })
     
     def update_progress(self, exercises_done, exercises_total):
         """Update progress percentage"""
@@ -144,77 +168,3 @@ class UserMilestoneProgress(models.Model):
             'percent': int((completed / total_milestones * 100)) if total_milestones > 0 else 0,
         }
 
-
-class UserExerciseAttempt(models.Model):
-    """
-    Records individual exercise attempts within a milestone.
-    """
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='exercise_attempts_progress')
-    milestone_progress = models.ForeignKey(
-        UserMilestoneProgress,
-        on_delete=models.CASCADE,
-        related_name='exercise_attempts',
-        null=True, blank=True
-    )
-    
-    # Exercise reference (generic - works with any exercise type)
-    exercise_type = models.CharField(max_length=50)  # 'word_order', 'fill_blank', etc.
-    exercise_id = models.PositiveIntegerField()
-    
-    # Attempt data
-    user_answer = models.JSONField()
-    is_correct = models.BooleanField()
-    
-    # Score (for partial credit)
-    score = models.PositiveIntegerField(default=0)  # 0-100
-    
-    # Timing
-    started_at = models.DateTimeField()
-    completed_at = models.DateTimeField(auto_now_add=True)
-    time_spent_seconds = models.PositiveIntegerField(default=0)
-    
-    # Hints/Help used
-    hints_used = models.PositiveIntegerField(default=0)
-    
-    # XP earned
-    xp_earned = models.PositiveIntegerField(default=0)
-    
-    class Meta:
-        ordering = ['-completed_at']
-        indexes = [
-            models.Index(fields=['user', 'exercise_type', 'exercise_id']),
-            models.Index(fields=['user', 'completed_at']),
-        ]
-    
-    def __str__(self):
-        status = "✅" if self.is_correct else "❌"
-        return f"{self.user.username} - {self.exercise_type} #{self.exercise_id} {status}"
-    
-    @classmethod
-    def record(cls, user, exercise, user_answer, is_correct, started_at, 
-               milestone_progress=None, hints_used=0):
-        """Helper to record an attempt"""
-        time_spent = int((timezone.now() - started_at).total_seconds())
-        score = 100 if is_correct else 0
-        xp = exercise.xp_reward if is_correct else 0
-        
-        attempt = cls.objects.create(
-            user=user,
-            milestone_progress=milestone_progress,
-            exercise_type=exercise.__class__.__name__.lower().replace('exercise', ''),
-            exercise_id=exercise.id,
-            user_answer=user_answer,
-            is_correct=is_correct,
-            score=score,
-            started_at=started_at,
-            time_spent_seconds=time_spent,
-            hints_used=hints_used,
-            xp_earned=xp,
-        )
-        
-        # Update milestone progress if linked
-        if milestone_progress:
-            milestone_progress.exercises_completed += 1 if is_correct else 0
-            milestone_progress.save()
-        
-        return attempt
@@ -0,0 +1,27 @@
+"""
+Processed Event - Idempotency receipts for buffered learning events
+"""
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+class ProcessedEvent(models.Model):
+    """
+    Key of a learning event already applied to the database.
+    Written in the same transaction as the event's effects, so replaying
+    a spool after a crash never applies an event twice.
+    """
+    key = models.CharField(max_length=32, primary_key=True)
+    processed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.key
+
+    @classmethod
+    def prune(cls, days=7):
+        """Drop receipts older than any spool could still be replayed"""
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = cls.objects.filter(processed_at__lt=cutoff).delete()
+        return deleted
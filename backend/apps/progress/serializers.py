@@ -2,7 +2,9 @@
 Progress Serializers
 """
 from rest_framework import serializers
-from .models import UserMilestoneProgress, UserExerciseAttempt
+
+from apps.exercises.registry import EXERCISE_TYPES
+from .models import UserMilestoneProgress, AttemptLog
 
 
 class UserMilestoneProgressSerializer(serializers.ModelSerializer):
@@ -71,11 +73,33 @@ class CompleteMilestoneSerializer(serializers.Serializer):
     time_spent_seconds = serializers.IntegerField(min_value=0, default=0)
 
 
+class SubmitAttemptSerializer(serializers.Serializer):
+    """Input for submitting an exercise answer"""
+    exercise_type = serializers.ChoiceField(choices=list(EXERCISE_TYPES))
+    exercise_id = serializers.IntegerField()
+    answer = serializers.JSONField()
+    started_at = serializers.DateTimeField()
+    milestone_id = serializers.IntegerField(required=False, allow_null=True)
+    hints_used = serializers.IntegerField(min_value=0, default=0)
+
+
+class SubmitReviewSerializer(serializers.Serializer):
+    """Grade a vocabulary review (SM-2 quality)"""
+    vocabulary_id = serializers.IntegerField()
+    quality = serializers.IntegerField(min_value=0, max_value=5)
+
+
+class StartSessionSerializer(serializers.Serializer):
+    """Input for starting a learning session"""
+    scenario_slug = serializers.SlugField(required=False, allow_blank=True)
+
+
 class UserExerciseAttemptSerializer(serializers.ModelSerializer):
-    """Serializer for exercise attempts"""
+    """Serializer for exercise attempts (from the attempt log)"""
+    exercise_type = serializers.CharField(source='exercise_type_name', read_only=True)
     
     class Meta:
-        model = UserExerciseAttempt
+        model = AttemptLog
         fields = [
             'id',
             'exercise_type',
@@ -0,0 +1,20 @@
+# Progress Services
+from .archive import AttemptLogArchiver
+from .dashboard import DashboardService, invalidate_dashboards
+from .projections import LearningStatsProjection, ScenarioStatsProjection
+from .session import LearningSessionAssembler, SessionNotFound
+from .versions import progress_version
+from .write_behind import LearningEventBuffer, learning_events
+
+__all__ = [
+    'AttemptLogArchiver',
+    'DashboardService',
+    'invalidate_dashboards',
+    'LearningStatsProjection',
+    'ScenarioStatsProjection',
+    'LearningSessionAssembler',
+    'SessionNotFound',
+    'progress_version',
+    'LearningEventBuffer',
+    'learning_events',
+]
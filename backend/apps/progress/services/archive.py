@@ -0,0 +1,94 @@
+"""
+Attempt Log Archival
+Moves attempts older than the retention window from AttemptLog to AttemptArchive
+"""
+from datetime import datetime
+from typing import Dict
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import AttemptLog, AttemptArchive
+
+
+class AttemptLogArchiver:
+    """
+    Keeps AttemptLog limited to the last RETENTION_MONTHS calendar months.
+
+    Rows are moved in id order with set-based INSERT ... SELECT / DELETE
+    statements, one transaction per batch, so the job can be stopped and
+    resumed at any point. Archived rows keep their original id.
+
+    Usage:
+        AttemptLogArchiver().archive()
+    """
+
+    RETENTION_MONTHS = 3
+    BATCH_SIZE = 10000
+
+    COLUMNS = [
+        'id', 'user_id', 'exercise_type', 'exercise_id', 'user_answer',
+        'is_correct', 'score', 'hints_used', 'xp_earned',
+        'started_at', 'completed_at', 'time_spent_seconds',
+    ]
+
+    def __init__(self, retention_months: int = None, batch_size: int = None):
+        self.retention_months = (
+            self.RETENTION_MONTHS if retention_months is None else retention_months
+        )
+        self.batch_size = batch_size or self.BATCH_SIZE
+
+    def cutoff(self, now: datetime = None) -> datetime:
+        """Start of the oldest month that stays in the hot log"""
+        now = timezone.localtime(now or timezone.now())
+        month_index = now.year * 12 + (now.month - 1) - self.retention_months
+        return now.replace(
+            year=month_index // 12,
+            month=month_index % 12 + 1,
+            day=1, hour=0, minute=0, second=0, microsecond=0,
+        )
+
+    def archive(self, now: datetime = None) -> Dict[str, int]:
+        """
+        Move every attempt completed before the cutoff.
+
+        Returns:
+            Dict with rows archived and batches run
+        """
+        cutoff = self.cutoff(now)
+        summary = {'archived': 0, 'batches': 0}
+
+        while True:
+            moved = self._archive_batch(cutoff)
+            if not moved:
+                break
+            summary['archived'] += moved
+            summary['batches'] += 1
+
+        return summary
+
+    @transaction.atomic
+    def _archive_batch(self, cutoff: datetime) -> int:
+        # Old rows sit at the start of the id range: walk the primary key
+        ids = list(
+            AttemptLog.objects.filter(completed_at__lt=cutoff)
+            .order_by('id')
+            .values_list('id', flat=True)[:self.batch_size]
+        )
+        if not ids:
+            return 0
+
+        qn = connection.ops.quote_name
+        columns = ', '.join(qn(c) for c in self.COLUMNS)
+        log_table = qn(AttemptLog._meta.db_table)
+        where = f"{qn('id')} BETWEEN %s AND %s AND {qn('completed_at')} < %s"
+        params = [ids[0], ids[-1], cutoff]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(AttemptArchive._meta.db_table)} ({columns}) "
+                f"SELECT {columns} FROM {log_table} WHERE {where}",
+                params,
+            )
+            cursor.execute(f"DELETE FROM {log_table} WHERE {where}", params)
+            return cursor.rowcount
@@ -0,0 +1,48 @@
+"""
+Attempt Effects
+Everything recording an exercise attempt does besides storing its AttemptLog row
+"""
+from typing import List, Sequence
+
+from apps.events.models import LearningEvent
+from apps.events.services import event_log
+from apps.users.services import XPLedger, record_activity
+
+
+def apply_attempt_effects(attempts: Sequence, items: List[dict]):
+    """
+    Side effects of saved AttemptLog rows, in the caller's transaction.
+    Shared by AttemptLog.record() and the write-behind attempt handler.
+
+    Args:
+        attempts: saved AttemptLog rows (ids assigned)
+        items: per attempt {'exercise_type', 'grammar_topic_id',
+               'difficulty', 'milestone_id'} (the exercise as selection sees it)
+
+    Writes: one ability update per attempt, one XP ledger batch keyed by
+    attempt id (a replayed attempt is never credited twice), today's
+    activity counters and one ATTEMPT_RECORDED event per attempt. The
+    milestone and scenario counters follow from that event, see
+    ScenarioStatsProjection.
+    """
+    from apps.exercises.services import AdaptiveSelector
+
+    selector = AdaptiveSelector()
+    for attempt, item in zip(attempts, items):
+        selector.observe_item(
+            attempt.user_id, item['exercise_type'], attempt.exercise_id,
+            item['grammar_topic_id'], item['difficulty'], attempt.is_correct,
+        )
+
+    XPLedger().grant_many(
+        (attempt.user_id, attempt.xp_earned, 'exercise', f'attempt:{attempt.id}')
+        for attempt in attempts
+    )
+
+    for attempt in attempts:
+        record_activity(attempt.user_id, exercises_completed=1)
+
+    event_log.append_many(
+        (LearningEvent.Kind.ATTEMPT_RECORDED, attempt.user_id, attempt.event_payload(item['milestone_id']))
+        for attempt, item in zip(attempts, items)
+    )
@@ -0,0 +1,184 @@
+"""
+Home Dashboard
+One cached snapshot per user with everything the home screen shows
+"""
+import hashlib
+import json
+from typing import Iterable
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q
+
+from apps.content.models import UserGrammarProgress, UserVocabularyProgress
+from apps.users.models import DailyActivity
+from apps.users.services import StreakEngine
+from ..models import UserLearningStats, UserMilestoneProgress
+
+CACHE_PREFIX = 'dashboard'
+
+
+def invalidate_dashboards(user_ids: Iterable[int]):
+    """Drop cached snapshots; the next dashboard request rebuilds them"""
+    cache.delete_many([f"{CACHE_PREFIX}:{user_id}" for user_id in set(user_ids)])
+
+
+class DashboardService:
+    """
+    Composes my_progress, vocabulary / grammar stats, streak, XP and
+    recommendations into one payload and caches it per user together
+    with a strong ETag (hash of the payload).
+
+    Progress writes drop the snapshot (ActivityAggregator.flush,
+    XPLedger.grant_many, UserMilestoneProgress.save, the learning and
+    scenario stats projections, new recommendation orderings) in the
+    shared cache, so a cached snapshot is current in every worker; the
+    TTL only bounds what those hooks can't see (onboarding edits, the
+    day rolling over).
+
+    Usage:
+        snapshot = DashboardService().get(user)
+        snapshot['etag'], snapshot['data']
+    """
+
+    SNAPSHOT_TTL_SECONDS = 5 * 60
+    RECENT_COUNT = 5
+    RECOMMENDATION_COUNT = 5
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    def get(self, user) -> dict:
+        """Cached snapshot {'etag', 'data'}, built on a miss"""
+        key = self._key(user.id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            data = json.loads(json.dumps(self.build(user), cls=DjangoJSONEncoder))
+            snapshot = {
+                'etag': hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest(),
+                'data': data,
+            }
+            cache.set(key, snapshot, self.SNAPSHOT_TTL_SECONDS)
+        return snapshot
+
+    def build(self, user) -> dict:
+        """
+        Uncached payload.
+        Queries: profile (1), milestones (2), vocabulary (1), grammar (1),
+        today's activity (1), lifetime stats (1), recommendations (2-3
+        when their order is cached).
+        """
+        profile = user.learning_profile if hasattr(user, 'learning_profile') else None
+
+        return {
+            'progress': self._progress(user),
+            'vocabulary': UserVocabularyProgress.get_vocabulary_stats(user),
+            'grammar': UserGrammarProgress.get_grammar_stats(user),
+            'streak': self._streak(profile),
+            'xp': self._xp(profile),
+            'today': self._today(user, profile),
+            'lifetime': self._lifetime(user),
+            'recommendations': self._recommendations(user),
+        }
+
+    # ------------------------------------------------------------------
+    # Sections
+    # ------------------------------------------------------------------
+
+    def _progress(self, user) -> dict:
+        milestones = UserMilestoneProgress.objects.filter(user=user)
+        summary = milestones.aggregate(
+            milestones_completed=Count('id', filter=Q(status='completed')),
+            milestones_in_progress=Count('id', filter=Q(status='in_progress')),
+        )
+
+        recent = (
+            milestones.select_related('milestone__scenario')
+            .order_by('-last_activity')[:self.RECENT_COUNT]
+        )
+        return {
+            'summary': summary,
+            'recent_activity': [
+                {
+                    'milestone_id': mp.milestone_id,
+                    'milestone_name': mp.milestone.name,
+                    'scenario_slug': mp.milestone.scenario.slug,
+                    'status': mp.status,
+                    'progress_percent': mp.progress_percent,
+                    'last_activity': mp.last_activity,
+                }
+                for mp in recent
+            ],
+        }
+
+    @staticmethod
+    def _streak(profile) -> dict:
+        if profile is None:
+            return {'current': 0, 'longest': 0, 'freezes': 0}
+        return {
+            'current': StreakEngine().current_streak(profile),
+            'longest': profile.longest_streak,
+            'freezes': profile.streak_freezes,
+        }
+
+    @staticmethod
+    def _xp(profile) -> dict:
+        if profile is None:
+            return {'total_xp': 0, 'current_level': 1, 'cefr_level': 'A1'}
+        return {
+            'total_xp': profile.total_xp,
+            'current_level': profile.current_level,
+            'cefr_level': profile.cefr_level,
+        }
+
+    @staticmethod
+    def _today(user, profile) -> dict:
+        day = StreakEngine.local_date(profile)
+        activity = (
+            DailyActivity.objects.filter(user=user, date=day)
+            .values('minutes_studied', 'xp_earned', 'exercises_completed', 'daily_goal_met')
+            .first()
+        ) or {'minutes_studied': 0, 'xp_earned': 0, 'exercises_completed': 0, 'daily_goal_met': False}
+
+        return {
+            'date': day,
+            'daily_goal_minutes': profile.daily_goal_minutes if profile else None,
+            **activity,
+        }
+
+    @staticmethod
+    def _lifetime(user) -> dict:
+        stats = UserLearningStats.objects.filter(user=user).first() or UserLearningStats(user=user)
+        return {
+            'attempts': stats.attempts,
+            'accuracy_rate': stats.accuracy_rate,
+            'reviews': stats.reviews,
+            'words_mastered': stats.words_mastered,
+            'milestones_completed': stats.milestones_completed,
+            'xp_earned': stats.xp_earned,
+        }
+
+    def _recommendations(self, user) -> list:
+        result = self.engine.recommend(user, limit=self.RECOMMENDATION_COUNT)
+        return [
+            {
+                'id': s.id,
+                'slug': s.slug,
+                'name': s.name,
+                'icon': s.icon,
+                'difficulty_min': s.difficulty_min,
+                'difficulty_max': s.difficulty_max,
+            }
+            for s in result.scenarios
+        ]
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from apps.recommendations.services import RecommendationEngine
+            self._engine = RecommendationEngine()
+        return self._engine
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{CACHE_PREFIX}:{user_id}"
@@ -0,0 +1,134 @@
+"""
+Learning Projections
+Event log consumers maintaining UserLearningStats, UserScenarioStats and
+the attempt counters of UserMilestoneProgress
+"""
+from collections import Counter, defaultdict
+from typing import List
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from apps.events.models import LearningEvent
+from apps.events.services import EventConsumer, add_counters
+from ..models import UserLearningStats, UserMilestoneProgress, UserScenarioStats
+from .dashboard import invalidate_dashboards
+
+Kind = LearningEvent.Kind
+
+
+class LearningStatsProjection(EventConsumer):
+    """
+    Lifetime counters per user, shown in the dashboard's `lifetime`
+    section. XP comes from XP_GRANTED events only, so milestone and
+    exercise XP are not counted twice.
+    """
+
+    name = 'learning_stats'
+    kinds = (Kind.ATTEMPT_RECORDED, Kind.MILESTONE_COMPLETED, Kind.REVIEW_GRADED, Kind.XP_GRANTED)
+
+    FIELDS = (
+        'attempts',
+        'correct_attempts',
+        'reviews',
+        'words_mastered',
+        'milestones_completed',
+        'xp_earned',
+        'xp_spent',
+    )
+
+    def handle(self, events: List[LearningEvent]):
+        totals = defaultdict(Counter)
+
+        for event in events:
+            counts, payload = totals[event.user_id], event.payload
+
+            if event.kind == Kind.ATTEMPT_RECORDED:
+                counts['attempts'] += 1
+                counts['correct_attempts'] += int(payload['correct'])
+            elif event.kind == Kind.MILESTONE_COMPLETED:
+                counts['milestones_completed'] += 1
+            elif event.kind == Kind.REVIEW_GRADED:
+                counts['reviews'] += 1
+                counts['words_mastered'] += int(payload['mastered'])
+            elif event.kind == Kind.XP_GRANTED:
+                amount = payload['amount']
+                counts['xp_earned' if amount > 0 else 'xp_spent'] += abs(amount)
+
+        add_counters(
+            UserLearningStats, ['user_id'], self.FIELDS,
+            [((user_id,), counts) for user_id, counts in totals.items()],
+        )
+        transaction.on_commit(lambda: invalidate_dashboards(totals))
+
+    def reset(self):
+        UserLearningStats.objects.all().delete()
+
+
+class ScenarioStatsProjection(EventConsumer):
+    """
+    Counters per user and scenario, for events linked to a milestone,
+    read by the scenario progress view. Also moves the attempt counters
+    of UserMilestoneProgress (exercises_completed, last_activity), which
+    recording an attempt no longer updates inline.
+
+    Queries per batch: one milestone -> scenario lookup, the counter
+    upsert and one UPDATE per milestone progress touched.
+    """
+
+    name = 'scenario_stats'
+    kinds = (Kind.ATTEMPT_RECORDED, Kind.MILESTONE_COMPLETED)
+
+    FIELDS = ('attempts', 'correct_attempts', 'milestones_completed', 'xp_earned')
+
+    def handle(self, events: List[LearningEvent]):
+        from apps.memory_palace.models import Milestone
+
+        linked = [e for e in events if e.payload.get('milestone')]
+        if not linked:
+            return
+
+        scenario_of = dict(
+            Milestone.objects.filter(
+                id__in={e.payload['milestone'] for e in linked}
+            ).values_list('id', 'scenario_id')
+        )
+
+        totals = defaultdict(Counter)
+        for event in linked:
+            scenario_id = scenario_of.get(event.payload['milestone'])
+            if scenario_id is None:
+                continue  # milestone deleted since
+
+            counts, payload = totals[(event.user_id, scenario_id)], event.payload
+            if event.kind == Kind.ATTEMPT_RECORDED:
+                counts['attempts'] += 1
+                counts['correct_attempts'] += int(payload['correct'])
+            else:
+                counts['milestones_completed'] += 1
+            counts['xp_earned'] += payload.get('xp', 0)
+
+        add_counters(UserScenarioStats, ['user_id', 'scenario_id'], self.FIELDS, list(totals.items()))
+        self._milestone_activity([e for e in linked if e.kind == Kind.ATTEMPT_RECORDED])
+
+    @staticmethod
+    def _milestone_activity(attempts: List[LearningEvent]):
+        # Any answer counts as activity on the milestone; correct ones as progress
+        correct, latest = Counter(), {}
+        for event in attempts:
+            key = (event.user_id, event.payload['milestone'])
+            correct[key] += int(event.payload['correct'])
+            latest[key] = max(latest.get(key, event.created_at), event.created_at)
+
+        for (user_id, milestone_id), at in latest.items():
+            UserMilestoneProgress.objects.filter(user_id=user_id, milestone_id=milestone_id).update(
+                exercises_completed=F('exercises_completed') + correct[(user_id, milestone_id)],
+                last_activity=Greatest('last_activity', at),
+            )
+        if latest:
+            transaction.on_commit(lambda: invalidate_dashboards(user_id for user_id, _ in latest))
+
+    def reset(self):
+        UserScenarioStats.objects.all().delete()
+        UserMilestoneProgress.objects.update(exercises_completed=0)
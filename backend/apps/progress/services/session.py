@@ -0,0 +1,272 @@
+"""
+Learning Session Assembler
+Builds one ready-to-play session (reviews, grammar, exercises) on the server
+"""
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.content.models import MilestoneGrammar, UserGrammarProgress, UserVocabularyProgress
+from apps.exercises.registry import EXERCISE_TYPES, get_exercise_model, get_exercise_type, get_type_code
+from apps.exercises.models import UserTopicAbility
+from apps.exercises.services import AdaptiveSelector
+from apps.memory_palace.models import Milestone
+from apps.users.services import record_activity
+from ..models import AttemptLog, UserMilestoneProgress
+
+
+class SessionNotFound(Exception):
+    """The session expired, ended or belongs to another user"""
+
+
+class LearningSessionAssembler:
+    """
+    Server-side version of LearningManager.start_learning_session /
+    get_next_lesson / end_learning_session.
+
+    start() composes the whole session in a fixed number of queries and
+    stores it in the shared cache as a flat item list plus a cursor, so
+    any worker can continue it; get_next() only moves the cursor and
+    runs no model queries.
+
+    Usage:
+        assembler = LearningSessionAssembler()
+        session = assembler.start(user, scenario_slug='restaurant')
+        item = assembler.get_next(user, session['session_id'])
+        summary = assembler.end(user, session['session_id'])
+    """
+
+    CACHE_PREFIX = 'learning_session'
+    SESSION_TTL_SECONDS = 2 * 60 * 60
+
+    EXERCISE_COUNT = 8
+    GRAMMAR_COUNT = 1
+
+    def __init__(self, selector: AdaptiveSelector = None):
+        self.selector = selector or AdaptiveSelector()
+        self.review_limit = settings.LEARNING_CONFIG.get('max_review_items_per_session', 20)
+
+    def start(self, user, scenario_slug: str = None) -> dict:
+        """
+        Build and cache a new session (replaces any open one).
+
+        Queries: profile (1), milestone (1), grammar (1), reviews (1),
+        milestone grammar (1), abilities (1), exercises (1 per exercise type).
+        """
+        profile = user.learning_profile if hasattr(user, 'learning_profile') else None
+        level = profile.cefr_level if profile else 'A1'
+
+        milestone = self._next_milestone(user, scenario_slug)
+        if milestone:
+            level = milestone.level
+
+        grammar = list(UserGrammarProgress.get_pending_topics(user, level)[:self.GRAMMAR_COUNT])
+        reviews = list(UserVocabularyProgress.get_words_for_review(user, limit=self.review_limit))
+        exercises = self._exercises(user, level, milestone, grammar[0] if grammar else None)
+
+        # Warm-up reviews, then the new grammar point, then practice
+        items = [self._review_item(r) for r in reviews]
+        items += [self._grammar_item(t) for t in grammar]
+        items += [self._exercise_item(e) for e in exercises]
+
+        state = {
+            'session_id': uuid.uuid4().hex,
+            'started_at': timezone.now().isoformat(),
+            'milestone_id': milestone.id if milestone else None,
+            'level': level,
+            'items': items,
+            'cursor': 0,
+        }
+        cache.set(self._key(user), state, self.SESSION_TTL_SECONDS)
+
+        return {
+            'session_id': state['session_id'],
+            'level': level,
+            'milestone': self._milestone_data(milestone),
+            'total_items': len(items),
+            'counts': {
+                'reviews': len(reviews),
+                'grammar': len(grammar),
+                'exercises': len(exercises),
+            },
+            'daily_goal_minutes': (
+                profile.daily_goal_minutes if profile
+                else settings.LEARNING_CONFIG['default_daily_goal_minutes']
+            ),
+        }
+
+    def get_next(self, user, session_id: str) -> dict:
+        """Next item of the session, served from the cache"""
+        state = self._load(user, session_id)
+
+        cursor = state['cursor']
+        if cursor >= len(state['items']):
+            return {'item': None, 'position': cursor, 'remaining': 0, 'done': True}
+
+        state['cursor'] = cursor + 1
+        cache.set(self._key(user), state, self.SESSION_TTL_SECONDS)
+
+        return {
+            'item': state['items'][cursor],
+            'position': cursor + 1,
+            'remaining': len(state['items']) - cursor - 1,
+            'done': False,
+        }
+
+    def end(self, user, session_id: str) -> dict:
+        """Close the session, log its minutes and summarize it"""
+        state = self._load(user, session_id)
+        cache.delete(self._key(user))
+
+        started_at = parse_datetime(state['started_at'])
+        served = state['items'][:state['cursor']]
+        duration_minutes = int((timezone.now() - started_at).total_seconds() // 60)
+
+        if duration_minutes:
+            record_activity(user, minutes_studied=duration_minutes)
+
+        # Attempts still in the write-behind buffer are not counted yet
+        attempts = AttemptLog.objects.filter(
+            user=user, completed_at__gte=started_at
+        ).aggregate(
+            total=Count('id'),
+            correct=Count('id', filter=Q(is_correct=True)),
+            xp=Sum('xp_earned'),
+        )
+
+        return {
+            'session_id': session_id,
+            'duration_minutes': duration_minutes,
+            'items_served': len(served),
+            'items_total': len(state['items']),
+            'reviews_served': sum(1 for i in served if i['kind'] == 'review'),
+            'exercises_completed': attempts['total'],
+            'accuracy_rate': (
+                round(attempts['correct'] / attempts['total'], 2) if attempts['total'] else 0.0
+            ),
+            'xp_earned': attempts['xp'] or 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Assembly
+    # ------------------------------------------------------------------
+
+    def _next_milestone(self, user, scenario_slug: Optional[str]):
+        if scenario_slug:
+            completed = UserMilestoneProgress.get_completed_milestones(user)
+            return (
+                Milestone.objects.filter(scenario__slug=scenario_slug)
+                .exclude(id__in=completed)
+                .select_related('scenario')
+                .order_by('level', 'order')
+                .first()
+            )
+
+        # No scenario: continue the milestone the user touched last
+        progress = (
+            UserMilestoneProgress.objects.filter(user=user, status='in_progress')
+            .select_related('milestone__scenario')
+            .order_by('-last_activity')
+            .first()
+        )
+        return progress.milestone if progress else None
+
+    def _exercises(self, user, level, milestone, grammar_topic) -> list:
+        """The milestone's exercises nearest the user's target, else adaptive picks"""
+        if milestone is None:
+            return self.selector.select(user, level, grammar_topic, count=self.EXERCISE_COUNT)
+
+        exercises = []
+        for ex_type in EXERCISE_TYPES:
+            exercises.extend(
+                get_exercise_model(ex_type).objects.filter(milestone=milestone, is_active=True)
+            )
+        if not exercises:
+            return self.selector.select(user, level, grammar_topic, count=self.EXERCISE_COUNT)
+
+        # Target each exercise at the ability on its own grammar topic, else
+        # the milestone's primary topic (general ability if neither), as
+        # select() would
+        milestone_topic_id = MilestoneGrammar.objects.filter(
+            milestone=milestone
+        ).order_by('-is_primary', 'id').values_list('topic_id', flat=True).first()
+        targets = {
+            topic_id: self.selector.target_difficulty(rating)
+            for topic_id, rating in UserTopicAbility.objects.filter(user=user).values_list('grammar_topic_id', 'rating')
+        }
+        default_target = self.selector.target_difficulty(0.0)
+        index = self.selector.index
+
+        def distance(exercise):
+            topic_id = exercise.grammar_topic_id or milestone_topic_id
+            target = targets.get(topic_id, default_target)
+            difficulty = index.difficulty_of(get_exercise_type(exercise), exercise.id)
+            if difficulty is None:
+                difficulty = index.prior_difficulty(exercise.difficulty)
+            return abs(difficulty - target)
+
+        exercises.sort(key=distance)
+        return exercises[:self.EXERCISE_COUNT]
+
+    @staticmethod
+    def _review_item(progress) -> dict:
+        return {
+            'kind': 'review',
+            'vocabulary_id': progress.vocabulary_id,
+            'word': progress.vocabulary.word,
+            'translation': progress.vocabulary.translation,
+            'status': progress.status,
+        }
+
+    @staticmethod
+    def _grammar_item(topic) -> dict:
+        return {
+            'kind': 'grammar',
+            'topic_id': topic.id,
+            'slug': topic.slug,
+            'name': topic.name,
+            'name_es': topic.name_es,
+            'pattern': topic.pattern,
+            'examples': topic.examples,
+        }
+
+    @staticmethod
+    def _exercise_item(exercise) -> dict:
+        ex_type = get_exercise_type(exercise)
+        return {
+            'kind': 'exercise',
+            'exercise_type': ex_type,
+            'type_code': get_type_code(ex_type),
+            'exercise': exercise.get_display_data(),
+        }
+
+    @staticmethod
+    def _milestone_data(milestone) -> Optional[dict]:
+        if milestone is None:
+            return None
+        return {
+            'id': milestone.id,
+            'name': milestone.name,
+            'level': milestone.level,
+            'order': milestone.order,
+            'estimated_time': milestone.estimated_time,
+            'scenario_slug': milestone.scenario.slug,
+        }
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _key(self, user) -> str:
+        return f"{self.CACHE_PREFIX}:{user.id}"
+
+    def _load(self, user, session_id: str) -> dict:
+        state = cache.get(self._key(user))
+        if not state or state['session_id'] != session_id:
+            raise SessionNotFound(session_id)
+        return state
@@ -0,0 +1,20 @@
+"""
+Progress Versions
+Cheap validators for conditional GETs on per-user progress
+"""
+from django.db.models import Count, Max
+
+from ..models import UserMilestoneProgress
+
+
+def progress_version(request, **kwargs) -> str:
+    """
+    The user's milestone progress as (count, latest last_activity).
+    Every progress write goes through save() or ScenarioStatsProjection,
+    both of which move last_activity. Queries: 1
+    """
+    stats = UserMilestoneProgress.objects.filter(user=request.user).aggregate(
+        count=Count('id'), latest=Max('last_activity'),
+    )
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    return f"{stats['count']}:{latest}"
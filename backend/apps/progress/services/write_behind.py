@@ -0,0 +1,460 @@
+"""
+Write-Behind Event Buffer
+Takes high-frequency learning writes (attempts, reviews) off the
+request thread and applies them to the database in batches.
+"""
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.events.models import LearningEvent
+from apps.events.services import event_log
+from apps.users.services import activity_batch, record_activity
+
+try:
+    import fcntl
+except ImportError:  # Windows: orphan spools are replayed by flush_learning_events
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# Event kinds
+ATTEMPT = 'attempt'
+REVIEW = 'review'
+
+# kind -> function applying a list of payloads inside the flush transaction
+HANDLERS: Dict[str, Callable[[List[dict]], None]] = {}
+
+
+def register_handler(kind: str):
+    """Decorator registering the batch handler for an event kind"""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+class LearningEventBuffer:
+    """
+    In-process write-behind buffer with at-least-once delivery.
+
+    submit() appends the event to a local spool file (fsync'd) and to the
+    in-memory queue, then returns. A background thread flushes the queue
+    when it reaches max_batch events or every flush_interval seconds.
+    Each flush applies the batch and its ProcessedEvent receipts in one
+    transaction, so events replayed after a crash are skipped by key.
+
+    Each process owns one spool file (named per start), held with an
+    exclusive lock. Spools left behind by dead processes are picked up on
+    start.
+    """
+
+    def __init__(
+        self,
+        spool_dir=None,
+        max_batch: int = None,
+        flush_interval: float = None,
+        fsync: bool = None,
+        enabled: bool = None,
+    ):
+        config = getattr(settings, 'LEARNING_EVENTS', {})
+
+        self.spool_dir = Path(spool_dir or config.get('spool_dir', settings.BASE_DIR / 'var' / 'spool'))
+        self.max_batch = max_batch or config.get('max_batch', 200)
+        self.flush_interval = flush_interval or config.get('flush_interval_seconds', 1.0)
+        self.fsync = config.get('fsync', True) if fsync is None else fsync
+        self.enabled = config.get('write_behind', True) if enabled is None else enabled
+
+        self._lock = threading.Lock()        # pending queue + spool file
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._wake = threading.Event()
+        self._stopped = False
+        self._pending: List[dict] = []
+        self._thread: Optional[threading.Thread] = None
+        self._spool = None
+        self._spool_path: Optional[Path] = None
+        self._lock_handle = None
+        self._pid = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, kind: str, payload: dict, key: str = None) -> str:
+        """
+        Queue one event. Returns its idempotency key.
+        With write-behind disabled the event is applied immediately.
+        """
+        if kind not in HANDLERS:
+            raise ValueError(f"Unknown learning event kind: {kind}")
+
+        line = json.dumps(
+            {'key': key or uuid.uuid4().hex, 'kind': kind, 'payload': payload},
+            cls=DjangoJSONEncoder,
+        )
+        event = json.loads(line)
+
+        if not self.enabled:
+            self.apply([event])
+            return event['key']
+
+        self._ensure_started()
+
+        with self._lock:
+            self._write_spool(line)
+            self._pending.append(event)
+            full = len(self._pending) >= self.max_batch
+
+        if full:
+            self._wake.set()
+
+        return event['key']
+
+    def flush(self) -> int:
+        """Apply everything queued so far. Returns events flushed."""
+        flushed = 0
+
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[:self.max_batch]
+                if not batch:
+                    break
+
+                self.apply(batch)
+
+                with self._lock:
+                    # Only the flusher removes from the front of the queue
+                    del self._pending[:len(batch)]
+                    self._rewrite_spool()
+                flushed += len(batch)
+
+        return flushed
+
+    def apply(self, events: List[dict]):
+        """
+        Apply events to the database.
+
+        A batch that fails on bad data is retried one event at a time and
+        the offending events are logged and dropped. Database outages
+        propagate so the events stay queued.
+        """
+        try:
+            self._apply_batch(events)
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception:
+            if len(events) == 1:
+                logger.exception("Dropping learning event %s", events[0]['key'])
+                return
+
+            logger.exception("Learning event batch failed, retrying one by one")
+            for event in events:
+                self.apply([event])
+
+    def shutdown(self):
+        """Stop the flusher and write out what is left"""
+        self._stopped = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval * 5)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final learning event flush failed, events remain in %s", self._spool_path)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def replay_orphans(self) -> int:
+        """
+        Apply spool files not owned by a live process (deleting them).
+        Used by flush_learning_events while the app servers are stopped.
+        """
+        replayed = 0
+        for path, events, release in self._claim_orphans():
+            for start in range(0, len(events), self.max_batch):
+                self.apply(events[start:start + self.max_batch])
+            path.unlink(missing_ok=True)
+            release()
+            replayed += len(events)
+        return replayed
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @transaction.atomic
+    def _apply_batch(self, events: List[dict]):
+        from ..models import ProcessedEvent
+
+        done = set(
+            ProcessedEvent.objects.filter(
+                key__in=[e['key'] for e in events]
+            ).values_list('key', flat=True)
+        )
+
+        fresh, seen = [], set(done)
+        for event in events:
+            if event['key'] not in seen:
+                seen.add(event['key'])
+                fresh.append(event)
+        if not fresh:
+            return
+
+        by_kind = defaultdict(list)
+        for event in fresh:
+            by_kind[event['kind']].append(event['payload'])
+
+        # One DailyActivity upsert for the whole batch
+        with activity_batch():
+            for kind, payloads in by_kind.items():
+                HANDLERS[kind](payloads)
+
+        ProcessedEvent.objects.bulk_create([ProcessedEvent(key=e['key']) for e in fresh])
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            # Forked child: drop the parent's state, open our own spool
+            self._pending = []
+            self._pid = os.getpid()
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+            # Unique per start: a restarted container reuses hostname and
+            # pid, and its predecessor's spool must be adopted, not reopened
+            name = f"{socket.gethostname()}-{self._pid}-{uuid.uuid4().hex[:8]}"
+            self._lock_handle = open(self.spool_dir / f"{name}.lock", 'w')
+            if fcntl:
+                fcntl.flock(self._lock_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            self._spool_path = self.spool_dir / f"{name}.spool"
+            self._spool = open(self._spool_path, 'a', encoding='utf-8')
+
+            # Adopt spools of dead processes: copy into ours, then delete
+            if fcntl:
+                for path, events, release in self._claim_orphans():
+                    for event in events:
+                        self._write_spool(json.dumps(event))
+                    self._pending.extend(events)
+                    path.unlink(missing_ok=True)
+                    release()
+
+            self._thread = threading.Thread(
+                target=self._run, name='learning-event-flusher', daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Learning event flush failed, will retry")
+            finally:
+                close_old_connections()
+
+    def _write_spool(self, line: str):
+        self._spool.write(line + '\n')
+        self._spool.flush()
+        if self.fsync:
+            os.fsync(self._spool.fileno())
+
+    def _rewrite_spool(self):
+        """Replace the spool with the still-pending events (atomic rename)"""
+        tmp_path = self._spool_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as tmp:
+            for event in self._pending:
+                tmp.write(json.dumps(event) + '\n')
+            tmp.flush()
+            if self.fsync:
+                os.fsync(tmp.fileno())
+
+        self._spool.close()
+        os.replace(tmp_path, self._spool_path)
+        self._spool = open(self._spool_path, 'a', encoding='utf-8')
+
+    def _claim_orphans(self):
+        """Yield (path, events, release) for spools whose owner is gone"""
+        if not self.spool_dir.exists():
+            return
+
+        for path in sorted(self.spool_dir.glob('*.spool')):
+            if path == self._spool_path:
+                continue
+
+            lock_handle = open(path.with_suffix('.lock'), 'a')
+            if fcntl:
+                try:
+                    fcntl.flock(lock_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    lock_handle.close()
+                    continue  # owner still running
+
+            events = []
+            with open(path, encoding='utf-8') as spool:
+                for line in spool:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        # Torn last line from a crash mid-write: never acknowledged
+                        logger.warning("Skipping unreadable spool line in %s", path)
+
+            def release(handle=lock_handle, lock_path=path.with_suffix('.lock')):
+                handle.close()
+                lock_path.unlink(missing_ok=True)
+
+            yield path, events, release
+
+
+learning_events = LearningEventBuffer()
+
+
+# ----------------------------------------------------------------------
+# Producers (called on the request thread)
+# ----------------------------------------------------------------------
+
+def record_attempt(user, exercise, user_answer, is_correct, started_at,
+                   milestone_id=None, hints_used=0) -> str:
+    """Buffer an exercise attempt (AttemptLog row + ability + XP)"""
+    from apps.exercises.registry import get_exercise_type
+
+    return learning_events.submit(ATTEMPT, {
+        'user_id': user.id,
+        'exercise_type': get_exercise_type(exercise),
+        'exercise_id': exercise.id,
+        'grammar_topic_id': exercise.grammar_topic_id,
+        'difficulty': exercise.difficulty,
+        'milestone_id': milestone_id,
+        'user_answer': user_answer,
+        'is_correct': is_correct,
+        'hints_used': hints_used,
+        'xp_earned': exercise.xp_reward if is_correct else 0,
+        'started_at': started_at,
+        'completed_at': timezone.now(),
+    })
+
+
+def record_review(user, vocabulary_id, quality) -> str:
+    """Buffer an SRS review result (quality 0-5)"""
+    return learning_events.submit(REVIEW, {
+        'user_id': user.id,
+        'vocabulary_id': vocabulary_id,
+        'quality': quality,
+    })
+
+
+# ----------------------------------------------------------------------
+# Handlers (run inside the flush transaction)
+# ----------------------------------------------------------------------
+
+@register_handler(ATTEMPT)
+def apply_attempts(payloads: List[dict]):
+    from apps.exercises.registry import get_type_code
+    from ..models import AttemptLog, UserMilestoneProgress
+    from .attempts import apply_attempt_effects
+
+    linked = [p for p in payloads if p.get('milestone_id')]
+    progress_ids = {}
+    if linked:
+        progress_ids = {
+            (user_id, milestone_id): pk
+            for user_id, milestone_id, pk in UserMilestoneProgress.objects.filter(
+                user_id__in={p['user_id'] for p in linked},
+                milestone_id__in={p['milestone_id'] for p in linked},
+            ).values_list('user_id', 'milestone_id', 'id')
+        }
+
+    rows = []
+    for p in payloads:
+        started_at = parse_datetime(p['started_at'])
+        completed_at = parse_datetime(p['completed_at'])
+
+        rows.append(AttemptLog(
+            user_id=p['user_id'],
+            milestone_progress_id=progress_ids.get((p['user_id'], p.get('milestone_id'))),
+            exercise_type=get_type_code(p['exercise_type']),
+            exercise_id=p['exercise_id'],
+            user_answer=p['user_answer'],
+            is_correct=p['is_correct'],
+            score=100 if p['is_correct'] else 0,
+            hints_used=p['hints_used'],
+            xp_earned=p['xp_earned'],
+            started_at=started_at,
+            completed_at=completed_at,
+            time_spent_seconds=max(int((completed_at - started_at).total_seconds()), 0),
+        ))
+
+    # bulk_create sets the ids the XP keys are built from
+    AttemptLog.objects.bulk_create(rows)
+    apply_attempt_effects(rows, [
+        {
+            'exercise_type': p['exercise_type'],
+            'grammar_topic_id': p['grammar_topic_id'],
+            'difficulty': p['difficulty'],
+            'milestone_id': p.get('milestone_id'),
+        }
+        for p in payloads
+    ])
+
+
+@register_handler(REVIEW)
+def apply_reviews(payloads: List[dict]):
+    from apps.content.models import UserVocabularyProgress
+
+    rows = {
+        (row.user_id, row.vocabulary_id): row
+        for row in UserVocabularyProgress.objects.filter(
+            user_id__in={p['user_id'] for p in payloads},
+            vocabulary_id__in={p['vocabulary_id'] for p in payloads},
+        )
+    }
+
+    # SM-2 is sequential: replay reviews in submission order
+    events = []
+    for p in payloads:
+        key = (p['user_id'], p['vocabulary_id'])
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = UserVocabularyProgress(
+                user_id=p['user_id'], vocabulary_id=p['vocabulary_id']
+            )
+
+        was_mastered = row.status == 'mastered'
+        row.process_review(p['quality'])
+        mastered = row.status == 'mastered' and not was_mastered
+
+        record_activity(p['user_id'], words_reviewed=1, words_learned=int(mastered))
+        events.append((LearningEvent.Kind.REVIEW_GRADED, p['user_id'], {
+            'vocabulary_id': p['vocabulary_id'],
+            'quality': p['quality'],
+            'mastered': mastered,
+        }))
+
+    event_log.append_many(events)
@@ -1,3 +1,191 @@
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.services import ConsumerRunner, get_consumers
+from apps.exercises.models import FillBlankExercise
+from apps.exercises.registry import get_exercise_type
+from apps.memory_palace.models import Milestone, Scenario
+from apps.users.models import LearningProfile, XPGrant
+
+from .models import AttemptLog, UserMilestoneProgress, UserScenarioStats
+from .services.write_behind import ATTEMPT, LearningEventBuffer
+
+User = get_user_model()
+
+
+class AttemptTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ana', password='x')
+        LearningProfile.objects.create(user=self.user)
+        self.exercise = FillBlankExercise.objects.create(
+            level='A1',
+            sentence_with_blanks='I ___ happy',
+            sentence_complete='I am happy',
+            correct_answers=['am'],
+            xp_reward=10,
+        )
+
+    def total_xp(self):
+        return LearningProfile.objects.get(user=self.user).total_xp
+
+
+class AttemptLogRecordTests(AttemptTestCase):
+
+    def test_correct_attempt_credits_xp_keyed_by_attempt(self):
+        attempt = AttemptLog.record(self.user, self.exercise, 'am', True, timezone.now())
+
+        self.assertEqual(self.total_xp(), 10)
+        self.assertEqual(list(XPGrant.objects.values_list('key', flat=True)), [f'attempt:{attempt.id}'])
+
+    def test_failing_effect_rolls_back_the_attempt(self):
+        with mock.patch('apps.progress.services.attempts.event_log.append_many', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                AttemptLog.record(self.user, self.exercise, 'am', True, timezone.now())
+
+        self.assertFalse(AttemptLog.objects.exists())
+        self.assertFalse(XPGrant.objects.exists())
+        self.assertEqual(self.total_xp(), 0)
+
+
+class WriteBehindReplayTests(AttemptTestCase):
+
+    def setUp(self):
+        super().setUp()
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        self.spool_dir = Path(spool.name)
+        self.buffer = LearningEventBuffer(spool_dir=self.spool_dir, enabled=False)
+
+        started_at = timezone.now()
+        self.event = {'key': 'attempt-event-1', 'kind': ATTEMPT, 'payload': {
+            'user_id': self.user.id,
+            'exercise_type': get_exercise_type(self.exercise),
+            'exercise_id': self.exercise.id,
+            'grammar_topic_id': None,
+            'difficulty': self.exercise.difficulty,
+            'milestone_id': None,
+            'user_answer': 'am',
+            'is_correct': True,
+            'hints_used': 0,
+            'xp_earned': 10,
+            'started_at': started_at.isoformat(),
+            'completed_at': started_at.isoformat(),
+        }}
+
+    def test_replayed_event_is_applied_once(self):
+        self.buffer.apply([self.event])
+        self.buffer.apply([self.event])
+
+        self.assertEqual(AttemptLog.objects.count(), 1)
+        self.assertEqual(XPGrant.objects.count(), 1)
+        self.assertEqual(self.total_xp(), 10)
+
+    def test_duplicate_keys_in_one_batch_count_once(self):
+        self.buffer.apply([self.event, self.event])
+
+        self.assertEqual(AttemptLog.objects.count(), 1)
+        self.assertEqual(self.total_xp(), 10)
+
+    def test_orphan_spool_of_applied_events_does_not_credit_again(self):
+        # Crash after the flush committed but before the spool was rewritten
+        self.buffer.apply([self.event])
+        (self.spool_dir / 'host-1.spool').write_text(json.dumps(self.event) + '\n')
+
+        self.assertEqual(self.buffer.replay_orphans(), 1)
+
+        self.assertFalse((self.spool_dir / 'host-1.spool').exists())
+        self.assertEqual(AttemptLog.objects.count(), 1)
+        self.assertEqual(self.total_xp(), 10)
+
+    def test_spool_left_by_a_previous_run_with_the_same_pid_is_adopted(self):
+        # A restarted container gets the same hostname and pid
+        leftover = self.spool_dir / f'{socket.gethostname()}-{os.getpid()}.spool'
+        leftover.write_text(json.dumps(self.event) + '\n')
+        buffer = LearningEventBuffer(spool_dir=self.spool_dir, flush_interval=3600, fsync=False, enabled=True)
+        self.addCleanup(buffer.shutdown)
+
+        buffer._ensure_started()
+
+        self.assertFalse(leftover.exists())
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(AttemptLog.objects.count(), 1)
+        self.assertEqual(self.total_xp(), 10)
+
+
+class ScenarioStatsProjectionTests(AttemptTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.scenario = Scenario.objects.create(name='Restaurant', slug='restaurant')
+        milestone = Milestone.objects.create(scenario=self.scenario, level='A1', order=1, name='Order')
+        self.progress = UserMilestoneProgress.objects.create(user=self.user, milestone=milestone)
+
+        AttemptLog.record(self.user, self.exercise, 'am', True, timezone.now(), milestone_progress=self.progress)
+        AttemptLog.record(self.user, self.exercise, 'is', False, timezone.now(), milestone_progress=self.progress)
+
+    def exercises_completed(self):
+        return UserMilestoneProgress.objects.get(pk=self.progress.pk).exercises_completed
+
+    def test_milestone_counters_move_with_the_consumer(self):
+        self.assertEqual(self.exercises_completed(), 0)  # not on the request path
+
+        ConsumerRunner().run_all(['scenario_stats'])
+
+        self.assertEqual(self.exercises_completed(), 1)
+        stats = UserScenarioStats.objects.get(user=self.user, scenario=self.scenario)
+        self.assertEqual((stats.attempts, stats.correct_attempts, stats.xp_earned), (2, 1, 10))
+
+    def test_rebuild_does_not_count_attempts_twice(self):
+        runner = ConsumerRunner()
+        runner.run_all(['scenario_stats'])
+
+        runner.rebuild(get_consumers()['scenario_stats'])
+
+        self.assertEqual(self.exercises_completed(), 1)
+        self.assertEqual(UserScenarioStats.objects.get(user=self.user).attempts, 2)
+
+    def test_scenario_view_reads_the_projection(self):
+        ConsumerRunner().run_all(['scenario_stats'])
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(reverse('progress:scenario_progress', args=[self.scenario.slug]))
+
+        self.assertEqual(response.json()['stats'], {
+            'attempts': 2, 'correct_attempts': 1, 'accuracy_rate': 0.5, 'xp_earned': 10,
+        })
+
+
+class MilestoneCompleteTests(AttemptTestCase):
+
+    def setUp(self):
+        super().setUp()
+        scenario = Scenario.objects.create(name='Restaurant', slug='restaurant')
+        milestone = Milestone.objects.create(scenario=scenario, level='A1', order=1, name='Order')
+        self.progress = UserMilestoneProgress.objects.create(user=self.user, milestone=milestone)
+
+    def test_first_completion_grants_xp_once(self):
+        self.progress.complete()
+        self.progress.complete()
+
+        self.assertEqual(list(XPGrant.objects.values_list('key', flat=True)), [f'milestone:{self.progress.id}'])
+
+    def test_failing_event_rolls_back_the_completion(self):
+        with mock.patch('apps.events.services.event_log.append', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.progress.complete()
 
-# Create your tests here.
+        self.assertEqual(UserMilestoneProgress.objects.get(pk=self.progress.pk).status, 'not_started')
+        self.assertFalse(XPGrant.objects.exists())
+        self.assertEqual(self.total_xp(), 0)
@@ -9,6 +9,7 @@ app_name = 'progress'
 urlpatterns = [
     # Overall progress
     path('', views.my_progress, name='my_progress'),
+    path('dashboard/', views.dashboard, name='dashboard'),
     
     # Scenario progress
     path('scenario/<slug:scenario_slug>/', views.scenario_progress, name='scenario_progress'),
@@ -19,4 +20,15 @@ urlpatterns = [
     path('milestone/<int:milestone_id>/', views.milestone_detail, name='milestone_detail'),
     path('start/', views.start_milestone, name='start_milestone'),
     path('complete/', views.complete_milestone, name='complete_milestone'),
+    
+    # Exercise attempts
+    path('attempt/', views.submit_attempt, name='submit_attempt'),
+    
+    # Vocabulary reviews
+    path('review/', views.submit_review, name='submit_review'),
+    
+    # Learning sessions
+    path('session/start/', views.start_session, name='start_session'),
+    path('session/<str:session_id>/next/', views.session_next, name='session_next'),
+    path('session/<str:session_id>/end/', views.end_session, name='end_session'),
 ]
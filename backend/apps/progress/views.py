@@ -1,19 +1,30 @@
 """
 Progress API Views
 """
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.http_cache import catalogue, conditional_get
+from apps.content.models import Vocabulary
+from apps.exercises.registry import get_exercise_model
 from apps.memory_palace.models import Scenario, Milestone
-from .models import UserMilestoneProgress, UserExerciseAttempt
+from .models import UserMilestoneProgress, UserExerciseAttempt, UserScenarioStats
+from .services.dashboard import DashboardService
+from .services.session import LearningSessionAssembler, SessionNotFound
+from .services.versions import progress_version
+from .services.write_behind import record_attempt, record_review
 from .serializers import (
     UserMilestoneProgressSerializer,
     ScenarioProgressSerializer,
     MilestoneSimpleSerializer,
     StartMilestoneSerializer,
     CompleteMilestoneSerializer,
+    SubmitAttemptSerializer,
+    SubmitReviewSerializer,
+    StartSessionSerializer,
 )
 
 
@@ -51,6 +62,7 @@ def my_progress(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(catalogue, progress_version, private=True)
 def scenario_progress(request, scenario_slug):
     """
     GET /api/v1/progress/scenario/<slug>/
@@ -66,6 +78,9 @@ def scenario_progress(request, scenario_slug):
     # Get progress summary
     progress = UserMilestoneProgress.get_scenario_progress(user, scenario)
     
+    # Attempt counters (event log projection, may lag a few seconds)
+    stats = UserScenarioStats.objects.filter(user=user, scenario=scenario).first()
+    
     # Get milestone details
     milestones = Milestone.objects.filter(scenario=scenario).order_by('level', 'order')
     
@@ -91,12 +106,19 @@ def scenario_progress(request, scenario_slug):
             'icon': scenario.icon,
         },
         'progress': progress,
+        'stats': {
+            'attempts': stats.attempts if stats else 0,
+            'correct_attempts': stats.correct_attempts if stats else 0,
+            'accuracy_rate': stats.accuracy_rate if stats else 0.0,
+            'xp_earned': stats.xp_earned if stats else 0,
+        },
         'milestones': milestone_data,
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(catalogue, progress_version, private=True)
 def pending_milestones(request, scenario_slug):
     """
     GET /api/v1/progress/scenario/<slug>/pending/
@@ -120,6 +142,7 @@ def pending_milestones(request, scenario_slug):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(catalogue, progress_version, private=True)
 def next_milestone(request, scenario_slug):
     """
     GET /api/v1/progress/scenario/<slug>/next/
@@ -253,3 +276,139 @@ def milestone_detail(request, milestone_id):
         'status': progress.status,
         'progress': UserMilestoneProgressSerializer(progress).data,
     })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_attempt(request):
+    """
+    POST /api/v1/progress/attempt/
+    Check an exercise answer and record the attempt
+    Body: { "exercise_type": "wordorder", "exercise_id": 1, "answer": [...],
+            "started_at": "...", "milestone_id": 123, "hints_used": 0 }
+    The attempt is written in the background; the response only needs the check.
+    """
+    serializer = SubmitAttemptSerializer(data=request.data)
+    
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=400)
+    
+    data = serializer.validated_data
+    model = get_exercise_model(data['exercise_type'])
+    
+    exercise = model.objects.filter(id=data['exercise_id'], is_active=True).first()
+    if not exercise:
+        return Response({'error': 'Exercise not found'}, status=404)
+    
+    is_correct, feedback = exercise.check_answer(data['answer'])
+    
+    record_attempt(
+        request.user,
+        exercise,
+        data['answer'],
+        is_correct,
+        data['started_at'],
+        milestone_id=data.get('milestone_id'),
+        hints_used=data['hints_used'],
+    )
+    
+    return Response({
+        'is_correct': is_correct,
+        'feedback': feedback,
+        'xp_earned': exercise.xp_reward if is_correct else 0,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_review(request):
+    """
+    POST /api/v1/progress/review/
+    Grade a vocabulary review (e.g. a session's review item)
+    Body: { "vocabulary_id": 1, "quality": 4 }  (0=fail, 3=hard, 4=good, 5=easy)
+    The review is applied in the background (SM-2 schedule, activity, event log).
+    """
+    serializer = SubmitReviewSerializer(data=request.data)
+    
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=400)
+    
+    data = serializer.validated_data
+    if not Vocabulary.objects.filter(id=data['vocabulary_id']).exists():
+        return Response({'error': 'Vocabulary not found'}, status=404)
+    
+    record_review(request.user, data['vocabulary_id'], data['quality'])
+    
+    return Response({
+        'vocabulary_id': data['vocabulary_id'],
+        'quality': data['quality'],
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def start_session(request):
+    """
+    POST /api/v1/progress/session/start/
+    Build a learning session: due reviews, next grammar point, exercises
+    Body: { "scenario_slug": "restaurant" }  (optional, default: continue last milestone)
+    """
+    serializer = StartSessionSerializer(data=request.data)
+    
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=400)
+    
+    session = LearningSessionAssembler().start(
+        request.user,
+        scenario_slug=serializer.validated_data.get('scenario_slug') or None,
+    )
+    
+    return Response(session, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def session_next(request, session_id):
+    """
+    GET /api/v1/progress/session/<session_id>/next/
+    Get the next item of the session
+    """
+    try:
+        result = LearningSessionAssembler().get_next(request.user, session_id)
+    except SessionNotFound:
+        return Response({'error': 'Session not found'}, status=404)
+    
+    return Response(result)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def end_session(request, session_id):
+    """
+    POST /api/v1/progress/session/<session_id>/end/
+    Close the session and get its summary
+    """
+    try:
+        summary = LearningSessionAssembler().end(request.user, session_id)
+    except SessionNotFound:
+        return Response({'error': 'Session not found'}, status=404)
+    
+    return Response(summary)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard(request):
+    """
+    GET /api/v1/progress/dashboard/
+    Everything the home screen shows in one response (cached per user).
+    Send the last ETag in If-None-Match to get 304 when nothing changed.
+    """
+    snapshot = DashboardService().get(request.user)
+    etag = quote_etag(snapshot['etag'])
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(snapshot['data'], headers=headers)
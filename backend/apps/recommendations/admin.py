@@ -8,7 +8,7 @@ from .models import RecommendationLog
 
 @admin.register(RecommendationLog)
 class RecommendationLogAdmin(admin.ModelAdmin):
-    list_display = ['user', 'user_level', 'total_available', 'processing_time_ms', 'created_at']
-    list_filter = ['user_level', 'created_at']
+    list_display = ['user', 'user_level', 'pipeline', 'cache_hit', 'ai_fallback', 'processing_time_ms', 'created_at']
+    list_filter = ['user_level', 'pipeline', 'cache_hit', 'ai_fallback', 'created_at']
     search_fields = ['user__username', 'user__email']
     readonly_fields = ['user', 'scenario_ids', 'user_goals', 'user_interests', 'filters_applied', 'created_at']
@@ -0,0 +1,30 @@
+"""
+Print recommendation latency and cache / AI fallback rates.
+Run with: python manage.py recommendation_stats --days 7
+"""
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services import RecommendationAnalytics, recommendation_log
+
+
+class Command(BaseCommand):
+    help = 'Summarize recommendation logs: p50/p95 per pipeline, cache hit ratio, AI fallback rate'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Window size in days')
+
+    def handle(self, *args, **options):
+        recommendation_log.flush()
+        summary = RecommendationAnalytics().summary(days=options['days'])
+
+        self.stdout.write(f"Since {summary['since']:%Y-%m-%d %H:%M} ({summary['total']} sampled calls)")
+        for pipeline, stats in summary['latency_by_pipeline'].items():
+            self.stdout.write(
+                f"  {pipeline}: n={stats['count']} avg={stats['avg_ms']}ms "
+                f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Cache hit ratio: {summary['cache_hit_ratio']}  "
+            f"AI fallback rate: {summary['ai_fallback_rate']} ({summary['ai_fallbacks']}/{summary['ai_calls']})"
+        ))
@@ -0,0 +1,24 @@
+"""
+Place new scenarios into every user's stored ordering (no AI calls).
+Run with: python manage.py sync_scenario_orderings
+"""
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services import ScenarioOrderingSync
+
+
+class Command(BaseCommand):
+    help = 'Insert scenarios added since each ordering was built, for users whose goals/interests match'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Run even if the catalogue version has not changed since the last sync',
+        )
+
+    def handle(self, *args, **options):
+        stats = ScenarioOrderingSync().sync(force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['scenarios']} new scenarios, {stats['users']} matching users, "
+            f"{stats['updated']} orderings updated"
+        ))
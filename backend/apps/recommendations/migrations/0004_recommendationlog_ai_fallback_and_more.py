@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0003_userorderedscenarios_delete_userrecommendationcache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationlog',
+            name='ai_fallback',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='recommendationlog',
+            name='cache_hit',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='recommendationlog',
+            name='pipeline',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationlog',
+            index=models.Index(fields=['created_at'], name='recommendat_created_beea1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationlog',
+            index=models.Index(fields=['pipeline', 'processing_time_ms'], name='recommendat_pipelin_3dcfdf_idx'),
+        ),
+    ]
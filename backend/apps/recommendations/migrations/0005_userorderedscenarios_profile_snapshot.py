@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0004_recommendationlog_ai_fallback_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userorderedscenarios',
+            name='profile_snapshot',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
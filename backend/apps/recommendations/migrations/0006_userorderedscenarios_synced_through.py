@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0005_userorderedscenarios_profile_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userorderedscenarios',
+            name='synced_through',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -27,6 +27,9 @@ class RecommendationLog(models.Model):
     
     # Filters applied
     filters_applied = models.JSONField(default=list)
+    pipeline = models.CharField(max_length=100, blank=True)  # e.g. "LevelFilter>AIRanker", "cached"
+    cache_hit = models.BooleanField(default=False)
+    ai_fallback = models.BooleanField(default=False)  # AI ranking failed, kept level order
     
     # Timing
     processing_time_ms = models.IntegerField(default=0)
@@ -35,6 +38,10 @@ class RecommendationLog(models.Model):
     class Meta:
         db_table = 'recommendation_logs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['pipeline', 'processing_time_ms']),
+        ]
         verbose_name = 'Recommendation Log'
         verbose_name_plural = 'Recommendation Logs'
     
@@ -63,6 +70,10 @@ class UserOrderedScenarios(models.Model):
     
     # Track what profile data was used (to detect changes)
     profile_hash = models.CharField(max_length=64, blank=True)
+    profile_snapshot = models.JSONField(default=dict, blank=True)  # canonical profile, see profile_changes.py
+    
+    # Latest Scenario.updated_at already merged into the order (see catalogue_sync.py)
+    synced_through = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         db_table = 'user_ordered_scenarios'
@@ -76,6 +87,7 @@ class UserOrderedScenarios(models.Model):
         """Clear order to force regeneration on next request."""
         self.scenario_order = []
         self.profile_hash = ''
+        self.profile_snapshot = {}
         self.save()
 
 
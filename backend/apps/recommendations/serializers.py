@@ -48,4 +48,6 @@ class RecommendationResultSerializer(serializers.Serializer):
     total_count = serializers.IntegerField()
     user_level = serializers.CharField()
     applied_filters = serializers.ListField(child=serializers.CharField())
+    processing_time_ms = serializers.IntegerField()
+    timings = serializers.DictField(child=serializers.FloatField())
 
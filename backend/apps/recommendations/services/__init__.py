@@ -5,6 +5,12 @@ from .level_filter import LevelFilter
 from .goal_ranker import GoalRanker
 from .interest_matcher import InterestMatcher
 from .ai_ranker import AIRanker
+from .analytics import RecommendationAnalytics
+from .catalogue_sync import ScenarioOrderingSync
+from .log_writer import RecommendationLogWriter, recommendation_log
+from .profile_changes import ProfileChange, canonical_profile, classify_change
+from .timing import PipelineTimer, StageMetrics, stage_metrics, timed
+from .warmup import RecommendationWarmer, recommendation_warmer
 
 __all__ = [
     'RecommendationEngine',
@@ -13,4 +19,17 @@ __all__ = [
     'GoalRanker',
     'InterestMatcher',
     'AIRanker',
+    'RecommendationAnalytics',
+    'ScenarioOrderingSync',
+    'RecommendationLogWriter',
+    'recommendation_log',
+    'ProfileChange',
+    'canonical_profile',
+    'classify_change',
+    'PipelineTimer',
+    'StageMetrics',
+    'stage_metrics',
+    'timed',
+    'RecommendationWarmer',
+    'recommendation_warmer',
 ]
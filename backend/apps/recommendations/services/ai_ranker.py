@@ -3,25 +3,56 @@ AI Ranker Service
 Uses OpenAI to intelligently rank scenarios based on user profile
 """
 
+import logging
 from typing import List, Dict, Any
+from django.conf import settings
 from apps.memory_palace.models import Scenario
 from apps.ai_services.clients.openai_client import OpenAIClient
 from apps.ai_services.prompts.scenario_ranking import (
     SCENARIO_RANKING_SYSTEM,
-    format_scenario_ranking_prompt
+    format_scenario_ranking_prompt,
+    format_scenario_line,
 )
 from .base import BaseRecommender
+from .profile_changes import canonical_profile, sort_by_local_score
+from .timing import timed
+
+logger = logging.getLogger(__name__)
 
 
 class AIRanker(BaseRecommender):
     """
     Uses AI to rank scenarios based on user profile.
     Considers profession, interests, hobbies, and goals intelligently.
+    
+    Two stages, so the prompt stays the same size as the catalogue grows:
+      1. a local score (goal + interest weights, see profile_changes)
+         shortlists the top `shortlist_size` scenarios
+      2. the AI re-ranks only the shortlist, trimmed further if its
+         prompt would exceed `max_prompt_tokens`
+    The rest follows in local order. Both limits come from
+    settings.RECOMMENDATION_AI_RANKING.
     """
     
-    def __init__(self, model: str = "gpt-4o-mini"):
+    SHORTLIST_SIZE = 30
+    MAX_PROMPT_TOKENS = 1500
+    MAX_RESPONSE_TOKENS = 1000
+    
+    # Rough size of English text / JSON in tokens (no tokenizer needed)
+    CHARS_PER_TOKEN = 4
+    
+    # Response: ~4 tokens per ranked id, plus the top-5 reasoning
+    TOKENS_PER_ID = 4
+    REASONING_TOKENS = 200
+    
+    def __init__(self, model: str = "gpt-4o-mini", shortlist_size: int = None, max_prompt_tokens: int = None):
+        config = getattr(settings, 'RECOMMENDATION_AI_RANKING', {})
         self.model = model
+        self.shortlist_size = shortlist_size or config.get('shortlist_size', self.SHORTLIST_SIZE)
+        self.max_prompt_tokens = max_prompt_tokens or config.get('max_prompt_tokens', self.MAX_PROMPT_TOKENS)
+        self.max_response_tokens = config.get('max_response_tokens', self.MAX_RESPONSE_TOKENS)
         self._client = None
+        self.fell_back = False  # last process() kept the local order after an AI error
     
     @property
     def name(self) -> str:
@@ -44,67 +75,87 @@ class AIRanker(BaseRecommender):
         Returns:
             Scenarios ordered by AI-determined relevance
         """
+        self.fell_back = False
         if not scenarios:
             return scenarios
         
-        # Prepare scenarios data for prompt
-        scenarios_data = []
-        scenario_map = {}
-        
-        for s in scenarios:
-            tags = [t.value for t in s.tags.all()]
-            scenarios_data.append({
-                'id': s.id,
-                'name': s.name,
-                'tags': tags
-            })
-            scenario_map[s.id] = s
+        # Stage 1: local shortlist (stable: ties keep the input order)
+        local_order = sort_by_local_score(scenarios, canonical_profile(user_profile))
+        shortlist = self._shortlist(local_order, user_profile)
+        scenario_map = {s.id: s for s in shortlist}
         
-        # Get AI ranking
+        # Stage 2: AI re-ranks the shortlist only
         try:
-            ranked_ids = self._get_ai_ranking(user_profile, scenarios_data)
+            ranked_ids = self._get_ai_ranking(user_profile, shortlist)
             
             # Reorder scenarios based on AI ranking
             ranked_scenarios = []
-            for sid in ranked_ids:
+            for sid in dict.fromkeys(ranked_ids):
                 if sid in scenario_map:
-                    ranked_scenarios.append(scenario_map[sid])
-            
-            # Add any scenarios not in AI response at the end
-            ranked_set = set(ranked_ids)
-            for s in scenarios:
-                if s.id not in ranked_set:
-                    ranked_scenarios.append(s)
+                    ranked_scenarios.append(scenario_map.pop(sid))
             
-            return ranked_scenarios
+            # Shortlisted scenarios the AI left out, then the rest, in local order
+            ranked_scenarios += [s for s in shortlist if s.id in scenario_map]
+            return ranked_scenarios + local_order[len(shortlist):]
             
         except Exception as e:
-            print(f"AIRanker error: {e}")
-            # Fallback to original order
-            return scenarios
+            logger.warning("AIRanker error: %s", e)
+            # Fallback to the local order
+            self.fell_back = True
+            return local_order
+    
+    def _shortlist(self, local_order: List[Scenario], user_profile: Dict[str, Any]) -> List[Scenario]:
+        """Top `shortlist_size` scenarios, cut where the prompt would exceed the token budget"""
+        budget = self.max_prompt_tokens - self._tokens(format_scenario_ranking_prompt(user_profile, []))
+        
+        shortlist = []
+        for scenario in local_order[:self.shortlist_size]:
+            budget -= self._tokens(format_scenario_line(self._prompt_data(scenario))) + 1
+            if budget < 0 and shortlist:
+                break
+            shortlist.append(scenario)
+        return shortlist
+    
+    @staticmethod
+    def _prompt_data(scenario: Scenario) -> Dict[str, Any]:
+        return {
+            'id': scenario.id,
+            'name': scenario.name,
+            'tags': [t.value for t in scenario.tags.all()],
+        }
+    
+    def _tokens(self, text: str) -> int:
+        return len(text) // self.CHARS_PER_TOKEN + 1
     
     def _get_ai_ranking(
         self,
         user_profile: Dict[str, Any],
-        scenarios_data: List[Dict[str, Any]]
+        scenarios: List[Scenario]
     ) -> List[int]:
         """Get ranked scenario IDs from AI."""
         
-        prompt = format_scenario_ranking_prompt(user_profile, scenarios_data)
+        prompt = format_scenario_ranking_prompt(user_profile, [self._prompt_data(s) for s in scenarios])
         
-        response = self.client.complete_json(
-            prompt=prompt,
-            system_prompt=SCENARIO_RANKING_SYSTEM,
-            temperature=0.3,
-            max_tokens=1000
+        # Room for every id and the reasoning, no more
+        max_tokens = min(
+            self.max_response_tokens,
+            len(scenarios) * self.TOKENS_PER_ID + self.REASONING_TOKENS,
         )
         
+        with timed('ai:openai'):
+            response = self.client.complete_json(
+                prompt=prompt,
+                system_prompt=SCENARIO_RANKING_SYSTEM,
+                temperature=0.3,
+                max_tokens=max_tokens
+            )
+        
         # Extract ranked IDs
         ranked_ids = response.get('ranked_ids', [])
         
         # Log reasoning for debugging
         if 'top_5_reasoning' in response:
             for item in response['top_5_reasoning'][:3]:
-                print(f"  AI: #{item.get('id')} - {item.get('reason')}")
+                logger.debug("AI: #%s - %s", item.get('id'), item.get('reason'))
         
         return ranked_ids
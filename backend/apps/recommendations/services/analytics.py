@@ -0,0 +1,76 @@
+"""
+Recommendation Analytics
+Latency percentiles, cache hit ratio and AI fallback rate from RecommendationLog
+"""
+import math
+from datetime import timedelta
+from typing import Dict
+
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from ..models import RecommendationLog
+
+AI_STAGE = 'AIRanker'
+
+
+class RecommendationAnalytics:
+    """
+    Rollups over a recent window of (sampled) recommendation logs.
+
+    Percentiles are nearest-rank, read with ORDER BY processing_time_ms
+    OFFSET k on the (pipeline, processing_time_ms) index, so they work
+    the same on PostgreSQL and SQLite.
+
+    Usage:
+        RecommendationAnalytics().summary(days=7)
+    """
+
+    PERCENTILES = (50, 95)
+
+    def summary(self, days: int = 7) -> dict:
+        since = timezone.now() - timedelta(days=days)
+        return {
+            'since': since,
+            'latency_by_pipeline': self.latency_by_pipeline(since),
+            **self.rates(since),
+        }
+
+    def latency_by_pipeline(self, since) -> Dict[str, dict]:
+        """{pipeline: {count, avg_ms, p50_ms, p95_ms}}"""
+        logs = RecommendationLog.objects.filter(created_at__gte=since)
+        groups = (
+            logs.values('pipeline')
+            .annotate(count=Count('id'), avg_ms=Avg('processing_time_ms'))
+            .order_by('pipeline')
+        )
+
+        latency = {}
+        for group in groups:
+            ordered = (
+                logs.filter(pipeline=group['pipeline'])
+                .order_by('processing_time_ms')
+                .values_list('processing_time_ms', flat=True)
+            )
+            stats = {'count': group['count'], 'avg_ms': round(group['avg_ms'] or 0, 1)}
+            for p in self.PERCENTILES:
+                rank = max(math.ceil(p / 100 * group['count']), 1)
+                stats[f'p{p}_ms'] = ordered[rank - 1]
+            latency[group['pipeline'] or '-'] = stats
+        return latency
+
+    def rates(self, since) -> dict:
+        """Cache hit ratio over all calls, AI fallback rate over AI-ranked calls"""
+        totals = RecommendationLog.objects.filter(created_at__gte=since).aggregate(
+            total=Count('id'),
+            cache_hits=Count('id', filter=Q(cache_hit=True)),
+            ai_calls=Count('id', filter=Q(pipeline__contains=AI_STAGE)),
+            ai_fallbacks=Count('id', filter=Q(ai_fallback=True)),
+        )
+        return {
+            **totals,
+            'cache_hit_ratio': round(totals['cache_hits'] / totals['total'], 3) if totals['total'] else None,
+            'ai_fallback_rate': (
+                round(totals['ai_fallbacks'] / totals['ai_calls'], 3) if totals['ai_calls'] else None
+            ),
+        }
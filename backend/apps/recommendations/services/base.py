@@ -34,6 +34,13 @@ class BaseRecommender(ABC):
         """Name of this recommender component."""
         pass
     
+    def run(self, scenarios: List[Scenario], user_profile: Dict[str, Any]) -> List[Scenario]:
+        """process() timed as a pipeline stage named after the component."""
+        from .timing import timed
+        
+        with timed(self.name):
+            return self.process(scenarios, user_profile)
+    
     @property
     def weight(self) -> float:
         """
@@ -0,0 +1,161 @@
+"""
+Scenario Ordering Sync
+Places new scenarios into every stored ordering without re-ranking anyone
+"""
+from typing import Dict, List
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from apps.core.catalogue import catalogue_version
+from apps.memory_palace.models import Scenario
+from apps.users.models import LearningProfile, ProfileTag
+from apps.users.services import scenario_tag_key, tag_index
+from .level_filter import LevelFilter
+from .profile_changes import canonical_profile, local_score
+
+# Profile tags local_score() weighs (work domain only matters to the AI)
+MATCHED_KINDS = (ProfileTag.Kind.GOAL, ProfileTag.Kind.INTEREST)
+
+
+class ScenarioOrderingSync:
+    """
+    Inserts scenarios created since an ordering was built into
+    UserOrderedScenarios.scenario_order, at the position a local
+    relevance score (profile_changes.local_score) gives them.
+
+    Each ordering records synced_through, the Scenario.updated_at
+    watermark it already covers. sync():
+      1. loads the active scenarios newer than the oldest watermark
+      2. maps their goal / interest tags to users through the profile
+         tag index (tag -> bitset of users), then loads only those
+         profiles
+      3. for those users only, inserts the scenarios missing from the
+         order in place, BATCH_SIZE orderings per transaction
+      4. moves every watermark forward in one UPDATE
+
+    Users whose profile matches none of the new tags are not touched:
+    the engine already appends unplaced scenarios to the end of their
+    order at read time. Scenarios already placed keep the AI's position.
+    No OpenAI calls are made.
+
+    Usage:
+        ScenarioOrderingSync().sync()          # no-op if the catalogue is unchanged
+        ScenarioOrderingSync().sync(force=True)
+    """
+
+    BATCH_SIZE = 500
+    SYNCED_VERSION_KEY = 'recommendations:orderings_synced_version'
+
+    def __init__(self):
+        self.level_filter = LevelFilter()
+
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """Returns counts: scenarios considered, users matched, orderings updated"""
+        from ..models import UserOrderedScenarios
+
+        stats = {'scenarios': 0, 'users': 0, 'updated': 0}
+
+        version = catalogue_version.get()
+        if not force and cache.get(self.SYNCED_VERSION_KEY) == version:
+            return stats
+
+        orderings = UserOrderedScenarios.objects.exclude(scenario_order=[])
+        watermark = orderings.aggregate(since=Min('synced_through'))['since']
+        has_unsynced = orderings.filter(synced_through=None).exists()
+
+        scenarios = Scenario.objects.filter(is_active=True).prefetch_related('tags')
+        if watermark is not None and not has_unsynced:
+            scenarios = scenarios.filter(updated_at__gt=watermark)
+        new_scenarios = {s.id: s for s in scenarios}
+        stats['scenarios'] = len(new_scenarios)
+
+        if new_scenarios:
+            through = max(s.updated_at for s in new_scenarios.values())
+            users = self._matching_users(new_scenarios.values())
+            stats['users'] = len(users)
+
+            placed = {
+                s.id: s for s in
+                Scenario.objects.filter(is_active=True).exclude(id__in=new_scenarios).prefetch_related('tags')
+            }
+            placed.update(new_scenarios)
+
+            user_ids = sorted(users)
+            for start in range(0, len(user_ids), self.BATCH_SIZE):
+                batch = {user_id: users[user_id] for user_id in user_ids[start:start + self.BATCH_SIZE]}
+                stats['updated'] += self._apply_batch(batch, new_scenarios, placed)
+
+            orderings.filter(Q(synced_through__lt=through) | Q(synced_through=None)).update(
+                synced_through=through
+            )
+
+        cache.set(self.SYNCED_VERSION_KEY, version, None)
+        return stats
+
+    def _matching_users(self, scenarios) -> Dict[int, dict]:
+        """Users with a stored ordering whose goals / interests name any tag -> {user_id: canonical profile}"""
+        wanted = {
+            key for scenario in scenarios for key in map(scenario_tag_key, scenario.tags.all())
+            if key and key[0] in MATCHED_KINDS
+        }
+        if not wanted:
+            return {}
+
+        user_ids = tag_index.users(*wanted)
+        profiles = {}
+        for start in range(0, len(user_ids), self.BATCH_SIZE):
+            rows = LearningProfile.objects.filter(
+                user_id__in=user_ids[start:start + self.BATCH_SIZE],
+                user__ordered_scenarios__isnull=False,
+            ).values_list('user_id', 'cefr_level', 'goals', 'interests')
+            for user_id, cefr_level, goals, interests in rows:
+                profiles[user_id] = canonical_profile({'cefr_level': cefr_level, 'goals': goals, 'interests': interests})
+        return profiles
+
+    @transaction.atomic
+    def _apply_batch(self, profiles: Dict[int, dict], new_scenarios: dict, scenarios: dict) -> int:
+        from ..models import UserOrderedScenarios
+
+        changed, now = [], timezone.now()
+        for ordering in UserOrderedScenarios.objects.select_for_update().filter(user_id__in=profiles):
+            if not ordering.scenario_order:
+                continue  # regenerated on the next request anyway
+
+            canonical = profiles[ordering.user_id]
+            present = set(ordering.scenario_order)
+            missing = [
+                s for s in new_scenarios.values()
+                if s.id not in present
+                and (ordering.synced_through is None or s.updated_at > ordering.synced_through)
+            ]
+            missing = self.level_filter.process(missing, canonical)
+            if not missing:
+                continue
+
+            order = list(ordering.scenario_order)
+            for scenario in missing:
+                self._insert(order, scenario, canonical, scenarios)
+            ordering.scenario_order = order
+            ordering.updated_at = now  # bulk_update skips auto_now; ETags read it
+            changed.append(ordering)
+
+        UserOrderedScenarios.objects.bulk_update(changed, ['scenario_order', 'updated_at'])
+
+        from apps.progress.services.dashboard import invalidate_dashboards
+        user_ids = [ordering.user_id for ordering in changed]
+        transaction.on_commit(lambda: invalidate_dashboards(user_ids))
+        return len(changed)
+
+    @staticmethod
+    def _insert(order: List[int], scenario, canonical: dict, scenarios: dict):
+        """Insert before the first scenario that scores lower (after equals)"""
+        score = local_score(scenario, canonical)
+        for position, scenario_id in enumerate(order):
+            other = scenarios.get(scenario_id)
+            if other is not None and local_score(other, canonical) < score:
+                order.insert(position, scenario.id)
+                return
+        order.append(scenario.id)
@@ -6,12 +6,20 @@ Main orchestrator that combines all recommendation components.
 """
 
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from django.db import transaction
+from django.utils import timezone
 from apps.memory_palace.models import Scenario
 from apps.users.models import LearningProfile
 
 from .level_filter import LevelFilter
+from .goal_ranker import GoalRanker
+from .interest_matcher import InterestMatcher
 from .ai_ranker import AIRanker
+from .log_writer import recommendation_log
+from .profile_changes import ProfileChange, canonical_profile, classify_change, profile_hash, rescore
+from .timing import PipelineTimer, timed
+from .warmup import recommendation_warmer
 
 
 @dataclass
@@ -21,6 +29,8 @@ class RecommendationResult:
     total_count: int
     user_level: str
     applied_filters: List[str]
+    processing_time_ms: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)  # stage -> ms (stages may nest)
 
 
 class RecommendationEngine:
@@ -29,7 +39,13 @@ class RecommendationEngine:
     
     Orchestrates the recommendation pipeline:
     1. Level Filter - Filter by CEFR level
-    2. AI Ranker - Intelligent ranking using OpenAI
+    2. AI Ranker - Local shortlist, re-ranked by OpenAI
+    
+    The ordering is stored per user and kept in step with profile edits
+    by profile_changes.py: a full re-rank, a local re-score or nothing.
+    
+    While a background warmup (see warmup.py) is computing the ordering,
+    requests get a local ranking (goals, then interests) that is not cached.
     
     Usage:
         engine = RecommendationEngine()
@@ -42,6 +58,7 @@ class RecommendationEngine:
     def __init__(self, use_ai: bool = True, ai_model: str = "gpt-4o-mini"):
         self.use_ai = use_ai
         self.level_filter = LevelFilter()
+        self.local_rankers = [GoalRanker(), InterestMatcher()]
         
         if use_ai:
             self.ai_ranker = AIRanker(model=ai_model)
@@ -58,50 +75,80 @@ class RecommendationEngine:
         """
         Get personalized scenario recommendations for a user.
         Uses cached results when available to avoid repeated OpenAI calls.
+        
+        Every stage (DB loads, each recommender, the OpenAI call) is timed;
+        the timings come back on the result and go to the metric sinks.
+        """
+        with PipelineTimer().activate() as timer:
+            result, profile = self._recommend(user, limit, include_completed, discovery_slots)
+        
+        result.timings = timer.timings
+        result.processing_time_ms = timer.elapsed_ms
+        
+        # Sampled, written in the background
+        recommendation_log.submit(user, result, profile, result.processing_time_ms)
+        
+        return result
+    
+    def warm(self, user) -> bool:
+        """
+        Bring the user's stored ordering in line with their profile
+        without building a response. Returns whether it changed.
         """
+        from apps.recommendations.models import UserOrderedScenarios
+        
+        profile = self._get_user_profile(user)
+        canonical = canonical_profile(profile)
+        
+        cache, created = UserOrderedScenarios.objects.get_or_create(user=user)
+        change = self._change_for(cache, canonical)
+        self._refresh_ordering(user, cache, profile, canonical, change)
+        return change != ProfileChange.NONE
+    
+    def _recommend(self, user, limit, include_completed, discovery_slots):
+        """Pipeline body of recommend(). Returns (result, profile)."""
         import random
-        import hashlib
-        import json
         from datetime import date
         from apps.progress.models import UserMilestoneProgress
         from apps.recommendations.models import UserOrderedScenarios
         
-        profile = self._get_user_profile(user)
-        applied_filters = ['cached']
-        
-        # Calculate profile hash to detect changes
-        profile_hash = hashlib.md5(
-            json.dumps(profile, sort_keys=True).encode()
-        ).hexdigest()
+        with timed('db:profile'):
+            profile = self._get_user_profile(user)
+        canonical = canonical_profile(profile)
         
         # Try to get cached recommendations
-        cache, created = UserOrderedScenarios.objects.get_or_create(user=user)
+        with timed('db:ordered_scenarios'):
+            cache, created = UserOrderedScenarios.objects.get_or_create(user=user)
         
-        # Check if we need to regenerate (no cache or profile changed)
-        if not cache.scenario_order or cache.profile_hash != profile_hash:
-            # Generate fresh recommendations (calls OpenAI)
-            fresh_result = self._generate_fresh_recommendations(user, profile)
-            
-            # Save to cache
-            cache.scenario_order = [s.id for s in fresh_result.scenarios]
-            cache.user_level = fresh_result.user_level
-            cache.profile_hash = profile_hash
-            cache.save()
-            
-            applied_filters = fresh_result.applied_filters + ['newly_cached']
-            ordered_ids = cache.scenario_order
+        # How much of the cached order the profile change invalidates
+        change = self._change_for(cache, canonical)
+        
+        if change == ProfileChange.RERANK and recommendation_warmer.is_warming(user.id):
+            # The warmup is ranking with AI right now: answer locally, don't cache
+            local_result = self._generate_local_recommendations(profile)
+            ordered_ids = [s.id for s in local_result.scenarios]
+            applied_filters = local_result.applied_filters + ['warming']
         else:
-            ordered_ids = cache.scenario_order
+            ordered_ids, applied_filters = self._refresh_ordering(user, cache, profile, canonical, change)
         
         # Load scenarios in cached order
-        all_scenarios = {s.id: s for s in Scenario.objects.filter(is_active=True)}
+        with timed('db:scenarios'):
+            all_scenarios = {s.id: s for s in Scenario.objects.filter(is_active=True)}
         scenarios = [all_scenarios[sid] for sid in ordered_ids if sid in all_scenarios]
         
+        # Scenarios added after the order was built go last until
+        # ScenarioOrderingSync places them
+        ordered_set = set(ordered_ids)
+        unplaced = [s for sid, s in all_scenarios.items() if sid not in ordered_set]
+        if unplaced:
+            scenarios += self.level_filter.process(unplaced, profile)
+        
         # Get scenarios where user has progress
-        scenarios_with_progress = set(
-            UserMilestoneProgress.objects.filter(user=user)
-            .values_list('milestone__scenario_id', flat=True)
-        )
+        with timed('db:progress'):
+            scenarios_with_progress = set(
+                UserMilestoneProgress.objects.filter(user=user)
+                .values_list('milestone__scenario_id', flat=True)
+            )
         
         total_count = len(scenarios)
         
@@ -147,12 +194,75 @@ class RecommendationEngine:
         else:
             final_scenarios = scenarios[:limit]
         
-        return RecommendationResult(
+        result = RecommendationResult(
             scenarios=final_scenarios,
             total_count=total_count,
             user_level=profile.get('cefr_level', 'A1'),
             applied_filters=applied_filters
         )
+        return result, profile
+    
+    @staticmethod
+    def _change_for(cache, canonical: Dict[str, Any]) -> ProfileChange:
+        if not cache.scenario_order:
+            return ProfileChange.RERANK
+        if cache.profile_hash == profile_hash(canonical):
+            return ProfileChange.NONE
+        return classify_change(cache.profile_snapshot, canonical)
+    
+    def _refresh_ordering(self, user, cache, profile, canonical, change: ProfileChange):
+        """
+        Apply a classified profile change to the stored ordering:
+        RERANK runs the full pipeline (OpenAI), RESCORE shifts the
+        cached order by the weight changes (see rescore), NONE keeps it.
+        Saves only what changed; a new order also drops the user's
+        dashboard snapshot once committed.
+        
+        Returns:
+            (ordered scenario ids, applied filters)
+        """
+        user_level = cache.user_level
+        synced_through = cache.synced_through
+        
+        if change == ProfileChange.RERANK:
+            synced_through = timezone.now()  # every active scenario is a candidate
+            fresh_result = self._generate_fresh_recommendations(user, profile)
+            ordered_ids = [s.id for s in fresh_result.scenarios]
+            user_level = fresh_result.user_level
+            applied_filters = fresh_result.applied_filters + ['newly_cached']
+        elif change == ProfileChange.RESCORE:
+            with timed('db:rescore'):
+                by_id = {
+                    s.id: s for s in
+                    Scenario.objects.filter(id__in=cache.scenario_order).prefetch_related('tags')
+                }
+            ranked = rescore(
+                [by_id[sid] for sid in cache.scenario_order if sid in by_id],
+                cache.profile_snapshot, canonical,
+            )
+            ordered_ids = [s.id for s in ranked] + [sid for sid in cache.scenario_order if sid not in by_id]
+            applied_filters = ['cached', 'rescored']
+        else:
+            ordered_ids = cache.scenario_order
+            applied_filters = ['cached']
+        
+        new_hash = profile_hash(canonical)
+        if ordered_ids != cache.scenario_order:
+            # The dashboard snapshot embeds the top of this order
+            from apps.progress.services.dashboard import invalidate_dashboards
+            transaction.on_commit(lambda: invalidate_dashboards([user.id]))
+        if ordered_ids != cache.scenario_order or new_hash != cache.profile_hash:
+            cache.scenario_order = ordered_ids
+            cache.user_level = user_level
+            cache.synced_through = synced_through
+            cache.profile_hash = new_hash
+            if change != ProfileChange.NONE:
+                # Keep the inputs the order was built from, so small tweaks add up
+                cache.profile_snapshot = canonical
+            with timed('db:ordered_scenarios_save'):
+                cache.save()
+        
+        return ordered_ids, applied_filters
     
     def _get_user_profile(self, user) -> Dict[str, Any]:
         """Extract user profile data for recommendation."""
@@ -185,18 +295,41 @@ class RecommendationEngine:
             profile = self._get_user_profile(user)
         
         # Get all active scenarios
-        scenarios = list(Scenario.objects.filter(is_active=True).prefetch_related('tags'))
+        with timed('db:candidates'):
+            scenarios = list(Scenario.objects.filter(is_active=True).prefetch_related('tags'))
         
         applied_filters = []
         
         # Step 1: Filter by level
-        scenarios = self.level_filter.process(scenarios, profile)
+        scenarios = self.level_filter.run(scenarios, profile)
         applied_filters.append(self.level_filter.name)
         
         # Step 2: AI Ranking (if enabled)
         if self.use_ai and self.ai_ranker:
-            scenarios = self.ai_ranker.process(scenarios, profile)
+            scenarios = self.ai_ranker.run(scenarios, profile)
             applied_filters.append(self.ai_ranker.name)
+            if self.ai_ranker.fell_back:
+                applied_filters.append(f"{self.ai_ranker.name}:fallback")
+        
+        return RecommendationResult(
+            scenarios=scenarios,
+            total_count=len(scenarios),
+            user_level=profile.get('cefr_level', 'A1'),
+            applied_filters=applied_filters
+        )
+    
+    def _generate_local_recommendations(self, profile: Dict) -> RecommendationResult:
+        """
+        Level filter plus the goal and interest rankers: no AI, one query
+        (the rankers read the prefetched tags).
+        """
+        with timed('db:candidates'):
+            scenarios = list(Scenario.objects.filter(is_active=True).prefetch_related('tags'))
+        
+        applied_filters = []
+        for recommender in [self.level_filter] + self.local_rankers:
+            scenarios = recommender.run(scenarios, profile)
+            applied_filters.append(recommender.name)
         
         return RecommendationResult(
             scenarios=scenarios,
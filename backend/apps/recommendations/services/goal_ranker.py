@@ -57,7 +57,7 @@ class GoalRanker(BaseRecommender):
         Returns score from 0.0 to 1.0
         """
         scenario_tags = set(
-            tag.value for tag in scenario.tags.filter(type='goal')
+            tag.value for tag in scenario.tags.all() if tag.type == 'goal'
         )
         
         if not scenario_tags:
@@ -60,7 +60,7 @@ class InterestMatcher(BaseRecommender):
         Returns number of matching interests (0.0 to 1.0 normalized)
         """
         scenario_domains = set(
-            tag.value for tag in scenario.tags.filter(type__in=['domain', 'interest'])
+            tag.value for tag in scenario.tags.all() if tag.type in ('domain', 'interest')
         )
         
         if not scenario_domains:
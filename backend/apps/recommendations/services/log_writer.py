@@ -0,0 +1,180 @@
+"""
+Recommendation Log Writer
+Samples recommendation calls into RecommendationLog off the request thread
+"""
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# Markers in RecommendationResult.applied_filters
+CACHE_HIT = 'cached'
+CACHE_MISS = 'newly_cached'
+AI_FALLBACK_SUFFIX = ':fallback'
+DISCOVERY_PREFIX = 'discovery_slots:'
+
+
+def pipeline_of(applied_filters: List[str]) -> str:
+    """Stable pipeline key: the stages that ran, without per-call markers"""
+    stages = [
+        f for f in applied_filters
+        if f != CACHE_MISS
+        and not f.startswith(DISCOVERY_PREFIX)
+        and not f.endswith(AI_FALLBACK_SUFFIX)
+    ]
+    return '>'.join(stages)[:100]
+
+
+class RecommendationLogWriter:
+    """
+    Non-blocking, sampled, bounded writer for RecommendationLog.
+
+    submit() keeps 1 in 1/sample_rate calls and puts the row on a bounded
+    queue without waiting; when the queue is full the row is dropped and
+    counted. A daemon thread bulk-inserts up to batch_size rows at a time,
+    every flush_interval seconds or as soon as a batch is ready. Logging
+    is best effort: a failed insert is logged and the batch discarded.
+
+    Usage:
+        recommendation_log.submit(user, result, profile, elapsed_ms)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = None,
+        max_queue: int = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+        enabled: bool = None,
+    ):
+        config = getattr(settings, 'RECOMMENDATION_LOG', {})
+
+        self.sample_rate = config.get('sample_rate', 1.0) if sample_rate is None else sample_rate
+        self.max_queue = max_queue or config.get('max_queue', 10000)
+        self.batch_size = batch_size or config.get('batch_size', 200)
+        self.flush_interval = flush_interval or config.get('flush_interval_seconds', 2.0)
+        self.enabled = config.get('enabled', True) if enabled is None else enabled
+
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._stopped = False
+
+    def submit(self, user, result, profile: dict, elapsed_ms: int) -> bool:
+        """Queue a log row for a recommendation call. Returns whether it was kept."""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+
+        from ..models import RecommendationLog
+
+        filters = list(result.applied_filters)
+        row = RecommendationLog(
+            user_id=getattr(user, 'id', user),
+            scenario_ids=[s.id for s in result.scenarios],
+            total_available=result.total_count,
+            user_level=result.user_level,
+            user_goals=profile.get('goals') or {},
+            user_interests=profile.get('interests') or {},
+            filters_applied=filters,
+            pipeline=pipeline_of(filters),
+            cache_hit=CACHE_HIT in filters,
+            ai_fallback=any(f.endswith(AI_FALLBACK_SUFFIX) for f in filters),
+            processing_time_ms=elapsed_ms,
+        )
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Write everything queued so far. Returns rows written."""
+        from ..models import RecommendationLog
+
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    break
+                try:
+                    RecommendationLog.objects.bulk_create(batch)
+                    written += len(batch)
+                except Exception:
+                    logger.exception("Dropping %d recommendation log rows", len(batch))
+        return written
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def shutdown(self):
+        self._stopped = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval * 5)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final recommendation log flush failed")
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _drain(self, limit: int) -> list:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            # Forked child: the parent's queue and thread are not ours
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name='recommendation-log-writer', daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Recommendation log flush failed")
+            finally:
+                close_old_connections()
+
+
+recommendation_log = RecommendationLogWriter()
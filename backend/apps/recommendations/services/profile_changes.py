@@ -0,0 +1,122 @@
+"""
+Profile Change Classifier
+Decides how much of a cached scenario ordering a profile edit invalidates
+"""
+import hashlib
+import json
+from enum import IntEnum
+from typing import Any, Dict, List
+
+from apps.memory_palace.models import Scenario
+
+
+class ProfileChange(IntEnum):
+    """Ordered by cost: the strongest change across fields wins"""
+    NONE = 0      # keep the cached order
+    RESCORE = 1   # shift the cached order locally by the weight changes
+    RERANK = 2    # new candidates or new inputs for the AI: full pipeline
+
+
+WEIGHTED_FIELDS = ('goals', 'interests')
+TEXT_FIELDS = ('cefr_level', 'work_domain', 'profession')
+
+# A weight has to move at least this much to re-sort anything
+WEIGHT_TOLERANCE = 0.05
+
+# Places a scenario moves in a cached order per 1.0 of local score gained or lost
+RESCORE_POSITIONS_PER_WEIGHT = 10
+
+
+def canonical_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The profile as the ranking sees it: trimmed lower-case text, weights
+    rounded to 2 decimals without zero entries, hobbies as a sorted set.
+    Equal ranking inputs give equal canonical profiles.
+    """
+    canonical = {}
+    for field in TEXT_FIELDS:
+        canonical[field] = str(profile.get(field) or '').strip().lower()
+    canonical['cefr_level'] = canonical['cefr_level'].upper() or 'A1'
+
+    for field in WEIGHTED_FIELDS:
+        value = profile.get(field) or {}
+        if not isinstance(value, dict):  # legacy list of keys
+            value = {key: 1.0 for key in value}
+        canonical[field] = {
+            str(key).strip().lower(): round(float(weight), 2)
+            for key, weight in value.items()
+            if weight
+        }
+
+    canonical['hobbies'] = sorted({
+        str(hobby).strip().lower() for hobby in profile.get('hobbies') or [] if str(hobby).strip()
+    })
+    return canonical
+
+
+def profile_hash(canonical: Dict[str, Any]) -> str:
+    return hashlib.md5(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+def classify_change(old: Dict[str, Any], new: Dict[str, Any]) -> ProfileChange:
+    """
+    Compare two canonical profiles field by field:
+      - level, work domain, profession, hobbies: RERANK (they change the
+        candidate set or what the AI ranks on)
+      - goals / interests: RERANK if the keys change, RESCORE if only a
+        weight moved by WEIGHT_TOLERANCE or more, NONE otherwise
+    An empty `old` (no snapshot stored yet) is a RERANK.
+    """
+    if not old:
+        return ProfileChange.RERANK
+
+    change = ProfileChange.NONE
+    for field in TEXT_FIELDS + ('hobbies',):
+        if old.get(field) != new.get(field):
+            return ProfileChange.RERANK
+
+    for field in WEIGHTED_FIELDS:
+        before, after = old.get(field) or {}, new.get(field) or {}
+        if before.keys() != after.keys():
+            return ProfileChange.RERANK
+        if any(abs(before[key] - after[key]) >= WEIGHT_TOLERANCE for key in after):
+            change = ProfileChange.RESCORE
+
+    return change
+
+
+def local_score(scenario: Scenario, canonical: Dict[str, Any]) -> float:
+    """Goal + interest weight of a scenario's tags (reads prefetched tags)"""
+    goals, interests = canonical['goals'], canonical['interests']
+
+    total = 0.0
+    for tag in scenario.tags.all():
+        if tag.type == 'goal':
+            total += goals.get(tag.value.lower(), 0.0)
+        elif tag.type in ('domain', 'interest'):
+            total += interests.get(tag.value.lower(), 0.0)
+    return total
+
+
+def sort_by_local_score(scenarios: List[Scenario], canonical: Dict[str, Any]) -> List[Scenario]:
+    """Stable sort by local_score, highest first. Ties keep the input order."""
+    return sorted(scenarios, key=lambda scenario: local_score(scenario, canonical), reverse=True)
+
+
+def rescore(scenarios: List[Scenario], old: Dict[str, Any], new: Dict[str, Any]) -> List[Scenario]:
+    """
+    Adjust a cached (AI) order to a weight change without discarding it.
+    Each scenario keeps its cached position, shifted by how much its
+    local score moved between the profile the order was built from
+    (`old`) and `new`:
+
+        rank_score = -position + RESCORE_POSITIONS_PER_WEIGHT * delta_local_score
+
+    Scenarios whose score did not move keep their relative order.
+    """
+    def rank_score(item):
+        position, scenario = item
+        delta = local_score(scenario, new) - local_score(scenario, old)
+        return -position + RESCORE_POSITIONS_PER_WEIGHT * delta
+
+    return [scenario for _, scenario in sorted(enumerate(scenarios), key=rank_score, reverse=True)]
@@ -0,0 +1,128 @@
+"""
+Pipeline Timing
+Per-stage timers for the ARIA pipeline, with pluggable metric sinks
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Timer of the recommendation call running in this context
+_current: ContextVar[Optional['PipelineTimer']] = ContextVar('recommendation_timer', default=None)
+
+
+class StageMetrics:
+    """
+    In-process aggregate per stage (count, total, max), usable as a sink.
+    Read it from a shell or a health endpoint; other sinks can forward
+    the same observations to statsd / Prometheus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, dict] = {}
+
+    def __call__(self, stage: str, elapsed_ms: float):
+        with self._lock:
+            stats = self._stages.setdefault(stage, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                stage: {
+                    'count': s['count'],
+                    'avg_ms': round(s['total_ms'] / s['count'], 2),
+                    'max_ms': round(s['max_ms'], 2),
+                }
+                for stage, s in self._stages.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+
+
+stage_metrics = StageMetrics()
+
+
+def log_stage(stage: str, elapsed_ms: float):
+    """Sink writing each stage timing to the debug log"""
+    logger.debug("recommendation stage %s took %.1fms", stage, elapsed_ms)
+
+
+@lru_cache(maxsize=1)
+def get_sinks() -> List[Callable[[str, float], None]]:
+    """Sinks from settings.RECOMMENDATION_TIMING['sinks'] (dotted paths)"""
+    paths = getattr(settings, 'RECOMMENDATION_TIMING', {}).get('sinks', [])
+    return [import_string(path) for path in paths]
+
+
+class PipelineTimer:
+    """
+    Collects stage timings (milliseconds) for one recommendation call.
+
+    Stages with the same name add up (e.g. several DB loads). Each stage
+    is also reported to the configured sinks; a failing sink is logged
+    and never breaks the call.
+
+    Usage:
+        with PipelineTimer().activate() as timer:
+            with timer.stage('db:scenarios'):
+                ...
+            with timed('ai:openai'):  # from code that has no timer handle
+                ...
+        timer.timings, timer.elapsed_ms
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter() - self._started) * 1000)
+
+    @contextmanager
+    def activate(self):
+        """Make this the timer timed() reports to"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed_ms, 2)
+            for sink in get_sinks():
+                try:
+                    sink(name, elapsed_ms)
+                except Exception:
+                    logger.exception("Timing sink failed for stage %s", name)
+
+
+@contextmanager
+def timed(name: str):
+    """Time a block as a stage of the active PipelineTimer (no-op without one)"""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
@@ -0,0 +1,106 @@
+"""
+Recommendation Warmup
+Computes a new user's scenario ordering in the background after onboarding
+"""
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationWarmer:
+    """
+    Runs RecommendationEngine.warm() on a small thread pool so the first
+    /recommendations/scenarios/ call after onboarding doesn't wait for
+    the AI ranking.
+
+    While a warmup is in flight a cache flag is set; the engine checks
+    it and serves a local (no AI, not cached) ordering instead of
+    starting a second ranking. The flag expires after in_flight_seconds
+    in case a worker dies. The cache is shared (settings.CACHES), so
+    every worker sees the flag.
+
+    Usage:
+        transaction.on_commit(lambda: recommendation_warmer.schedule(user.id))
+        recommendation_warmer.is_warming(user.id)
+    """
+
+    CACHE_PREFIX = 'recommendations:warming'
+
+    def __init__(self, max_workers: int = None, in_flight_seconds: int = None, enabled: bool = None):
+        config = getattr(settings, 'RECOMMENDATION_WARMUP', {})
+
+        self.max_workers = max_workers or config.get('max_workers', 2)
+        self.in_flight_seconds = in_flight_seconds or config.get('in_flight_seconds', 120)
+        self.enabled = config.get('enabled', True) if enabled is None else enabled
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = None
+
+    def schedule(self, user_id: int) -> bool:
+        """Queue a warmup. Returns False if disabled or one is already in flight."""
+        if not self.enabled or not cache.add(self._key(user_id), True, self.in_flight_seconds):
+            return False
+
+        try:
+            self._pool().submit(self._warm, user_id)
+        except RuntimeError:  # pool shut down (interpreter exiting)
+            cache.delete(self._key(user_id))
+            return False
+        return True
+
+    def is_warming(self, user_id: int) -> bool:
+        return bool(cache.get(self._key(user_id)))
+
+    def shutdown(self, wait: bool = False):
+        """Stop the pool; wait=True finishes queued warmups first (management commands)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _warm(self, user_id: int):
+        from django.contrib.auth import get_user_model
+        from .engine import RecommendationEngine
+
+        try:
+            user = get_user_model().objects.get(pk=user_id)
+            RecommendationEngine().warm(user)
+        except Exception:
+            logger.exception("Recommendation warmup failed for user %s", user_id)
+        finally:
+            cache.delete(self._key(user_id))
+            connection.close()  # pool threads are reused: don't keep one connection each
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Forked child: the parent's worker threads are not ours
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='recommendation-warmup'
+                )
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.CACHE_PREFIX}:{user_id}"
+
+
+recommendation_warmer = RecommendationWarmer()
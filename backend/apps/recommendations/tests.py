@@ -0,0 +1,164 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.ai_services.prompts.scenario_ranking import format_scenario_ranking_prompt
+from apps.memory_palace.models import Scenario, Tag
+from apps.progress.services.dashboard import CACHE_PREFIX
+from apps.users.models import LearningProfile
+
+from .models import UserOrderedScenarios
+from .services import AIRanker, RecommendationEngine
+from .services.profile_changes import canonical_profile, rescore
+
+User = get_user_model()
+
+PROFILE = {
+    'cefr_level': 'A1',
+    'goals': {},
+    'interests': {'food': 1.0},
+    'work_domain': '',
+    'profession': '',
+    'hobbies': [],
+}
+
+
+class FakeClient:
+    """Ranks the prompt's scenarios in reverse, minus the first `drop`, plus an unknown id"""
+
+    def __init__(self, drop=0):
+        self.drop = drop
+        self.calls = []
+
+    def complete_json(self, prompt, system_prompt=None, temperature=0.3, max_tokens=1000):
+        ids = [int(line.split()[2].rstrip(':')) for line in prompt.splitlines() if line.startswith('- ID ')]
+        self.calls.append({'ids': ids, 'max_tokens': max_tokens})
+        return {'ranked_ids': list(reversed(ids))[self.drop:] + [999999]}
+
+
+class BrokenClient:
+
+    def complete_json(self, **kwargs):
+        raise RuntimeError('AI down')
+
+
+class AIRankerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        food = Tag.objects.create(type='domain', value='food')
+        travel = Tag.objects.create(type='domain', value='travel')
+        cls.scenarios = []
+        for i in range(12):
+            scenario = Scenario.objects.create(name=f'Scenario {i}', slug=f'scenario-{i}')
+            scenario.tags.add(food if i % 2 else travel)
+            cls.scenarios.append(scenario)
+
+        # Local order: food scenarios first, ties in input order
+        cls.local_ids = [s.id for i, s in enumerate(cls.scenarios) if i % 2]
+        cls.local_ids += [s.id for i, s in enumerate(cls.scenarios) if not i % 2]
+
+    def rank(self, client, **kwargs):
+        ranker = AIRanker(**kwargs)
+        ranker._client = client
+        ranked = ranker.process(list(Scenario.objects.prefetch_related('tags').order_by('id')), PROFILE)
+        return ranker, [s.id for s in ranked]
+
+    def test_only_the_shortlist_goes_to_the_ai(self):
+        client = FakeClient()
+
+        _, ranked = self.rank(client, shortlist_size=5)
+
+        shortlist = self.local_ids[:5]
+        self.assertEqual(client.calls[0]['ids'], shortlist)
+        self.assertEqual(client.calls[0]['max_tokens'], 5 * AIRanker.TOKENS_PER_ID + AIRanker.REASONING_TOKENS)
+        # AI order for the shortlist, then the remainder in local order
+        self.assertEqual(ranked, list(reversed(shortlist)) + self.local_ids[5:])
+
+    def test_prompt_budget_trims_the_shortlist(self):
+        client = FakeClient()
+        ranker = AIRanker()
+        base = ranker._tokens(format_scenario_ranking_prompt(PROFILE, []))
+
+        _, ranked = self.rank(client, shortlist_size=10, max_prompt_tokens=base + 25)
+
+        sent = client.calls[0]['ids']
+        self.assertTrue(0 < len(sent) < 10)
+        self.assertEqual(sent, self.local_ids[:len(sent)])
+        self.assertEqual(sorted(ranked), sorted(self.local_ids))
+
+    def test_scenarios_the_ai_leaves_out_keep_local_order(self):
+        _, ranked = self.rank(FakeClient(drop=2), shortlist_size=5)
+
+        shortlist = self.local_ids[:5]
+        self.assertEqual(ranked, list(reversed(shortlist))[2:] + shortlist[-2:] + self.local_ids[5:])
+
+    def test_ai_error_falls_back_to_local_order(self):
+        ranker, ranked = self.rank(BrokenClient(), shortlist_size=5)
+
+        self.assertTrue(ranker.fell_back)
+        self.assertEqual(ranked, self.local_ids)
+
+
+class RescoreTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        food = Tag.objects.create(type='domain', value='food')
+        cls.scenarios = [Scenario.objects.create(name=f'Scenario {i}', slug=f'scenario-{i}') for i in range(12)]
+        cls.scenarios[-1].tags.add(food)
+
+    def rescore(self, before, after):
+        scenarios = list(Scenario.objects.prefetch_related('tags').order_by('id'))
+        ranked = rescore(scenarios, canonical_profile({'interests': before}), canonical_profile({'interests': after}))
+        return [s.id for s in ranked]
+
+    def test_small_weight_change_moves_a_scenario_a_few_places(self):
+        ranked = self.rescore({'food': 0.5}, {'food': 0.85})
+
+        ids = [s.id for s in self.scenarios]
+        self.assertEqual(ranked, ids[:8] + ids[-1:] + ids[8:-1])  # 0.35 * 10 places up
+
+    def test_large_weight_change_reaches_the_top(self):
+        ranked = self.rescore({'food': 0.1}, {'food': 1.5})
+
+        self.assertEqual(ranked[0], self.scenarios[-1].id)
+
+    def test_unaffected_scenarios_keep_the_cached_order(self):
+        ranked = self.rescore({'food': 0.8}, {'food': 0.1})
+
+        self.assertEqual(ranked, [s.id for s in self.scenarios])  # already last
+
+
+class OrderingDashboardTests(TestCase):
+
+    def setUp(self):
+        food = Tag.objects.create(type='domain', value='food')
+        first = Scenario.objects.create(name='Museum', slug='museum')
+        second = Scenario.objects.create(name='Restaurant', slug='restaurant')
+        second.tags.add(food)
+
+        self.user = User.objects.create_user(username='ana', password='x')
+        self.profile = LearningProfile.objects.create(user=self.user, interests={'food': 0.5})
+        UserOrderedScenarios.objects.create(
+            user=self.user,
+            scenario_order=[first.id, second.id],
+            profile_snapshot=canonical_profile({'interests': {'food': 0.5}}),
+        )
+        self.key = f'{CACHE_PREFIX}:{self.user.id}'
+        cache.set(self.key, {'etag': 'x', 'data': {}})
+
+    def test_new_order_drops_the_dashboard_snapshot(self):
+        self.profile.interests = {'food': 1.0}
+        self.profile.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(RecommendationEngine().warm(self.user))
+
+        self.assertIsNone(cache.get(self.key))
+
+    def test_unchanged_order_keeps_the_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            RecommendationEngine().warm(self.user)
+
+        self.assertIsNotNone(cache.get(self.key))
@@ -6,11 +6,37 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.utils import timezone
 
-from .services import RecommendationEngine
+from apps.core.http_cache import catalogue, conditional_get
+from apps.progress.services import progress_version
+from .models import UserOrderedScenarios
+from .services import RecommendationEngine, recommendation_warmer
 from .serializers import RecommendationResultSerializer
 
 
+def profile_version(request, **kwargs) -> str:
+    """Validator: the learning profile's last save plus the day (discovery picks rotate daily)"""
+    from apps.users.models import LearningProfile
+
+    updated = LearningProfile.objects.filter(user=request.user).values_list('updated_at', flat=True).first()
+    return f"{updated.isoformat() if updated else ''}:{timezone.localdate().isoformat()}"
+
+
+def ordering_version(request, **kwargs) -> str:
+    """
+    Validator: the stored scenario ordering's last write, and whether a
+    warmup is ranking it right now (the response is then a local
+    fallback that the warmed ordering replaces)
+    """
+    updated = (
+        UserOrderedScenarios.objects.filter(user=request.user)
+        .values_list('updated_at', flat=True).first()
+    )
+    warming = recommendation_warmer.is_warming(request.user.id)
+    return f"{updated.isoformat() if updated else ''}:{int(warming)}"
+
+
 class RecommendedScenariosView(APIView):
     """
     Get personalized scenario recommendations.
@@ -18,6 +44,7 @@ class RecommendedScenariosView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    @conditional_get(catalogue, progress_version, profile_version, ordering_version, private=True)
     def get(self, request):
         limit = int(request.query_params.get('limit', 10))
         include_completed = request.query_params.get('include_completed', 'false').lower() == 'true'
@@ -40,6 +67,7 @@ class SimilarScenariosView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    @conditional_get(catalogue, private=True)
     def get(self, request, scenario_id):
         from apps.memory_palace.models import Scenario
         
@@ -0,0 +1,18 @@
+"""
+Rebuild the weekly and monthly activity rollups from DailyActivity.
+Run with: python manage.py backfill_activity_rollups
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.services import ActivityRollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute WeeklyActivity and MonthlyActivity from DailyActivity'
+
+    def handle(self, *args, **options):
+        written = ActivityRollups().backfill()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written['week']} weekly and {written['month']} monthly rollups"
+        ))
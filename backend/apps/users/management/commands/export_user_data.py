@@ -0,0 +1,32 @@
+"""
+Export everything stored about one user to a file, in constant memory.
+Run with: python manage.py export_user_data <username> --output export.ndjson [--format csv]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.services import UserDataExporter
+
+
+class Command(BaseCommand):
+    help = "Write a user's data as NDJSON or a zip of CSV files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--output', required=True, help='File to write')
+        parser.add_argument('--format', dest='fmt', choices=UserDataExporter.FORMATS,
+                            default=UserDataExporter.NDJSON)
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User not found: {options['username']}")
+
+        exporter = UserDataExporter(chunk_size=options['chunk_size'])
+        with open(options['output'], 'wb') as output:
+            written = exporter.write(user, output, options['fmt'])
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
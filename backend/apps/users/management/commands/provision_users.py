@@ -0,0 +1,57 @@
+"""
+Create a cohort of accounts from a CSV or JSON file.
+Run with: python manage.py provision_users cohort.csv --defaults '{"cefr_level": "A2"}'
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.services import UserProvisioner
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create users, learning profiles and onboarding progress (CSV header or JSON list of objects)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file, or JSON file holding a list of user objects')
+        parser.add_argument('--format', dest='fmt', choices=['csv', 'json'], default=None,
+                            help='Input format (default: from the file extension)')
+        parser.add_argument('--defaults', default='{}', help='JSON object of profile defaults for every row')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes')
+        parser.add_argument('--complete-onboarding', action='store_true',
+                            help='Mark onboarding as done (profiles are used as given)')
+        parser.add_argument('--no-warmup', action='store_true',
+                            help='Skip precomputing recommendations for the new users')
+
+    def handle(self, *args, **options):
+        fmt = options['fmt'] or ('json' if options['path'].endswith('.json') else 'csv')
+        try:
+            defaults = json.loads(options['defaults'])
+            with open(options['path'], encoding='utf-8-sig') as source:
+                rows = json.load(source) if fmt == 'json' else UserProvisioner.parse_csv(source)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read input: {e}")
+
+        started = time.monotonic()
+        result = UserProvisioner(workers=options['workers']).provision(
+            rows,
+            defaults=defaults,
+            complete_onboarding=options['complete_onboarding'],
+            warm=not options['no_warmup'],
+        )
+        elapsed = time.monotonic() - started
+
+        for skipped in result['skipped']:
+            self.stdout.write(self.style.WARNING(
+                f"  row {skipped['row']} ({skipped['username'] or '-'}): {skipped['error']}"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(result['created'])} users in {elapsed:.1f}s, skipped {len(result['skipped'])}"
+        ))
+
+        if result['created'] and not options['no_warmup']:
+            from apps.recommendations.services import recommendation_warmer
+
+            self.stdout.write("Waiting for recommendation warmups...")
+            recommendation_warmer.shutdown(wait=True)
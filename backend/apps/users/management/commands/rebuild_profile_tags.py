@@ -0,0 +1,16 @@
+"""
+Rebuild ProfileTag rows from every LearningProfile's goals, interests and work domain.
+Run with: python manage.py rebuild_profile_tags
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.services import profile_tag_sync
+
+
+class Command(BaseCommand):
+    help = 'Re-sync the normalized profile tags with the learning profiles'
+
+    def handle(self, *args, **options):
+        written = profile_tag_sync.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} profile tag changes"))
@@ -0,0 +1,16 @@
+"""
+Recompute every user's streak counters from DailyActivity.
+Run with: python manage.py rebuild_streaks
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.services import StreakEngine
+
+
+class Command(BaseCommand):
+    help = 'Rebuild streak_days / longest_streak for all users in one pass'
+
+    def handle(self, *args, **options):
+        updated = StreakEngine().rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt streaks for {updated} profiles"))
@@ -0,0 +1,19 @@
+"""
+Users Middleware
+"""
+from .services.activity import activity_batch
+
+
+class ActivityBatchMiddleware:
+    """
+    Writes all DailyActivity counters of a request in one upsert.
+    The response is final by then: a failing flush is logged, never
+    turned into a 500 the client might retry.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with activity_batch(fail_silently=True):
+            return self.get_response(request)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_learningprofile_hobbies_learningprofile_profession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyactivity',
+            name='streak_frozen',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='learningprofile',
+            name='last_activity_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='learningprofile',
+            name='streak_freezes',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='learningprofile',
+            name='timezone',
+            field=models.CharField(default='UTC', max_length=64),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_dailyactivity_streak_frozen_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPGrant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.IntegerField()),
+                ('source', models.CharField(choices=[('exercise', 'Exercise'), ('milestone', 'Milestone'), ('streak_freeze', 'Streak Freeze'), ('other', 'Other')], default='other', max_length=20)),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='xp_grants', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'XP Grant',
+                'verbose_name_plural': 'XP Grants',
+                'db_table': 'xp_grants',
+                'indexes': [models.Index(fields=['user', 'created_at'], name='xp_grants_user_id_0a1ea0_idx')],
+            },
+        ),
+    ]
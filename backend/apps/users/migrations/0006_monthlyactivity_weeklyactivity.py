@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_xpgrant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minutes_studied', models.PositiveIntegerField(default=0)),
+                ('xp_earned', models.PositiveIntegerField(default=0)),
+                ('exercises_completed', models.PositiveIntegerField(default=0)),
+                ('lessons_completed', models.PositiveIntegerField(default=0)),
+                ('words_learned', models.PositiveIntegerField(default=0)),
+                ('words_reviewed', models.PositiveIntegerField(default=0)),
+                ('month_start', models.DateField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_activities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Monthly Activity',
+                'verbose_name_plural': 'Monthly Activities',
+                'db_table': 'monthly_activities',
+                'ordering': ['-month_start'],
+                'unique_together': {('user', 'month_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minutes_studied', models.PositiveIntegerField(default=0)),
+                ('xp_earned', models.PositiveIntegerField(default=0)),
+                ('exercises_completed', models.PositiveIntegerField(default=0)),
+                ('lessons_completed', models.PositiveIntegerField(default=0)),
+                ('words_learned', models.PositiveIntegerField(default=0)),
+                ('words_reviewed', models.PositiveIntegerField(default=0)),
+                ('week_start', models.DateField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_activities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Weekly Activity',
+                'verbose_name_plural': 'Weekly Activities',
+                'db_table': 'weekly_activities',
+                'ordering': ['-week_start'],
+                'unique_together': {('user', 'week_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_monthlyactivity_weeklyactivity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('goal', 'Goal'), ('interest', 'Interest'), ('work_domain', 'Work Domain')], max_length=20)),
+                ('value', models.CharField(max_length=50)),
+                ('weight', models.FloatField(default=1.0)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='profile_tags', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Profile Tag',
+                'verbose_name_plural': 'Profile Tags',
+                'db_table': 'profile_tags',
+                'indexes': [models.Index(fields=['kind', 'value'], name='profile_tag_kind_06e348_idx')],
+                'unique_together': {('user', 'kind', 'value')},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Fills ProfileTag from the goals, interests and work_domain of existing learning profiles
+
+from django.db import migrations
+
+
+# Frozen copy of apps.users.services.profile_tags.ProfileTagSync.tags_of
+WEIGHTED_FIELDS = {'goals': 'goal', 'interests': 'interest'}
+VALUE_LENGTH = 50
+
+BATCH_SIZE = 2000
+
+
+def tags_of(profile):
+    tags = {}
+    for field, kind in WEIGHTED_FIELDS.items():
+        value = getattr(profile, field) or {}
+        if not isinstance(value, dict):
+            value = {key: 1.0 for key in value}
+        for key, weight in value.items():
+            key = str(key).strip().lower()[:VALUE_LENGTH]
+            if key and weight:
+                tags[(kind, key)] = round(float(weight), 2)
+
+    work_domain = (profile.work_domain or '').strip().lower()[:VALUE_LENGTH]
+    if work_domain:
+        tags[('work_domain', work_domain)] = 1.0
+    return tags
+
+
+def copy_tags(apps, schema_editor):
+    LearningProfile = apps.get_model('users', 'LearningProfile')
+    ProfileTag = apps.get_model('users', 'ProfileTag')
+
+    batch = []
+    profiles = LearningProfile.objects.only('user_id', 'goals', 'interests', 'work_domain').order_by('id')
+    for profile in profiles.iterator(chunk_size=BATCH_SIZE):
+        batch += [
+            ProfileTag(user_id=profile.user_id, kind=kind, value=value, weight=weight)
+            for (kind, value), weight in tags_of(profile).items()
+        ]
+        if len(batch) >= BATCH_SIZE:
+            ProfileTag.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        ProfileTag.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_profiletag'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_tags, migrations.RunPython.noop),
+    ]
@@ -85,6 +85,11 @@ class LearningProfile(models.Model):
     total_xp = models.PositiveIntegerField(default=0)
     streak_days = models.PositiveIntegerField(default=0)
     longest_streak = models.PositiveIntegerField(default=0)
+    last_activity_date = models.DateField(null=True, blank=True)  # local day of last activity
+    streak_freezes = models.PositiveSmallIntegerField(default=0)  # bought with XP
+    
+    # IANA zone used for day boundaries (streaks, daily goals)
+    timezone = models.CharField(max_length=64, default='UTC')
     
     # Memory Palace position
     current_world_id = models.PositiveIntegerField(null=True, blank=True)
@@ -151,26 +156,61 @@ class LearningProfile(models.Model):
         self.primary_style = max(scores, key=scores.get)
         self.save(update_fields=['primary_style'])
     
-    def add_xp(self, amount: int) -> dict:
-        """Add XP to user and check for level up."""
-        self.total_xp += amount
-        
-        # Simple level calculation: level = 1 + (total_xp // 1000)
-        new_level = 1 + (self.total_xp // 1000)
-        leveled_up = new_level > self.current_level
-        
-        if leveled_up:
-            self.current_level = min(new_level, 10)  # Max level 10
+    def add_xp(self, amount: int, source: str = 'other', key: str = None) -> dict:
+        """
+        Add XP to user and check for level up.
+        Goes through the XP ledger: atomic, and idempotent when a key is given.
+        """
+        from .services.xp import XPLedger
         
-        self.save(update_fields=['total_xp', 'current_level'])
+        result = XPLedger().grant(self.user_id, amount, source, key=key)
+        if result:
+            self.total_xp = result['new_total_xp']
+            self.current_level = result['current_level']
         
-        return {
+        return result or {
             'new_total_xp': self.total_xp,
             'current_level': self.current_level,
-            'leveled_up': leveled_up,
+            'leveled_up': False,
         }
 
 
+class ProfileTag(models.Model):
+    """
+    One row per goal, interest and work domain named in a learning
+    profile: the JSON fields normalized so audiences can be queried by
+    tag. Kept in sync by ProfileTagSync; rebuilt with
+    `manage.py rebuild_profile_tags`.
+    """
+
+    class Kind(models.TextChoices):
+        GOAL = 'goal', 'Goal'
+        INTEREST = 'interest', 'Interest'
+        WORK_DOMAIN = 'work_domain', 'Work Domain'
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='profile_tags',
+        db_index=False,  # covered by the (user, kind, value) constraint
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    value = models.CharField(max_length=50)  # lower-case, as in canonical_profile
+    weight = models.FloatField(default=1.0)
+
+    class Meta:
+        db_table = 'profile_tags'
+        unique_together = ['user', 'kind', 'value']
+        indexes = [
+            models.Index(fields=['kind', 'value']),
+        ]
+        verbose_name = 'Profile Tag'
+        verbose_name_plural = 'Profile Tags'
+
+    def __str__(self):
+        return f"{self.user_id} {self.kind}:{self.value}"
+
+
 class DailyActivity(models.Model):
     """
     Daily activity tracking for streaks and analytics.
@@ -195,6 +235,9 @@ class DailyActivity(models.Model):
     # Goal tracking
     daily_goal_met = models.BooleanField(default=False)
     
+    # Day kept in the streak by a streak freeze (no activity)
+    streak_frozen = models.BooleanField(default=False)
+    
     class Meta:
         db_table = 'daily_activities'
         unique_together = ['user', 'date']
@@ -204,3 +247,99 @@ class DailyActivity(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.date}"
+
+
+class ActivityRollup(models.Model):
+    """
+    Per-user activity totals for a calendar period, summed from
+    DailyActivity. Kept current by ActivityAggregator; rebuilt with
+    `manage.py backfill_activity_rollups`.
+    """
+    
+    minutes_studied = models.PositiveIntegerField(default=0)
+    xp_earned = models.PositiveIntegerField(default=0)
+    exercises_completed = models.PositiveIntegerField(default=0)
+    lessons_completed = models.PositiveIntegerField(default=0)
+    words_learned = models.PositiveIntegerField(default=0)
+    words_reviewed = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        abstract = True
+
+
+class WeeklyActivity(ActivityRollup):
+    """Activity totals per ISO week (week_start is a Monday)"""
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='weekly_activities'
+    )
+    week_start = models.DateField()
+    
+    class Meta:
+        db_table = 'weekly_activities'
+        unique_together = ['user', 'week_start']
+        ordering = ['-week_start']
+        verbose_name = 'Weekly Activity'
+        verbose_name_plural = 'Weekly Activities'
+    
+    def __str__(self):
+        return f"{self.user_id} - week of {self.week_start}"
+
+
+class MonthlyActivity(ActivityRollup):
+    """Activity totals per calendar month (month_start is the 1st)"""
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='monthly_activities'
+    )
+    month_start = models.DateField()
+    
+    class Meta:
+        db_table = 'monthly_activities'
+        unique_together = ['user', 'month_start']
+        ordering = ['-month_start']
+        verbose_name = 'Monthly Activity'
+        verbose_name_plural = 'Monthly Activities'
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.month_start:%Y-%m}"
+
+
+class XPGrant(models.Model):
+    """
+    Append-only XP ledger. Every change to LearningProfile.total_xp has a
+    row here; the key makes retried grants (same completion, replayed
+    event) count once.
+    """
+    
+    class Source(models.TextChoices):
+        EXERCISE = 'exercise', 'Exercise'
+        MILESTONE = 'milestone', 'Milestone'
+        STREAK_FREEZE = 'streak_freeze', 'Streak Freeze'
+        OTHER = 'other', 'Other'
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='xp_grants',
+        db_index=False,  # covered by the (user, created_at) index
+    )
+    amount = models.IntegerField()  # negative for XP spent
+    source = models.CharField(max_length=20, choices=Source.choices, default=Source.OTHER)
+    key = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'xp_grants'
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+        verbose_name = 'XP Grant'
+        verbose_name_plural = 'XP Grants'
+    
+    def __str__(self):
+        return f"{self.user_id} {self.amount:+d} XP ({self.source})"
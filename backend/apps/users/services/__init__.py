@@ -0,0 +1,28 @@
+# Users Services
+from .activity import ActivityAggregator, activity_batch, record_activity
+from .export import UserDataExporter
+from .leaderboard import LeaderboardService, RankedBoard, leaderboards
+from .profile_tags import ProfileTagSync, TagIndex, profile_tag_sync, scenario_tag_key, tag_index
+from .provisioning import UserProvisioner
+from .rollups import ActivityRollups
+from .streaks import StreakEngine
+from .xp import XPLedger
+
+__all__ = [
+    'ActivityAggregator',
+    'activity_batch',
+    'record_activity',
+    'UserDataExporter',
+    'LeaderboardService',
+    'RankedBoard',
+    'leaderboards',
+    'ProfileTagSync',
+    'TagIndex',
+    'profile_tag_sync',
+    'scenario_tag_key',
+    'tag_index',
+    'UserProvisioner',
+    'ActivityRollups',
+    'StreakEngine',
+    'XPLedger',
+]
@@ -0,0 +1,206 @@
+"""
+Daily Activity Aggregation
+Accumulates activity counters in memory and writes them with one upsert
+"""
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from ..models import DailyActivity, LearningProfile
+from .leaderboard import leaderboards
+from .rollups import ActivityRollups
+from .streaks import StreakEngine
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class ActivityAggregator:
+    """
+    Coalesces activity events per (user, day) and flushes them in a single
+    INSERT ... ON CONFLICT (user_id, date) DO UPDATE statement.
+
+    Counters are added to the stored row by the database (col = col +
+    EXCLUDED.col), so concurrent flushes never lose increments, and
+    daily_goal_met is evaluated against the user's daily_goal_minutes in
+    the same statement.
+
+    Events without an explicit day land on the user's local day, resolved
+    at flush time from LearningProfile.timezone. The same flush advances
+    the users' streaks.
+
+    Usage:
+        aggregator = ActivityAggregator()
+        aggregator.add(user, exercises_completed=1, xp_earned=10)
+        aggregator.add(user, words_reviewed=3)
+        aggregator.flush()  # profiles + upsert + streaks
+    """
+
+    FIELDS = (
+        'minutes_studied',
+        'xp_earned',
+        'exercises_completed',
+        'lessons_completed',
+        'words_learned',
+        'words_reviewed',
+    )
+
+    # Keeps bound parameters under SQLite's limit
+    MAX_ROWS_PER_STATEMENT = 500
+
+    def __init__(self):
+        self._pending: Dict[Tuple[int, Optional[date]], Counter] = {}
+
+    def add(self, user, day: date = None, **counts):
+        """Queue counters for a user's day (default: the user's today)"""
+        unknown = set(counts) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown activity counters: {', '.join(sorted(unknown))}")
+
+        user_id = getattr(user, 'id', user)
+        key = (user_id, day)
+        self._pending.setdefault(key, Counter()).update(counts)
+
+    def __len__(self):
+        return len(self._pending)
+
+    @transaction.atomic
+    def flush(self) -> int:
+        """
+        Write all queued rows. Returns rows upserted.
+        Queries: profiles (1), daily / weekly / monthly upserts (1 each
+        per 500 rows), streaks (0-2).
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+
+        # Lock in user order so concurrent flushes can't deadlock
+        profiles = {
+            p.user_id: p
+            for p in LearningProfile.objects.select_for_update()
+            .filter(user_id__in={user_id for user_id, _ in pending})
+            .order_by('user_id')
+            .only('user_id', 'timezone', *StreakEngine.STREAK_FIELDS)
+        }
+
+        by_day = defaultdict(Counter)
+        for (user_id, day), counts in pending.items():
+            day = day or StreakEngine.local_date(profiles.get(user_id))
+            by_day[(user_id, day)].update(counts)
+
+        rows = list(by_day.items())
+        for start in range(0, len(rows), self.MAX_ROWS_PER_STATEMENT):
+            self._upsert(rows[start:start + self.MAX_ROWS_PER_STATEMENT])
+        ActivityRollups().apply(rows)
+
+        weekly_xp = [
+            (user_id, day, counts['xp_earned'], StreakEngine.zone(profiles.get(user_id)).key)
+            for (user_id, day), counts in rows if counts.get('xp_earned')
+        ]
+        if weekly_xp:
+            transaction.on_commit(lambda: leaderboards.record_weekly(weekly_xp))
+
+        from apps.progress.services.dashboard import invalidate_dashboards
+        user_ids = [user_id for user_id, _ in by_day]
+        transaction.on_commit(lambda: invalidate_dashboards(user_ids))
+
+        days_by_user = defaultdict(list)
+        for user_id, day in by_day:
+            days_by_user[user_id].append(day)
+        StreakEngine().apply(profiles, days_by_user)
+
+        return len(rows)
+
+    def _upsert(self, rows):
+        qn = connection.ops.quote_name
+        table = qn(DailyActivity._meta.db_table)
+        columns = [qn(f) for f in self.FIELDS]
+        user_id, minutes, goal_met = qn('user_id'), qn('minutes_studied'), qn('daily_goal_met')
+        default_goal = settings.LEARNING_CONFIG['default_daily_goal_minutes']
+
+        # Source rows; the first one names the columns
+        first = 'SELECT ' + ', '.join(f'%s AS {c}' for c in [user_id, qn('date')] + columns)
+        other = 'SELECT ' + ', '.join(['%s'] * (len(columns) + 2))
+        source = ' UNION ALL '.join([first] + [other] * (len(rows) - 1))
+
+        source_params = []
+        for (row_user_id, day), counts in rows:
+            source_params += [row_user_id, day] + [counts.get(f, 0) for f in self.FIELDS]
+
+        def goal_for(user_ref):
+            return (
+                f"COALESCE((SELECT p.{qn('daily_goal_minutes')} "
+                f"FROM {qn(LearningProfile._meta.db_table)} p "
+                f"WHERE p.{user_id} = {user_ref}), %s)"
+            )
+
+        additive = ', '.join(f"{c} = {table}.{c} + EXCLUDED.{c}" for c in columns)
+
+        # WHERE 1=1 keeps SQLite from parsing ON CONFLICT as part of the SELECT
+        sql = (
+            f"INSERT INTO {table} ({user_id}, {qn('date')}, {', '.join(columns)}, "
+            f"{goal_met}, {qn('streak_frozen')}) "
+            f"SELECT v.{user_id}, v.{qn('date')}, {', '.join(f'v.{c}' for c in columns)}, "
+            f"v.{minutes} >= {goal_for(f'v.{user_id}')}, %s "
+            f"FROM ({source}) v WHERE 1=1 "
+            f"ON CONFLICT ({user_id}, {qn('date')}) DO UPDATE SET {additive}, "
+            f"{goal_met} = {table}.{goal_met} OR "
+            f"{table}.{minutes} + EXCLUDED.{minutes} >= {goal_for(f'EXCLUDED.{user_id}')}"
+        )
+        params = [default_goal, False] + source_params + [default_goal]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+@contextmanager
+def activity_batch(fail_silently: bool = False):
+    """
+    Coalesce record_activity() calls made inside the block (on this
+    thread) into one flush at the end. Nested blocks join the outer one.
+    Nothing is written if the block raises.
+
+    With fail_silently, a failing flush is logged instead of raised: for
+    callers whose own work has already committed (the request middleware).
+    """
+    outer = getattr(_local, 'aggregator', None)
+    if outer is not None:
+        yield outer
+        return
+
+    aggregator = _local.aggregator = ActivityAggregator()
+    try:
+        yield aggregator
+        if aggregator:
+            try:
+                aggregator.flush()  # no empty transaction for read-only requests
+            except Exception:
+                if not fail_silently:
+                    raise
+                logger.exception("Activity flush failed, %d counters lost", len(aggregator))
+    finally:
+        _local.aggregator = None
+
+
+def record_activity(user, day: date = None, **counts):
+    """
+    Add to a user's DailyActivity. Batched when inside activity_batch(),
+    written immediately otherwise.
+    """
+    aggregator = getattr(_local, 'aggregator', None)
+    if aggregator is not None:
+        aggregator.add(user, day, **counts)
+        return
+
+    aggregator = ActivityAggregator()
+    aggregator.add(user, day, **counts)
+    aggregator.flush()
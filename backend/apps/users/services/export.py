@@ -0,0 +1,182 @@
+"""
+User Data Export
+Streams everything stored about a user as NDJSON or a zip of CSV files
+"""
+import csv
+import io
+import json
+import zipfile
+from typing import Iterator, List, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+# Account columns safe to hand out (no password hash, no permission flags)
+ACCOUNT_FIELDS = ['id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'last_login']
+
+
+class _Pipe:
+    """Write-only buffer a streaming generator drains between chunks"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self._parts = b''.join(self._parts), []
+        return data
+
+
+class UserDataExporter:
+    """
+    Constant-memory export of one user's data.
+
+    Every table is read with values_list().iterator(chunk_size), which
+    uses a server-side cursor on PostgreSQL, and written out chunk by
+    chunk - nothing holds more than CHUNK_SIZE rows, however long the
+    user's history is.
+
+    Formats:
+      - NDJSON: a header line, then {"table": ..., "row": {...}} per row
+      - zip of CSV: one <table>.csv per table, with a header row
+
+    Usage:
+        exporter = UserDataExporter()
+        StreamingHttpResponse(exporter.iter_ndjson(user), content_type=exporter.NDJSON_CONTENT_TYPE)
+        exporter.write(user, open('export.zip', 'wb'), fmt='csv')
+    """
+
+    CHUNK_SIZE = 2000
+
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+    FORMATS = (NDJSON, CSV)
+
+    NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+    CSV_CONTENT_TYPE = 'application/zip'
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def sources(self, user) -> List[Tuple[str, List[str], object]]:
+        """(table name, columns, values_list queryset) per exported table"""
+        from django.contrib.auth import get_user_model
+        from apps.content.models import UserGrammarProgress, UserVocabularyProgress
+        from apps.onboarding.models import UserOnboardingProgress
+        from apps.progress.models import AttemptArchive, AttemptLog, UserMilestoneProgress
+        from ..models import DailyActivity, LearningProfile, XPGrant
+
+        def table(name, model, queryset=None, fields=None):
+            fields = fields or [f.attname for f in model._meta.concrete_fields]
+            queryset = model.objects.filter(user=user) if queryset is None else queryset
+            return name, fields, queryset.order_by('pk').values_list(*fields)
+
+        return [
+            table('account', get_user_model(), get_user_model().objects.filter(pk=user.pk), ACCOUNT_FIELDS),
+            table('learning_profile', LearningProfile),
+            table('onboarding_progress', UserOnboardingProgress),
+            table('milestone_progress', UserMilestoneProgress),
+            table('attempts', AttemptLog),
+            table('archived_attempts', AttemptArchive),
+            table('vocabulary', UserVocabularyProgress),
+            table('grammar', UserGrammarProgress),
+            table('daily_activity', DailyActivity),
+            table('xp_grants', XPGrant),
+        ]
+
+    def _rows(self, queryset) -> Iterator[tuple]:
+        return queryset.iterator(chunk_size=self.chunk_size)
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    def iter_ndjson(self, user) -> Iterator[bytes]:
+        """NDJSON lines, yielded one chunk of rows at a time"""
+        sources = self.sources(user)
+        yield self._json_line({
+            'export': {
+                'user_id': user.pk,
+                'generated_at': timezone.now(),
+                'tables': [name for name, _, _ in sources],
+            }
+        })
+
+        for name, fields, queryset in sources:
+            lines = []
+            for row in self._rows(queryset):
+                lines.append(self._json_line({'table': name, 'row': dict(zip(fields, row))}))
+                if len(lines) >= self.chunk_size:
+                    yield b''.join(lines)
+                    lines = []
+            if lines:
+                yield b''.join(lines)
+
+    def iter_csv_zip(self, user) -> Iterator[bytes]:
+        """A zip of CSV files, yielded as it is compressed"""
+        pipe = _Pipe()
+
+        # Written to a non-seekable stream, so entries use data descriptors
+        with zipfile.ZipFile(pipe, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, fields, queryset in self.sources(user):
+                with archive.open(f'{name}.csv', 'w', force_zip64=True) as entry:
+                    text = io.TextIOWrapper(entry, encoding='utf-8', newline='')
+                    writer = csv.writer(text)
+                    writer.writerow(fields)
+
+                    for count, row in enumerate(self._rows(queryset), start=1):
+                        writer.writerow([self._csv_value(v) for v in row])
+                        if count % self.chunk_size == 0:
+                            text.flush()
+                            yield pipe.drain()
+
+                    text.flush()
+                    text.detach()
+                yield pipe.drain()
+
+        yield pipe.drain()
+
+    def iter_export(self, user, fmt: str = NDJSON) -> Iterator[bytes]:
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        return self.iter_ndjson(user) if fmt == self.NDJSON else self.iter_csv_zip(user)
+
+    def write(self, user, fileobj, fmt: str = NDJSON) -> int:
+        """Write the export to a binary file object. Returns bytes written."""
+        written = 0
+        for chunk in self.iter_export(user, fmt):
+            fileobj.write(chunk)
+            written += len(chunk)
+        return written
+
+    def content_type(self, fmt: str) -> str:
+        return self.NDJSON_CONTENT_TYPE if fmt == self.NDJSON else self.CSV_CONTENT_TYPE
+
+    def filename(self, user, fmt: str) -> str:
+        stamp = timezone.now().strftime('%Y%m%d')
+        return f"yopuedo360-{user.pk}-{stamp}.{'ndjson' if fmt == self.NDJSON else 'zip'}"
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _json_line(data: dict) -> bytes:
+        return (json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
+
+    @staticmethod
+    def _csv_value(value):
+        # JSON columns (answers, lists, dicts) go in as JSON text
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+        return value
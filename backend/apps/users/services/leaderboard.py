@@ -0,0 +1,467 @@
+"""
+XP Leaderboards
+In-memory ranked boards (global, weekly, per CEFR level) with O(log n) rank lookups
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, datetime, time as day_start, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import DailyActivity, LearningProfile
+from .rollups import week_start
+
+logger = logging.getLogger(__name__)
+
+
+class RankedBoard:
+    """
+    Order-statistics board: a sorted array of (-score, user_id) plus a
+    score map. rank() is a bisect; updates are a bisect plus one
+    array shift, far below a COUNT(*) scan for the board sizes we have.
+    Ties rank by user id (older accounts first).
+    """
+
+    def __init__(self, scores: Dict[int, int] = None):
+        self._scores: Dict[int, int] = dict(scores or {})
+        self._order: List[Tuple[int, int]] = sorted(
+            (-score, user_id) for user_id, score in self._scores.items()
+        )
+
+    def __len__(self):
+        return len(self._order)
+
+    def score(self, user_id: int) -> Optional[int]:
+        return self._scores.get(user_id)
+
+    def set(self, user_id: int, score: int):
+        old = self._scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, user_id))]
+        self._scores[user_id] = score
+        insort(self._order, (-score, user_id))
+
+    def remove(self, user_id: int):
+        old = self._scores.pop(user_id, None)
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, user_id))]
+
+    def add(self, user_id: int, delta: int):
+        self.set(user_id, self._scores.get(user_id, 0) + delta)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank, None if the user is not on the board"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._order, (-score, user_id)) + 1
+
+    def slice(self, start: int, stop: int) -> List[Tuple[int, int, int]]:
+        """(rank, user_id, score) for 0-based positions [start, stop)"""
+        start = max(start, 0)
+        return [
+            (start + i + 1, user_id, -neg_score)
+            for i, (neg_score, user_id) in enumerate(self._order[start:stop])
+        ]
+
+    def top(self, n: int):
+        return self.slice(0, n)
+
+    def around(self, user_id: int, radius: int):
+        rank = self.rank(user_id)
+        if rank is None:
+            return []
+        return self.slice(rank - 1 - radius, rank + radius)
+
+    def items(self) -> List[List[int]]:
+        return [[user_id, score] for user_id, score in self._scores.items()]
+
+
+class LeaderboardService:
+    """
+    Holds the boards for this process.
+
+    Boards load from the checkpoint file when it is recent, otherwise
+    from the database (2 queries), and are rebuilt from the database every
+    refresh_seconds to pick up XP granted by other processes. Between
+    rebuilds they are updated incrementally:
+      - global / level boards from LearningProfile.add_xp()
+      - the weekly board from DailyActivity flushes (xp_earned)
+
+    The weekly board uses the same day boundary as DailyActivity: each
+    user's score is their XP in their own local week (Monday to Sunday
+    in the profile's timezone), and resets when that week ends for them.
+    Weekly users are filed by (week start, timezone), so pruning checks
+    one end time per bucket and only touches the users of ended ones.
+
+    Rebuilds read the database without holding the lock; reads keep
+    using the old boards until the new ones are swapped in. Checkpoint
+    files are written after the lock is released.
+
+    Usage:
+        leaderboards.top('global', 10)
+        leaderboards.around('weekly', user.id, radius=5)
+        leaderboards.rank('level', user.id, level='A2')
+    """
+
+    GLOBAL = 'global'
+    WEEKLY = 'weekly'
+    LEVEL = 'level'
+    BOARDS = (GLOBAL, WEEKLY, LEVEL)
+
+    # How often weekly scores of users whose local week ended are dropped
+    PRUNE_SECONDS = 60
+
+    def __init__(self, checkpoint_path=None, checkpoint_seconds=None, refresh_seconds=None):
+        config = getattr(settings, 'LEADERBOARDS', {})
+
+        self.checkpoint_path = Path(
+            checkpoint_path or config.get('checkpoint_path', settings.BASE_DIR / 'var' / 'leaderboards.json')
+        )
+        self.checkpoint_seconds = checkpoint_seconds or config.get('checkpoint_seconds', 60)
+        self.refresh_seconds = refresh_seconds or config.get('refresh_seconds', 900)
+
+        self._lock = threading.RLock()              # the boards
+        self._load_lock = threading.Lock()          # one rebuild at a time
+        self._checkpoint_lock = threading.Lock()    # one checkpoint write at a time
+        self._loaded_at = 0.0
+        self._checkpointed_at = 0.0
+        self._pruned_at = 0.0
+        self._dirty = False
+        self._loading_totals: Optional[list] = None  # record_total() calls made during a rebuild
+
+        self._global = RankedBoard()
+        self._weekly = RankedBoard()
+        self._week_of: Dict[int, Tuple[date, str]] = {}  # user -> (local week start, zone) of their score
+        self._week_buckets: Dict[Tuple[date, str], Set[int]] = {}  # the same, by bucket
+        self._levels: Dict[str, RankedBoard] = {}
+        self._user_level: Dict[int, str] = {}
+        self._zones: Dict[int, str] = {}
+        self._names: Dict[int, str] = {}
+
+        atexit.register(self.checkpoint)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def top(self, board: str, n: int = 10, level: str = None) -> List[dict]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._entries(self._board(board, level).top(n))
+
+    def around(self, board: str, user_id: int, radius: int = 5, level: str = None) -> List[dict]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._entries(self._board(board, level, user_id).around(user_id, radius))
+
+    def rank(self, board: str, user_id: int, level: str = None) -> dict:
+        self._ensure_loaded()
+        with self._lock:
+            ranked = self._board(board, level, user_id)
+            if board == self.LEVEL:
+                level = level or self._user_level.get(user_id)
+            return {
+                'board': board,
+                'level': level,
+                'rank': ranked.rank(user_id),
+                'score': ranked.score(user_id) or 0,
+                'total': len(ranked),
+            }
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def record_total(self, user_id: int, total_xp: int, level: str = None, username: str = None):
+        """A profile's new total XP (after add_xp)"""
+        with self._lock:
+            if self._loading_totals is not None:
+                self._loading_totals.append((user_id, total_xp, level, username))
+            if not self._loaded_at:
+                return  # not loaded yet: the load will read the new total
+
+            self._set_total(user_id, total_xp, level, username)
+            due = self._touched()
+        if due:
+            self.checkpoint()
+
+    def record_weekly(self, rows):
+        """(user_id, local day, xp, timezone name) added to DailyActivity rows"""
+        with self._lock:
+            if not self._loaded_at:
+                return
+            for user_id, day, xp, zone in rows:
+                zone = zone or settings.TIME_ZONE
+                self._zones[user_id] = zone
+                week = week_start(day)
+                if not xp or week != self._local_week(zone):
+                    continue  # late row for a week that is over for this user
+                filed = self._week_of.get(user_id)
+                if not filed or filed[0] != week:
+                    self._weekly.set(user_id, 0)
+                if filed != (week, zone):
+                    self._file_week(user_id, (week, zone))
+                self._weekly.add(user_id, xp)
+            due = self._touched()
+        if due:
+            self.checkpoint()
+
+    def _set_total(self, user_id: int, total_xp: int, level: str = None, username: str = None):
+        self._global.set(user_id, total_xp)
+
+        old_level = self._user_level.get(user_id)
+        level = level or old_level
+        if old_level and old_level != level:
+            self._levels[old_level].remove(user_id)
+        if level:
+            self._user_level[user_id] = level
+            self._levels.setdefault(level, RankedBoard()).set(user_id, total_xp)
+        if username:
+            self._names[user_id] = username
+
+    # ------------------------------------------------------------------
+    # Loading / checkpoints
+    # ------------------------------------------------------------------
+
+    def checkpoint(self):
+        """
+        Write the boards to disk (tmp file + atomic rename). Only the
+        snapshot is taken under the board lock; never call this holding it.
+        """
+        with self._checkpoint_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = {
+                    'saved_at': time.time(),
+                    'global': self._global.items(),
+                    'weekly': [
+                        [user_id, score, self._week_of[user_id][0].isoformat()]
+                        for user_id, score in self._weekly.items()
+                    ],
+                    'levels': dict(self._user_level),
+                    'zones': dict(self._zones),
+                    'names': dict(self._names),
+                }
+                self._dirty = False
+                self._checkpointed_at = time.monotonic()
+
+            try:
+                self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.checkpoint_path.with_suffix(f'.{os.getpid()}.tmp')
+                tmp_path.write_text(json.dumps(data))
+                os.replace(tmp_path, self.checkpoint_path)
+            except OSError:
+                logger.exception("Could not write leaderboard checkpoint")
+
+    def reload(self):
+        """Rebuild every board from the database"""
+        with self._load_lock:
+            self._load_from_db()
+
+    def _ensure_loaded(self):
+        if self._loaded_at and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+
+        with self._load_lock:
+            if self._loaded_at and time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return  # another thread rebuilt while we waited
+            if not self._loaded_at and self._load_checkpoint():
+                return
+            self._load_from_db()
+
+    def _load_from_db(self):
+        """Scan outside the board lock, then swap the boards in under it"""
+        with self._lock:
+            self._loading_totals = []
+
+        try:
+            totals, levels, zones, names = {}, {}, {}, {}
+            for user_id, total_xp, level, zone, username in LearningProfile.objects.values_list(
+                'user_id', 'total_xp', 'cefr_level', 'timezone', 'user__username'
+            ).iterator(chunk_size=5000):
+                totals[user_id] = total_xp
+                levels[user_id] = level
+                zones[user_id] = zone
+                names[user_id] = username
+
+            # Every local week in progress started within the last 8 server days
+            weekly, week_of, local_weeks = {}, {}, {}
+            recent = (
+                DailyActivity.objects.filter(date__gte=timezone.localdate() - timedelta(days=8), xp_earned__gt=0)
+                .values_list('user_id', 'date', 'xp_earned')
+            )
+            for user_id, day, xp in recent:
+                zone = zones.get(user_id) or settings.TIME_ZONE
+                if zone not in local_weeks:
+                    local_weeks[zone] = self._local_week(zone)
+                week = local_weeks[zone]
+                if week_start(day) == week:
+                    weekly[user_id] = weekly.get(user_id, 0) + xp
+                    week_of[user_id] = (week, zone)
+
+            boards = self._build_boards(totals, weekly, levels, week_of)
+        finally:
+            with self._lock:
+                replay, self._loading_totals = self._loading_totals, None
+
+        with self._lock:
+            self._swap(boards, levels, zones, names)
+            self._dirty = True
+            # Totals credited while we were scanning (a set is idempotent);
+            # weekly adds in that window are picked up by the next rebuild
+            for args in replay:
+                self._set_total(*args)
+
+    def _load_checkpoint(self) -> bool:
+        try:
+            data = json.loads(self.checkpoint_path.read_text())
+        except (OSError, ValueError):
+            return False
+
+        age = time.time() - data.get('saved_at', 0)
+        if age >= self.refresh_seconds or 'zones' not in data:
+            return False  # stale, or written before weekly scores were per user
+
+        levels = {int(u): lvl for u, lvl in data['levels'].items()}
+        zones = {int(u): zone for u, zone in data['zones'].items()}
+        boards = self._build_boards(
+            {int(u): s for u, s in data['global']},
+            {int(u): s for u, s, _ in data['weekly']},
+            levels,
+            {int(u): (date.fromisoformat(w), zones.get(int(u)) or settings.TIME_ZONE) for u, _, w in data['weekly']},
+        )
+        with self._lock:
+            self._swap(
+                boards,
+                levels,
+                zones,
+                {int(u): name for u, name in data.get('names', {}).items()},
+            )
+            # Refresh on the checkpoint's schedule, not a fresh one
+            self._loaded_at -= age
+            self._prune_weekly(force=True)
+        return True
+
+    @staticmethod
+    def _build_boards(totals, weekly, levels, week_of):
+        by_level: Dict[str, Dict[int, int]] = {}
+        for user_id, level in levels.items():
+            by_level.setdefault(level, {})[user_id] = totals.get(user_id, 0)
+
+        week_buckets: Dict[Tuple[date, str], Set[int]] = {}
+        for user_id, bucket in week_of.items():
+            week_buckets.setdefault(bucket, set()).add(user_id)
+
+        return (
+            RankedBoard(totals),
+            RankedBoard(weekly),
+            {level: RankedBoard(scores) for level, scores in by_level.items()},
+            week_of,
+            week_buckets,
+        )
+
+    def _swap(self, boards, levels, zones, names):
+        self._global, self._weekly, self._levels, self._week_of, self._week_buckets = boards
+        self._user_level = levels
+        self._zones = zones
+        self._names = names
+        self._loaded_at = time.monotonic()
+        self._pruned_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _board(self, board: str, level: str = None, user_id: int = None) -> RankedBoard:
+        if board not in self.BOARDS:
+            raise ValueError(f"Unknown leaderboard: {board}")
+
+        if board == self.GLOBAL:
+            return self._global
+        if board == self.WEEKLY:
+            self._prune_weekly()
+            return self._weekly
+
+        level = level or self._user_level.get(user_id)
+        return self._levels.get(level) or RankedBoard()
+
+    def _entries(self, rows) -> List[dict]:
+        missing = [user_id for _, user_id, _ in rows if user_id not in self._names]
+        if missing:
+            from django.contrib.auth import get_user_model
+            self._names.update(
+                get_user_model().objects.filter(id__in=missing).values_list('id', 'username')
+            )
+
+        return [
+            {'rank': rank, 'user_id': user_id, 'username': self._names.get(user_id, ''), 'xp': score}
+            for rank, user_id, score in rows
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _tzinfo(zone: Optional[str]) -> ZoneInfo:
+        try:
+            return ZoneInfo(zone or settings.TIME_ZONE)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo(settings.TIME_ZONE)
+
+    @classmethod
+    def _local_week(cls, zone: Optional[str]) -> date:
+        """Monday of the current week in a user's timezone (as DailyActivity days are)"""
+        return week_start(timezone.localtime(timezone.now(), cls._tzinfo(zone)).date())
+
+    @classmethod
+    def _week_end(cls, bucket: Tuple[date, str]) -> datetime:
+        """When a (week start, zone) bucket's week ends"""
+        week, zone = bucket
+        return datetime.combine(week + timedelta(days=7), day_start.min, tzinfo=cls._tzinfo(zone))
+
+    def _file_week(self, user_id: int, bucket: Optional[Tuple[date, str]]):
+        """Move a user's weekly score to another bucket (None: off the board)"""
+        old = self._week_of.pop(user_id, None)
+        if old is not None:
+            users = self._week_buckets[old]
+            users.discard(user_id)
+            if not users:
+                del self._week_buckets[old]
+        if bucket is not None:
+            self._week_of[user_id] = bucket
+            self._week_buckets.setdefault(bucket, set()).add(user_id)
+
+    def _prune_weekly(self, force: bool = False):
+        """Drop weekly scores of users whose local week has ended"""
+        if not force and time.monotonic() - self._pruned_at < self.PRUNE_SECONDS:
+            return
+        self._pruned_at = time.monotonic()
+
+        now = timezone.now()
+        ended = [bucket for bucket in self._week_buckets if self._week_end(bucket) <= now]
+        for bucket in ended:
+            for user_id in self._week_buckets.pop(bucket):
+                self._weekly.remove(user_id)
+                del self._week_of[user_id]
+        if ended:
+            self._dirty = True
+
+    def _touched(self) -> bool:
+        """Mark the boards changed. True when a checkpoint is due (write it after releasing the lock)."""
+        self._dirty = True
+        return time.monotonic() - self._checkpointed_at >= self.checkpoint_seconds
+
+
+leaderboards = LeaderboardService()
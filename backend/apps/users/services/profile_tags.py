@@ -0,0 +1,326 @@
+"""
+Profile Tags
+Normalized goal / interest tags for learning profiles, with bitset audiences
+"""
+import threading
+import time
+from collections import defaultdict
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from ..models import LearningProfile, ProfileTag
+
+# (kind, value), e.g. ('interest', 'food')
+TagKey = Tuple[str, str]
+
+# LearningProfile JSON field -> ProfileTag kind
+WEIGHTED_FIELDS = {
+    'goals': ProfileTag.Kind.GOAL,
+    'interests': ProfileTag.Kind.INTEREST,
+}
+
+# memory_palace Tag.type -> ProfileTag kind it matches
+SCENARIO_TAG_KINDS = {
+    'goal': ProfileTag.Kind.GOAL,
+    'domain': ProfileTag.Kind.INTEREST,
+    'interest': ProfileTag.Kind.INTEREST,
+    'work_domain': ProfileTag.Kind.WORK_DOMAIN,
+}
+
+VALUE_LENGTH = ProfileTag._meta.get_field('value').max_length
+
+
+def scenario_tag_key(tag) -> Optional[TagKey]:
+    """The profile tag a scenario Tag matches, or None (e.g. skill tags)"""
+    kind = SCENARIO_TAG_KINDS.get(tag.type)
+    return (kind, tag.value.strip().lower()) if kind else None
+
+
+def _bitset(ids: Iterable[int]) -> int:
+    """Set of non-negative ints -> int with those bits set (linear time)"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _members(bits: int) -> List[int]:
+    """Bits set in an int, ascending"""
+    members = []
+    for offset, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            members.append(offset * 8 + low.bit_length() - 1)
+            byte ^= low
+    return members
+
+
+class ProfileTagSync:
+    """
+    Keeps ProfileTag rows equal to the goals, interests and work_domain
+    of each LearningProfile.
+
+    sync() diffs the wanted tags against the stored rows and only
+    deletes, inserts or re-weights what changed (1 select, plus up to
+    3 writes per MAX_ROWS_PER_STATEMENT profiles), so saving a profile
+    whose tags did not move costs one query. Values are normalized like
+    canonical_profile(): trimmed, lower-case, zero weights dropped.
+
+    LearningProfile.save() syncs through a post_save signal (skipped
+    when update_fields names no tag field); bulk writers call sync()
+    themselves.
+
+    Usage:
+        profile_tag_sync.sync(profiles)
+        profile_tag_sync.rebuild()  # every profile
+    """
+
+    TAG_FIELDS = ('goals', 'interests', 'work_domain')
+
+    MAX_ROWS_PER_STATEMENT = 500
+
+    @staticmethod
+    def tags_of(profile: LearningProfile) -> Dict[TagKey, float]:
+        tags = {}
+        for field, kind in WEIGHTED_FIELDS.items():
+            value = getattr(profile, field) or {}
+            if not isinstance(value, dict):  # legacy list of keys
+                value = {key: 1.0 for key in value}
+            for key, weight in value.items():
+                key = str(key).strip().lower()[:VALUE_LENGTH]
+                if key and weight:
+                    tags[(kind, key)] = round(float(weight), 2)
+
+        work_domain = (profile.work_domain or '').strip().lower()[:VALUE_LENGTH]
+        if work_domain:
+            tags[(ProfileTag.Kind.WORK_DOMAIN, work_domain)] = 1.0
+        return tags
+
+    def sync(self, profiles: Iterable[LearningProfile]) -> int:
+        """Bring the tags of these profiles up to date. Returns rows written."""
+        profiles = list(profiles)
+        written = 0
+        with transaction.atomic():
+            for start in range(0, len(profiles), self.MAX_ROWS_PER_STATEMENT):
+                written += self._sync_batch(profiles[start:start + self.MAX_ROWS_PER_STATEMENT])
+            if written:
+                transaction.on_commit(tag_index.touch)
+        return written
+
+    def _sync_batch(self, profiles: List[LearningProfile]) -> int:
+        wanted = {profile.user_id: self.tags_of(profile) for profile in profiles}
+
+        stored = defaultdict(dict)
+        for tag in ProfileTag.objects.filter(user_id__in=wanted):
+            stored[tag.user_id][(tag.kind, tag.value)] = tag
+
+        to_create, to_update, to_delete = [], [], []
+        for user_id, tags in wanted.items():
+            current = stored.get(user_id, {})
+            for key, tag in current.items():
+                if key not in tags:
+                    to_delete.append(tag.id)
+                elif tag.weight != tags[key]:
+                    tag.weight = tags[key]
+                    to_update.append(tag)
+            to_create += [
+                ProfileTag(user_id=user_id, kind=kind, value=value, weight=weight)
+                for (kind, value), weight in tags.items()
+                if (kind, value) not in current
+            ]
+
+        if to_delete:
+            ProfileTag.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            ProfileTag.objects.bulk_update(to_update, ['weight'])
+        if to_create:
+            ProfileTag.objects.bulk_create(to_create)
+        return len(to_delete) + len(to_update) + len(to_create)
+
+    def remove(self, user_id: int):
+        if ProfileTag.objects.filter(user_id=user_id).delete()[0]:
+            transaction.on_commit(tag_index.touch)
+
+    @transaction.atomic
+    def rebuild(self) -> int:
+        """Re-sync every profile and drop tags of users without one. Returns rows written."""
+        ProfileTag.objects.exclude(user__learning_profile__isnull=False).delete()
+
+        written, batch = 0, []
+        profiles = LearningProfile.objects.only('user_id', *self.TAG_FIELDS).order_by('user_id')
+        for profile in profiles.iterator(chunk_size=2000):
+            batch.append(profile)
+            if len(batch) == self.MAX_ROWS_PER_STATEMENT:
+                written += self._sync_batch(batch)
+                batch = []
+        if batch:
+            written += self._sync_batch(batch)
+
+        transaction.on_commit(tag_index.touch)
+        return written
+
+
+profile_tag_sync = ProfileTagSync()
+
+
+class TagIndex:
+    """
+    In-memory inverted index over ProfileTag and scenario tags:
+    tag -> users and tag -> active scenarios, each a bitset (a Python
+    int with bit N set for id N). Unions and intersections are single
+    big-int operations, so audiences of tens of thousands of users come
+    back without touching the database.
+
+    The user side rebuilds when ProfileTagSync bumps VERSION_KEY, the
+    scenario side when the catalogue version changes (1 query each).
+    VERSION_KEY lives in the shared cache, so every process sees a bump;
+    MAX_AGE_SECONDS bounds the staleness if the key is evicted.
+
+    Usage:
+        tag_index.users(('interest', 'food'))                          # who likes food
+        tag_index.users(('goal', 'work'), ('interest', 'tech'), match='all')
+        tag_index.audience([scenario.id])                              # who a scenario is for
+        tag_index.scenarios_for(user)                                  # and back
+    """
+
+    VERSION_KEY = 'profile_tags:version'
+    MAX_AGE_SECONDS = 300
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users: Dict[TagKey, int] = {}
+        self._scenarios: Dict[TagKey, int] = {}
+        self._scenario_tags: Dict[int, Tuple[TagKey, ...]] = {}
+        self._users_built = (None, 0.0)      # (version, monotonic time)
+        self._scenarios_built = (None, 0.0)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def users(self, *tags: TagKey, match: str = 'any') -> List[int]:
+        """User ids with any (or all) of the tags"""
+        self._ensure_fresh()
+        return _members(self._combine(self._users, tags, match))
+
+    def count(self, *tags: TagKey, match: str = 'any') -> int:
+        self._ensure_fresh()
+        return self._combine(self._users, tags, match).bit_count()
+
+    def scenarios(self, *tags: TagKey, match: str = 'any') -> List[int]:
+        """Active scenario ids with any (or all) of the tags"""
+        self._ensure_fresh()
+        return _members(self._combine(self._scenarios, tags, match))
+
+    def audience(self, scenario_ids: Iterable[int], kinds: Iterable[str] = None) -> List[int]:
+        """Users sharing at least one tag (of `kinds`, default all) with any of the scenarios"""
+        self._ensure_fresh()
+        kinds = set(kinds) if kinds else None
+        tags = {
+            tag for scenario_id in scenario_ids
+            for tag in self._scenario_tags.get(scenario_id, ())
+            if kinds is None or tag[0] in kinds
+        }
+        return _members(self._combine(self._users, tags, 'any'))
+
+    def scenarios_for(self, user) -> List[int]:
+        """Active scenarios sharing at least one tag with a user (1 query)"""
+        tags = ProfileTag.objects.filter(user=user).values_list('kind', 'value')
+        return self.scenarios(*tags)
+
+    def popularity(self, kind: str = None) -> Dict[TagKey, int]:
+        """Users per tag, most popular first"""
+        self._ensure_fresh()
+        counts = {
+            tag: bits.bit_count() for tag, bits in self._users.items()
+            if kind is None or tag[0] == kind
+        }
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    @staticmethod
+    def _combine(index: Dict[TagKey, int], tags, match: str) -> int:
+        sets = [index.get((kind, str(value).strip().lower()), 0) for kind, value in tags]
+        if not sets:
+            return 0
+        if match == 'all':
+            return reduce(int.__and__, sets)
+        return reduce(int.__or__, sets)
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+
+    def touch(self):
+        """Mark the user side stale (ProfileTag rows changed)"""
+        cache.add(self.VERSION_KEY, 0, None)
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:  # evicted between add and incr
+            cache.set(self.VERSION_KEY, 1, None)
+
+    def _ensure_fresh(self):
+        from apps.core.catalogue import catalogue_version
+
+        users_version = cache.get(self.VERSION_KEY, 0)
+        scenarios_version = catalogue_version.get()
+        if not (self._is_stale(self._users_built, users_version)
+                or self._is_stale(self._scenarios_built, scenarios_version)):
+            return
+
+        with self._lock:
+            if self._is_stale(self._users_built, users_version):
+                self._build_users()
+                self._users_built = (users_version, time.monotonic())
+            if self._is_stale(self._scenarios_built, scenarios_version):
+                self._build_scenarios()
+                self._scenarios_built = (scenarios_version, time.monotonic())
+
+    def _is_stale(self, built, version) -> bool:
+        built_version, built_at = built
+        return built_version != version or time.monotonic() - built_at >= self.MAX_AGE_SECONDS
+
+    def _build_users(self):
+        ids = defaultdict(list)
+        for user_id, kind, value in ProfileTag.objects.values_list('user_id', 'kind', 'value').iterator(chunk_size=5000):
+            ids[(kind, value)].append(user_id)
+        self._users = {tag: _bitset(user_ids) for tag, user_ids in ids.items()}
+
+    def _build_scenarios(self):
+        from apps.memory_palace.models import Tag
+
+        ids, scenario_tags = defaultdict(list), defaultdict(list)
+        rows = Tag.objects.filter(
+            type__in=SCENARIO_TAG_KINDS, scenarios__is_active=True
+        ).values_list('scenarios', 'type', 'value')
+        for scenario_id, tag_type, value in rows:
+            tag = (SCENARIO_TAG_KINDS[tag_type], value.strip().lower())
+            ids[tag].append(scenario_id)
+            scenario_tags[scenario_id].append(tag)
+
+        # Swap in one go so readers never see a half-built side
+        self._scenarios = {tag: _bitset(scenario_ids) for tag, scenario_ids in ids.items()}
+        self._scenario_tags = {scenario_id: tuple(tags) for scenario_id, tags in scenario_tags.items()}
+
+
+tag_index = TagIndex()
+
+
+def _profile_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(ProfileTagSync.TAG_FIELDS):
+        profile_tag_sync.sync([instance])
+
+
+def _profile_deleted(sender, instance, **kwargs):
+    profile_tag_sync.remove(instance.user_id)
+
+
+def connect_signals():
+    post_save.connect(_profile_saved, sender=LearningProfile, dispatch_uid='profile_tags:save')
+    post_delete.connect(_profile_deleted, sender=LearningProfile, dispatch_uid='profile_tags:delete')
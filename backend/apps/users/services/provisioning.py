@@ -0,0 +1,233 @@
+"""
+Bulk Provisioning
+Creates whole cohorts of accounts (user, profile, onboarding) in a few statements
+"""
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import LearningProfile, User
+from .profile_tags import profile_tag_sync
+
+CEFR_LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+
+
+def _init_worker():
+    """Pool initializer: spawned (non-forked) workers need Django configured"""
+    import django
+    django.setup()
+
+
+def hash_password(raw: Optional[str]) -> str:
+    """make_password() as a module-level function so a process pool can pickle it"""
+    return make_password(raw)
+
+
+class UserProvisioner:
+    """
+    Provisions institutional cohorts: one row per user (username, email,
+    password, first_name, last_name, plus any PROFILE_FIELDS) merged over
+    cohort defaults.
+
+    Password hashing (the slow part, by design) runs on a process pool;
+    rows without a password get an unusable one at no cost. Users,
+    learning profiles and onboarding progress are then written with
+    bulk_create in BATCH_SIZE chunks inside one transaction, and a
+    recommendation warmup is scheduled per user on commit.
+
+    Rows whose username or email is already taken (or repeated in the
+    input) are skipped and reported, never partially created.
+
+    Usage:
+        UserProvisioner().provision(UserProvisioner.parse_csv(file), defaults={'cefr_level': 'A2'})
+    """
+
+    USER_FIELDS = ('username', 'email', 'password', 'first_name', 'last_name')
+    PROFILE_FIELDS = (
+        'native_language', 'target_language', 'cefr_level', 'daily_goal_minutes',
+        'goals', 'interests', 'work_domain', 'profession', 'hobbies', 'timezone',
+    )
+    JSON_FIELDS = ('goals', 'interests', 'hobbies')
+
+    BATCH_SIZE = 1000
+
+    # Below this many passwords a pool costs more than it saves
+    INLINE_HASH_LIMIT = 8
+
+    def __init__(self, workers: int = None, batch_size: int = None):
+        config = getattr(settings, 'USER_PROVISIONING', {})
+        self.workers = workers or config.get('workers') or os.cpu_count() or 1
+        self.batch_size = batch_size or config.get('batch_size', self.BATCH_SIZE)
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def parse_csv(cls, source) -> List[dict]:
+        """Rows from CSV text or a file; JSON columns (goals, ...) may hold JSON"""
+        if isinstance(source, bytes):
+            source = source.decode('utf-8-sig')
+        if isinstance(source, str):
+            source = io.StringIO(source)
+
+        rows = []
+        for row in csv.DictReader(source):
+            row = {k.strip(): (v or '').strip() for k, v in row.items() if k}
+            for field in cls.JSON_FIELDS:
+                if row.get(field):
+                    row[field] = json.loads(row[field])
+            rows.append({k: v for k, v in row.items() if v != ''})
+        return rows
+
+    # ------------------------------------------------------------------
+    # Provisioning
+    # ------------------------------------------------------------------
+
+    def provision(
+        self,
+        rows: Iterable[dict],
+        defaults: Dict = None,
+        complete_onboarding: bool = False,
+        warm: bool = True,
+    ) -> dict:
+        """
+        Returns:
+            {'created': [{'id', 'username'}...], 'skipped': [{'row', 'username', 'error'}...]}
+        """
+        accepted, skipped = self._validate([{**(defaults or {}), **row} for row in rows])
+        if not accepted:
+            return {'created': [], 'skipped': skipped}
+
+        passwords = self._hash([row.get('password') for row in accepted])
+
+        created = []
+        with transaction.atomic():
+            for start in range(0, len(accepted), self.batch_size):
+                batch = accepted[start:start + self.batch_size]
+                created += self._create_batch(
+                    batch, passwords[start:start + self.batch_size], complete_onboarding
+                )
+
+            if warm:
+                from apps.recommendations.services import recommendation_warmer
+
+                user_ids = [user.id for user in created]
+                transaction.on_commit(lambda: [recommendation_warmer.schedule(uid) for uid in user_ids])
+
+        return {
+            'created': [{'id': user.id, 'username': user.username} for user in created],
+            'skipped': skipped,
+        }
+
+    def _validate(self, rows: List[dict]):
+        accepted, skipped = [], []
+        seen_usernames, seen_emails = set(), set()
+
+        usernames = [row.get('username', '') for row in rows]
+        emails = [row.get('email', '').lower() for row in rows if row.get('email')]
+        taken_usernames, taken_emails = set(), set()
+        for start in range(0, len(rows), self.batch_size):
+            taken_usernames.update(User.objects.filter(
+                username__in=usernames[start:start + self.batch_size]
+            ).values_list('username', flat=True))
+        for start in range(0, len(emails), self.batch_size):
+            taken_emails.update(email.lower() for email in User.objects.filter(
+                email__in=emails[start:start + self.batch_size]
+            ).values_list('email', flat=True))
+
+        for number, row in enumerate(rows, start=1):
+            username, email = row.get('username', ''), row.get('email', '').lower()
+            error = None
+            if not username:
+                error = 'username is required'
+            elif username in taken_usernames or username in seen_usernames:
+                error = 'username already exists'
+            elif email and (email in taken_emails or email in seen_emails):
+                error = 'email already exists'
+            elif row.get('cefr_level', 'A1') not in CEFR_LEVELS:
+                error = f"cefr_level must be one of {', '.join(CEFR_LEVELS)}"
+
+            if error:
+                skipped.append({'row': number, 'username': username, 'error': error})
+                continue
+            seen_usernames.add(username)
+            if email:
+                seen_emails.add(email)
+            accepted.append(row)
+
+        return accepted, skipped
+
+    def _hash(self, raw_passwords: List[Optional[str]]) -> List[str]:
+        """Hash on a process pool; missing passwords become unusable ones inline"""
+        hashed = [None if raw else make_password(None) for raw in raw_passwords]
+        todo = [i for i, raw in enumerate(raw_passwords) if raw]
+
+        if len(todo) <= self.INLINE_HASH_LIMIT or self.workers == 1:
+            for i in todo:
+                hashed[i] = hash_password(raw_passwords[i])
+            return hashed
+
+        chunksize = max(1, len(todo) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            for i, value in zip(todo, pool.map(hash_password, [raw_passwords[i] for i in todo], chunksize=chunksize)):
+                hashed[i] = value
+        return hashed
+
+    def _create_batch(self, rows: List[dict], passwords: List[str], complete_onboarding: bool) -> List[User]:
+        from apps.onboarding.models import UserOnboardingProgress
+
+        now = timezone.now()
+        users = User.objects.bulk_create([
+            User(
+                username=row['username'],
+                email=row.get('email', ''),
+                first_name=row.get('first_name', ''),
+                last_name=row.get('last_name', ''),
+                password=password,
+                date_joined=now,
+            )
+            for row, password in zip(rows, passwords)
+        ])
+
+        profiles, progress = [], []
+        for user, row in zip(users, rows):
+            profile_data = {f: row[f] for f in self.PROFILE_FIELDS if f in row}
+            level = profile_data.get('cefr_level', 'A1')
+            goals = profile_data.get('goals') or {}
+
+            profiles.append(LearningProfile(
+                user=user,
+                current_level=CEFR_LEVELS.index(level) + 1,
+                learning_goal=self._learning_goal(goals),
+                onboarding_completed=complete_onboarding,
+                **profile_data,
+            ))
+
+            # Prefill what the onboarding steps would collect (same keys)
+            collected = {k: v for k, v in profile_data.items() if k not in ('cefr_level', 'timezone')}
+            collected['initial_level'] = CEFR_LEVELS.index(level) + 1
+            progress.append(UserOnboardingProgress(
+                user=user,
+                collected_data=collected,
+                is_completed=complete_onboarding,
+                completed_at=now if complete_onboarding else None,
+            ))
+
+        LearningProfile.objects.bulk_create(profiles)
+        profile_tag_sync.sync(profiles)  # bulk_create skips the post_save sync
+        UserOnboardingProgress.objects.bulk_create(progress)
+        return users
+
+    @staticmethod
+    def _learning_goal(goals) -> str:
+        first = next(iter(goals), None) if goals else None
+        return first if first in LearningProfile.LearningGoal.values else LearningProfile.LearningGoal.GENERAL
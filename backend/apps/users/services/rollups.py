@@ -0,0 +1,145 @@
+"""
+Activity Rollups
+Weekly / monthly totals kept in step with DailyActivity
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from ..models import DailyActivity, MonthlyActivity, WeeklyActivity
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+class ActivityRollups:
+    """
+    Maintains WeeklyActivity and MonthlyActivity.
+
+    apply() adds the same counters a DailyActivity flush added, with one
+    additive upsert per table. backfill() recomputes both tables from
+    DailyActivity with set-based INSERT ... SELECT statements built from
+    the ORM's TruncWeek / TruncMonth aggregation.
+
+    Usage:
+        ActivityRollups().series(user, 'week')  # last 12 months, 1 query
+    """
+
+    FIELDS = (
+        'minutes_studied',
+        'xp_earned',
+        'exercises_completed',
+        'lessons_completed',
+        'words_learned',
+        'words_reviewed',
+    )
+
+    # period -> (model, period column, day -> period start, ORM truncation)
+    PERIODS = {
+        'week': (WeeklyActivity, 'week_start', week_start, TruncWeek),
+        'month': (MonthlyActivity, 'month_start', month_start, TruncMonth),
+    }
+
+    MAX_ROWS_PER_STATEMENT = 500
+
+    def apply(self, daily_rows: Iterable[Tuple[Tuple[int, date], Counter]]):
+        """Add ((user_id, day), counters) rows to every rollup"""
+        daily_rows = list(daily_rows)
+
+        for model, column, to_period, _ in self.PERIODS.values():
+            rolled = defaultdict(Counter)
+            for (user_id, day), counts in daily_rows:
+                rolled[(user_id, to_period(day))].update(counts)
+
+            rows = [
+                (key, counts) for key, counts in rolled.items()
+                if any(counts.get(f) for f in self.FIELDS)
+            ]
+            for start in range(0, len(rows), self.MAX_ROWS_PER_STATEMENT):
+                self._upsert(model, column, rows[start:start + self.MAX_ROWS_PER_STATEMENT])
+
+    def _upsert(self, model, period_column: str, rows):
+        qn = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        user_id, period = qn('user_id'), qn(period_column)
+        columns = [qn(f) for f in self.FIELDS]
+
+        first = 'SELECT ' + ', '.join(f'%s AS {c}' for c in [user_id, period] + columns)
+        other = 'SELECT ' + ', '.join(['%s'] * (len(columns) + 2))
+        source = ' UNION ALL '.join([first] + [other] * (len(rows) - 1))
+
+        params = []
+        for (row_user_id, start), counts in rows:
+            params += [row_user_id, start] + [counts.get(f, 0) for f in self.FIELDS]
+
+        sql = (
+            f"INSERT INTO {table} ({user_id}, {period}, {', '.join(columns)}) "
+            f"SELECT * FROM ({source}) v WHERE 1=1 "
+            f"ON CONFLICT ({user_id}, {period}) DO UPDATE SET "
+            + ', '.join(f"{c} = {table}.{c} + EXCLUDED.{c}" for c in columns)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    @transaction.atomic
+    def backfill(self) -> Dict[str, int]:
+        """
+        Recompute both rollup tables from DailyActivity, entirely in SQL.
+        Returns rows written per period.
+        """
+        qn = connection.ops.quote_name
+        written = {}
+
+        for name, (model, column, _, trunc) in self.PERIODS.items():
+            aggregated = (
+                DailyActivity.objects.annotate(period=trunc('date'))
+                .values('user_id', 'period')
+                .annotate(**{f'total_{f}': Sum(f) for f in self.FIELDS})
+                .values_list('user_id', 'period', *[f'total_{f}' for f in self.FIELDS])
+                .order_by()
+            )
+            select_sql, params = aggregated.query.sql_with_params()
+
+            table = qn(model._meta.db_table)
+            columns = [qn(f) for f in self.FIELDS]
+            user_id, period = qn('user_id'), qn(column)
+
+            sql = (
+                f"INSERT INTO {table} ({user_id}, {period}, {', '.join(columns)}) "
+                f"SELECT * FROM ({select_sql}) r WHERE 1=1 "
+                f"ON CONFLICT ({user_id}, {period}) DO UPDATE SET "
+                + ', '.join(f"{c} = EXCLUDED.{c}" for c in columns)
+            )
+
+            # ON CONFLICT covers rows a concurrent flush adds after the DELETE
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table}")
+                cursor.execute(sql, params)
+                written[name] = cursor.rowcount
+
+        return written
+
+    def series(self, user, period: str = 'week', months: int = 12) -> List[dict]:
+        """Rollup rows for the last `months` months, oldest first (1 query)"""
+        model, column, to_period, _ = self.PERIODS[period]
+
+        since = to_period(timezone.localdate() - timedelta(days=months * 366 // 12))
+        rows = (
+            model.objects.filter(user=user, **{f'{column}__gte': since})
+            .order_by(column)
+            .values(column, *self.FIELDS)
+        )
+        return [
+            {'period_start': row.pop(column), **row}
+            for row in rows
+        ]
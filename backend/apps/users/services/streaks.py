@@ -0,0 +1,266 @@
+"""
+Streak Engine
+Keeps LearningProfile.streak_days / longest_streak up to date incrementally
+"""
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import DailyActivity, LearningProfile
+
+
+class StreakEngine:
+    """
+    O(1) streak maintenance: each activity day only compares against
+    last_activity_date, never the DailyActivity history.
+
+    Missed days can be bridged with streak freezes (bought with XP). A
+    bridged day gets a DailyActivity row with streak_frozen=True, so the
+    set-based rebuild() sees the same islands as the incremental path.
+
+    Usage:
+        engine = StreakEngine()
+        engine.buy_freeze(user)
+        engine.current_streak(profile)
+
+        # Maintained by ActivityAggregator.flush() via apply()
+    """
+
+    MAX_FREEZES = 2
+
+    STREAK_FIELDS = ['streak_days', 'longest_streak', 'last_activity_date', 'streak_freezes']
+
+    MAX_ROWS_PER_STATEMENT = 500
+
+    # ------------------------------------------------------------------
+    # Day boundaries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def zone(profile: Optional[LearningProfile]):
+        name = profile.timezone if profile else settings.TIME_ZONE
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo(settings.TIME_ZONE)
+
+    @classmethod
+    def local_date(cls, profile: Optional[LearningProfile], at: datetime = None) -> date:
+        """The user's calendar day for a moment (default: now)"""
+        return timezone.localtime(at or timezone.now(), cls.zone(profile)).date()
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def advance(self, profile: LearningProfile, day: date) -> List[date]:
+        """
+        Apply one activity day to a profile in memory.
+
+        Returns:
+            Days bridged with streak freezes (empty if none)
+        """
+        last = profile.last_activity_date
+        if last is not None and day <= last:
+            return []  # same day, or a late event for an earlier day
+
+        bridged = []
+        if last is None:
+            profile.streak_days = 1
+        else:
+            missed = (day - last).days - 1
+            if missed == 0:
+                profile.streak_days += 1
+            elif missed <= profile.streak_freezes:
+                profile.streak_freezes -= missed
+                profile.streak_days += 1
+                bridged = [last + timedelta(days=i + 1) for i in range(missed)]
+            else:
+                profile.streak_days = 1
+
+        profile.last_activity_date = day
+        profile.longest_streak = max(profile.longest_streak, profile.streak_days)
+        return bridged
+
+    def apply(self, profiles: Dict[int, LearningProfile], days_by_user: Dict[int, Iterable[date]]):
+        """
+        Advance many profiles (already locked by the caller) and save them.
+        Queries: 1 bulk update + 1 insert if any freezes were used.
+        """
+        changed, frozen = [], []
+
+        for user_id, days in days_by_user.items():
+            profile = profiles.get(user_id)
+            if profile is None:
+                continue
+
+            before = profile.last_activity_date
+            for day in sorted(set(days)):
+                frozen += [
+                    DailyActivity(user_id=user_id, date=d, streak_frozen=True)
+                    for d in self.advance(profile, day)
+                ]
+            if profile.last_activity_date != before:
+                changed.append(profile)
+
+        if changed:
+            LearningProfile.objects.bulk_update(changed, self.STREAK_FIELDS)
+        if frozen:
+            DailyActivity.objects.bulk_create(frozen, ignore_conflicts=True)
+
+    def record_day(self, user, day: date = None) -> LearningProfile:
+        """Apply one activity day for a single user"""
+        with transaction.atomic():
+            profile = LearningProfile.objects.select_for_update().get(user=user)
+            self.apply({profile.user_id: profile}, {profile.user_id: [day or self.local_date(profile)]})
+        return profile
+
+    # ------------------------------------------------------------------
+    # Reads / purchases
+    # ------------------------------------------------------------------
+
+    def current_streak(self, profile: LearningProfile, today: date = None) -> int:
+        """
+        Streak as the user sees it now: the stored counter only resets on
+        the next activity, so a lapse not covered by freezes shows as 0.
+        """
+        if profile.last_activity_date is None:
+            return 0
+
+        today = today or self.local_date(profile)
+        missed = (today - profile.last_activity_date).days - 1
+        return profile.streak_days if missed <= profile.streak_freezes else 0
+
+    @transaction.atomic
+    def buy_freeze(self, user) -> dict:
+        """
+        Spend LEARNING_CONFIG['streak_freeze_cost'] XP on one freeze.
+        The conditional UPDATE locks the profile, so concurrent purchases
+        can't overspend; the XP is debited through the ledger.
+        """
+        from .xp import XPLedger
+
+        cost = settings.LEARNING_CONFIG['streak_freeze_cost']
+
+        bought = LearningProfile.objects.filter(
+            user=user,
+            total_xp__gte=cost,
+            streak_freezes__lt=self.MAX_FREEZES,
+        ).update(streak_freezes=F('streak_freezes') + 1)
+
+        if bought:
+            XPLedger().grant(user, -cost, 'streak_freeze')
+
+        profile = LearningProfile.objects.only('total_xp', 'streak_freezes').get(user=user)
+        return {
+            'purchased': bool(bought),
+            'cost': cost,
+            'streak_freezes': profile.streak_freezes,
+            'total_xp': profile.total_xp,
+        }
+
+    # ------------------------------------------------------------------
+    # Full rebuild
+    # ------------------------------------------------------------------
+
+    @transaction.atomic
+    def rebuild(self) -> int:
+        """
+        Recompute streak_days, longest_streak and last_activity_date for
+        every user from DailyActivity in one statement (gaps and islands:
+        consecutive days share date - row_number). Frozen days join
+        islands but don't count towards their length, as in advance().
+        Returns profiles updated.
+
+        Vendors without the date arithmetic below fall back to the same
+        grouping in Python over the rows sorted by user and day.
+        """
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            return self._rebuild_in_python()
+
+        qn = connection.ops.quote_name
+        activities = qn(DailyActivity._meta.db_table)
+        profiles = qn(LearningProfile._meta.db_table)
+        user_id, day = qn('user_id'), qn('date')
+
+        row_number = f"ROW_NUMBER() OVER (PARTITION BY {user_id} ORDER BY {day})"
+        if connection.vendor == 'postgresql':
+            island = f"{day} - CAST({row_number} AS INTEGER)"
+        else:
+            island = f"julianday({day}) - {row_number}"
+
+        sql = f"""
+            UPDATE {profiles}
+            SET {qn('streak_days')} = ranked.length,
+                {qn('longest_streak')} = ranked.longest,
+                {qn('last_activity_date')} = ranked.last_day
+            FROM (
+                WITH days AS (
+                    SELECT {user_id}, {day}, {qn('streak_frozen')} AS frozen, {island} AS island
+                    FROM {activities}
+                ),
+                islands AS (
+                    SELECT {user_id}, island,
+                           SUM(CASE WHEN frozen THEN 0 ELSE 1 END) AS length,
+                           MAX({day}) AS last_day
+                    FROM days
+                    GROUP BY {user_id}, island
+                )
+                SELECT {user_id}, length, last_day,
+                       MAX(length) OVER (PARTITION BY {user_id}) AS longest,
+                       ROW_NUMBER() OVER (PARTITION BY {user_id} ORDER BY last_day DESC) AS recency
+                FROM islands
+            ) ranked
+            WHERE ranked.recency = 1
+              AND {profiles}.{user_id} = ranked.{user_id}
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.rowcount
+
+    @transaction.atomic
+    def _rebuild_in_python(self) -> int:
+        """rebuild() for any vendor: one pass over DailyActivity, batched updates"""
+        rows = (
+            DailyActivity.objects.order_by('user_id', 'date')
+            .values_list('user_id', 'date', 'streak_frozen')
+            .iterator(chunk_size=5000)
+        )
+
+        updated, batch = 0, []
+        for user_id, days in groupby(rows, key=itemgetter(0)):
+            length = longest = 0
+            previous = None
+            for _, day, frozen in days:
+                if previous is None or (day - previous).days > 1:
+                    length = 0  # a new island
+                length += 0 if frozen else 1
+                longest = max(longest, length)
+                previous = day
+            batch.append(LearningProfile(
+                user_id=user_id, streak_days=length, longest_streak=longest, last_activity_date=previous,
+            ))
+            if len(batch) == self.MAX_ROWS_PER_STATEMENT:
+                updated += self._save_rebuilt(batch)
+                batch = []
+        if batch:
+            updated += self._save_rebuilt(batch)
+        return updated
+
+    def _save_rebuilt(self, rebuilt: List[LearningProfile]) -> int:
+        ids = dict(
+            LearningProfile.objects.filter(user_id__in=[p.user_id for p in rebuilt]).values_list('user_id', 'id')
+        )
+        profiles = [p for p in rebuilt if p.user_id in ids]
+        for profile in profiles:
+            profile.id = ids[profile.user_id]
+        LearningProfile.objects.bulk_update(profiles, self.STREAK_FIELDS[:3])
+        return len(profiles)
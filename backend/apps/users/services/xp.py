@@ -0,0 +1,171 @@
+"""
+XP Ledger
+Race-free XP accounting: append-only grants plus additive profile updates
+"""
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.events.models import LearningEvent
+from apps.events.services import event_log
+from ..models import LearningProfile, XPGrant
+from .activity import record_activity
+from .leaderboard import leaderboards
+
+# (user or user_id, amount, source, key or None)
+Grant = Tuple[object, int, str, Optional[str]]
+
+
+class XPLedger:
+    """
+    Applies XP grants without read-modify-write in Python.
+
+    grant_many() runs three statements for any number of grants:
+      1. SELECT ... FOR UPDATE the profiles of the granted users, in
+         user order: locks them and reads the levels before the grant;
+         grants to users without a profile are dropped here
+      2. INSERT the grants ... ON CONFLICT (key) DO NOTHING RETURNING,
+         so only grants whose key is new are credited
+      3. UPDATE learning_profiles SET total_xp = total_xp + delta, with
+         the level-up CASE, for all credited users ... RETURNING the new
+         totals and levels
+
+    and appends one XP_GRANTED event per credited grant to the event log.
+
+    Usage:
+        XPLedger().grant(user, 25, 'milestone', key=f'milestone:{progress.id}')
+        XPLedger().grant_many([(user_id, 10, 'exercise', None), ...])
+    """
+
+    XP_PER_LEVEL = 1000
+    MAX_LEVEL = 10
+
+    # Keeps bound parameters under SQLite's limit
+    MAX_ROWS_PER_STATEMENT = 500
+
+    def grant(self, user, amount: int, source: str = 'other', key: str = None) -> Optional[dict]:
+        """
+        Grant XP to one user.
+
+        Returns:
+            {'new_total_xp', 'current_level', 'leveled_up'}, or None if the
+            key was already used or the user has no learning profile
+        """
+        user_id = getattr(user, 'id', user)
+        return self.grant_many([(user_id, amount, source, key)]).get(user_id)
+
+    @transaction.atomic
+    def grant_many(self, grants: Iterable[Grant]) -> Dict[int, dict]:
+        """Apply a batch of grants. Returns results per credited user."""
+        rows = [
+            (getattr(user, 'id', user), amount, source, key or uuid.uuid4().hex)
+            for user, amount, source, key in grants
+            if amount
+        ]
+        if not rows:
+            return {}
+
+        user_ids = sorted({user_id for user_id, _, _, _ in rows})
+        levels_before = {}
+        for start in range(0, len(user_ids), self.MAX_ROWS_PER_STATEMENT):
+            levels_before.update(self._lock_profiles(user_ids[start:start + self.MAX_ROWS_PER_STATEMENT]))
+        rows = [row for row in rows if row[0] in levels_before]
+        if not rows:
+            return {}
+
+        deltas, events = defaultdict(int), []
+        for start in range(0, len(rows), self.MAX_ROWS_PER_STATEMENT):
+            for user_id, amount, source in self._insert_grants(rows[start:start + self.MAX_ROWS_PER_STATEMENT]):
+                deltas[user_id] += amount
+                events.append((LearningEvent.Kind.XP_GRANTED, user_id, {'amount': amount, 'source': source}))
+        event_log.append_many(events)
+
+        results, cefr_levels = {}, {}
+        items = [(u, d) for u, d in deltas.items() if d]
+        for start in range(0, len(items), self.MAX_ROWS_PER_STATEMENT):
+            self._apply_deltas(items[start:start + self.MAX_ROWS_PER_STATEMENT], levels_before, results, cefr_levels)
+
+        # Earned XP counts towards the day (spent XP does not)
+        for user_id, delta in deltas.items():
+            if delta > 0 and user_id in results:
+                record_activity(user_id, xp_earned=delta)
+
+        from apps.progress.services.dashboard import invalidate_dashboards
+
+        def update_read_models():
+            for user_id, result in results.items():
+                leaderboards.record_total(user_id, result['new_total_xp'], cefr_levels[user_id])
+            invalidate_dashboards(results)
+
+        transaction.on_commit(update_read_models)
+        return results
+
+    @staticmethod
+    def _lock_profiles(user_ids) -> Dict[int, int]:
+        """user_id -> stored current_level, locking the rows until commit"""
+        return dict(
+            LearningProfile.objects.select_for_update()
+            .filter(user_id__in=user_ids)
+            .order_by('user_id')
+            .values_list('user_id', 'current_level')
+        )
+
+    def _insert_grants(self, rows):
+        qn = connection.ops.quote_name
+        now = timezone.now()
+
+        values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))
+        params = []
+        for user_id, amount, source, key in rows:
+            params += [user_id, amount, source, key, now]
+
+        sql = (
+            f"INSERT INTO {qn(XPGrant._meta.db_table)} "
+            f"({qn('user_id')}, {qn('amount')}, {qn('source')}, {qn('key')}, {qn('created_at')}) "
+            f"VALUES {values} "
+            f"ON CONFLICT ({qn('key')}) DO NOTHING "
+            f"RETURNING {qn('user_id')}, {qn('amount')}, {qn('source')}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _apply_deltas(
+        self, items, levels_before: Dict[int, int], results: Dict[int, dict], cefr_levels: Dict[int, str],
+    ):
+        qn = connection.ops.quote_name
+        table = qn(LearningProfile._meta.db_table)
+        user_id, total, level = qn('user_id'), qn('total_xp'), qn('current_level')
+
+        first = f'SELECT %s AS {user_id}, %s AS delta'
+        source = ' UNION ALL '.join([first] + ['SELECT %s, %s'] * (len(items) - 1))
+        params = [value for item in items for value in item]
+
+        # Levels never go down (spending XP keeps the level)
+        earned_level = f"(1 + ({table}.{total} + v.delta) / {self.XP_PER_LEVEL})"
+        sql = (
+            f"UPDATE {table} SET "
+            f"{total} = {table}.{total} + v.delta, "
+            f"{level} = CASE "
+            f"WHEN {earned_level} <= {table}.{level} THEN {table}.{level} "
+            f"WHEN {earned_level} > {self.MAX_LEVEL} THEN {self.MAX_LEVEL} "
+            f"ELSE {earned_level} END "
+            f"FROM ({source}) v "
+            f"WHERE {table}.{user_id} = v.{user_id} "
+            f"RETURNING {table}.{user_id}, {table}.{total}, {table}.{level}, {table}.{qn('cefr_level')}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            returned = cursor.fetchall()
+
+        # Level-up against the stored level, which spending XP never lowers
+        for row_user_id, new_total, new_level, cefr_level in returned:
+            results[row_user_id] = {
+                'new_total_xp': new_total,
+                'current_level': new_level,
+                'leveled_up': new_level > levels_before[row_user_id],
+            }
+            cefr_levels[row_user_id] = cefr_level
@@ -1,3 +1,227 @@
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from .models import DailyActivity, LearningProfile, XPGrant
+from .services.activity import ActivityAggregator
+from .services.leaderboard import LeaderboardService
+from .services.streaks import StreakEngine
+from .services.xp import XPLedger
+
+User = get_user_model()
+
+
+class XPLedgerTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ana', password='x')
+        LearningProfile.objects.create(user=self.user)
+        self.ledger = XPLedger()
+
+    def test_grant_many_credits_each_key_once(self):
+        grants = [(self.user.id, 10, 'exercise', 'attempt:1'), (self.user.id, 15, 'exercise', 'attempt:2')]
+
+        first = self.ledger.grant_many(grants)
+        replay = self.ledger.grant_many(grants + [(self.user.id, 5, 'exercise', 'attempt:3')])
+
+        self.assertEqual(first[self.user.id]['new_total_xp'], 25)
+        self.assertEqual(replay[self.user.id]['new_total_xp'], 30)
+        self.assertEqual(XPGrant.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(LearningProfile.objects.get(user=self.user).total_xp, 30)
+
+    def test_used_key_returns_none(self):
+        self.ledger.grant(self.user, 10, key='milestone:1')
+
+        self.assertIsNone(self.ledger.grant(self.user, 10, key='milestone:1'))
+
+    def test_level_up_is_reported_once(self):
+        below = self.ledger.grant(self.user, 999)
+        crossing = self.ledger.grant(self.user, 1)
+        after = self.ledger.grant(self.user, 1)
+
+        self.assertFalse(below['leveled_up'])
+        self.assertTrue(crossing['leveled_up'])
+        self.assertEqual(crossing['current_level'], 2)
+        self.assertFalse(after['leveled_up'])
+
+    def test_earning_back_spent_xp_is_not_a_level_up(self):
+        self.ledger.grant(self.user, 1100)
+        spent = self.ledger.grant(self.user, -200, 'streak_freeze')
+        earned = self.ledger.grant(self.user, 50)
+
+        self.assertEqual(spent['current_level'], 2)  # levels never go down
+        self.assertEqual(earned['new_total_xp'], 950)
+        self.assertFalse(earned['leveled_up'])
+
+    def test_users_without_profile_are_skipped(self):
+        other = User.objects.create_user(username='ben', password='x')
+
+        results = self.ledger.grant_many([(other.id, 10, 'other', None), (self.user.id, 10, 'other', None)])
+
+        self.assertEqual(list(results), [self.user.id])
+        self.assertFalse(XPGrant.objects.filter(user=other).exists())
+
+
+class ActivityAggregatorTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ana', password='x')
+        self.profile = LearningProfile.objects.create(user=self.user, daily_goal_minutes=10)
+        self.today = StreakEngine.local_date(self.profile)
+
+    def test_events_for_a_day_merge_into_one_row(self):
+        aggregator = ActivityAggregator()
+        aggregator.add(self.user, minutes_studied=6, xp_earned=10)
+        aggregator.add(self.user, minutes_studied=2, exercises_completed=1)
+        aggregator.add(self.user, day=self.today, words_reviewed=3)  # explicit day, same row
+
+        self.assertEqual(aggregator.flush(), 1)
+
+        row = DailyActivity.objects.get(user=self.user)
+        self.assertEqual(row.date, self.today)
+        self.assertEqual(
+            (row.minutes_studied, row.xp_earned, row.exercises_completed, row.words_reviewed),
+            (8, 10, 1, 3),
+        )
+        self.assertFalse(row.daily_goal_met)
+
+    def test_flushes_add_to_the_stored_row(self):
+        for minutes in (6, 5):
+            aggregator = ActivityAggregator()
+            aggregator.add(self.user, minutes_studied=minutes, xp_earned=1)
+            aggregator.flush()
+
+        row = DailyActivity.objects.get(user=self.user)
+        self.assertEqual((row.minutes_studied, row.xp_earned), (11, 2))
+        self.assertTrue(row.daily_goal_met)
+
+    def test_unknown_counter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ActivityAggregator().add(self.user, pages_read=1)
+
+
+class StreakEngineTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='ana', password='x')
+        self.profile = LearningProfile.objects.create(user=self.user)
+        self.engine = StreakEngine()
+
+    def test_consecutive_days_extend_the_streak(self):
+        start = date(2026, 3, 2)
+        for offset in range(3):
+            self.engine.advance(self.profile, start + timedelta(days=offset))
+
+        self.assertEqual(self.profile.streak_days, 3)
+        self.assertEqual(self.profile.longest_streak, 3)
+
+    def test_freeze_bridges_a_missed_day(self):
+        self.profile.streak_freezes = 1
+        self.engine.advance(self.profile, date(2026, 3, 2))
+
+        bridged = self.engine.advance(self.profile, date(2026, 3, 4))
+
+        self.assertEqual(bridged, [date(2026, 3, 3)])
+        self.assertEqual(self.profile.streak_days, 2)
+        self.assertEqual(self.profile.streak_freezes, 0)
+
+    def test_gap_without_freezes_resets(self):
+        self.engine.advance(self.profile, date(2026, 3, 2))
+        self.engine.advance(self.profile, date(2026, 3, 3))
+
+        self.assertEqual(self.engine.advance(self.profile, date(2026, 3, 6)), [])
+        self.assertEqual(self.profile.streak_days, 1)
+        self.assertEqual(self.profile.longest_streak, 2)
+
+    def test_apply_stores_frozen_days(self):
+        LearningProfile.objects.filter(pk=self.profile.pk).update(streak_freezes=1)
+        profile = LearningProfile.objects.get(pk=self.profile.pk)
+
+        self.engine.apply({self.user.id: profile}, {self.user.id: [date(2026, 3, 2), date(2026, 3, 4)]})
+
+        frozen = DailyActivity.objects.get(user=self.user)
+        self.assertEqual(frozen.date, date(2026, 3, 3))
+        self.assertTrue(frozen.streak_frozen)
+
+    def _rebuild_fixture(self):
+        # Islands: 2-4 (3 days), then 10-12 with the 11th frozen (2 days)
+        for day in (2, 3, 4, 10, 11, 12):
+            DailyActivity.objects.create(user=self.user, date=date(2026, 3, day), streak_frozen=day == 11)
+
+    def test_rebuild_matches_the_incremental_counters(self):
+        self._rebuild_fixture()
+
+        self.assertEqual(self.engine.rebuild(), 1)
+
+        profile = LearningProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual((profile.streak_days, profile.longest_streak), (2, 3))
+        self.assertEqual(profile.last_activity_date, date(2026, 3, 12))
+
+    def test_python_rebuild_matches_the_sql_one(self):
+        self._rebuild_fixture()
+
+        self.assertEqual(self.engine._rebuild_in_python(), 1)
+
+        profile = LearningProfile.objects.get(pk=self.profile.pk)
+        self.assertEqual((profile.streak_days, profile.longest_streak), (2, 3))
+        self.assertEqual(profile.last_activity_date, date(2026, 3, 12))
+
+
+class LeaderboardServiceTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'leaderboards.json'
+        self.service = LeaderboardService(checkpoint_path=self.path)
+        self.service.reload()
+
+    def at(self, *args):
+        return mock.patch('django.utils.timezone.now', return_value=datetime(*args, tzinfo=dt_timezone.utc))
+
+    def test_only_ended_local_weeks_are_pruned(self):
+        with self.at(2026, 3, 8, 10):  # Sunday in both zones
+            self.service.record_weekly([(1, date(2026, 3, 8), 10, 'UTC'), (2, date(2026, 3, 8), 20, 'Asia/Tokyo')])
+
+        with self.at(2026, 3, 8, 16):  # Monday 01:00 in Tokyo
+            self.service._prune_weekly(force=True)
+
+        self.assertEqual(self.service.rank('weekly', 1)['score'], 10)
+        self.assertIsNone(self.service.rank('weekly', 2)['rank'])
+        self.assertEqual(list(self.service._week_buckets), [(date(2026, 3, 2), 'UTC')])
+
+    def test_checkpoint_is_written_without_holding_the_board_lock(self):
+        real_write_text, lock_free = Path.write_text, []
+
+        def write_text(path, text):
+            def try_lock():
+                acquired = self.service._lock.acquire(timeout=1)
+                if acquired:
+                    self.service._lock.release()
+                lock_free.append(acquired)
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            return real_write_text(path, text)
+
+        with mock.patch.object(Path, 'write_text', autospec=True, side_effect=write_text):
+            self.service.record_total(1, 100, 'A1', 'ana')
+
+        self.assertEqual(lock_free, [True])
+        self.assertTrue(self.path.exists())
+
+    def test_checkpoint_restores_weekly_buckets(self):
+        with self.at(2026, 3, 8, 10):
+            self.service.record_weekly([(1, date(2026, 3, 8), 10, 'Asia/Tokyo')])
+            self.service.checkpoint()
+
+            restored = LeaderboardService(checkpoint_path=self.path)
+            self.assertTrue(restored._load_checkpoint())
+
+        self.assertEqual(restored._week_of, {1: (date(2026, 3, 2), 'Asia/Tokyo')})
+        self.assertEqual(restored.rank('weekly', 1)['score'], 10)
@@ -0,0 +1,27 @@
+"""
+Users API URLs
+"""
+from django.urls import path
+from . import views
+
+app_name = 'users'
+
+urlpatterns = [
+    # Streaks
+    path('streak/', views.my_streak, name='my_streak'),
+    path('streak/freeze/', views.buy_streak_freeze, name='buy_streak_freeze'),
+    
+    # Progress charts
+    path('charts/', views.activity_chart, name='activity_chart'),
+    
+    # Data export
+    path('export/', views.export_my_data, name='export_my_data'),
+    
+    # Cohort provisioning (staff)
+    path('provision/', views.provision_users, name='provision_users'),
+    
+    # Leaderboards
+    path('leaderboard/<str:board>/top/', views.leaderboard_top, name='leaderboard_top'),
+    path('leaderboard/<str:board>/around-me/', views.leaderboard_around_me, name='leaderboard_around_me'),
+    path('leaderboard/<str:board>/rank/', views.leaderboard_rank, name='leaderboard_rank'),
+]
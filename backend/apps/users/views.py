@@ -1,3 +1,203 @@
-from django.shortcuts import render
+"""
+Users API Views
+"""
+import json
 
-# Create your views here.
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+
+from .models import LearningProfile
+from .services import ActivityRollups, StreakEngine, UserDataExporter, UserProvisioner, leaderboards
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_streak(request):
+    """
+    GET /api/v1/users/streak/
+    Get the current streak, longest streak and available freezes
+    """
+    profile = LearningProfile.objects.filter(user=request.user).first()
+    if not profile:
+        return Response({'error': 'Learning profile not found'}, status=404)
+    
+    return Response({
+        'current_streak': StreakEngine().current_streak(profile),
+        'longest_streak': profile.longest_streak,
+        'last_activity_date': profile.last_activity_date,
+        'streak_freezes': profile.streak_freezes,
+        'timezone': profile.timezone,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def buy_streak_freeze(request):
+    """
+    POST /api/v1/users/streak/freeze/
+    Spend XP on a streak freeze (covers one missed day)
+    """
+    if not LearningProfile.objects.filter(user=request.user).exists():
+        return Response({'error': 'Learning profile not found'}, status=404)
+    
+    result = StreakEngine().buy_freeze(request.user)
+    
+    if not result['purchased']:
+        return Response({
+            'error': 'Not enough XP or freeze limit reached',
+            **result,
+        }, status=400)
+    
+    return Response(result)
+
+
+def _board_args(request, board):
+    """Validated (board, level, limit) from the URL and query string"""
+    if board not in leaderboards.BOARDS:
+        return None
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+    except ValueError:
+        limit = 10
+    return board, request.query_params.get('level') or None, limit
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_top(request, board):
+    """
+    GET /api/v1/users/leaderboard/<global|weekly|level>/top/?limit=10&level=A2
+    Get the top of a leaderboard (level board defaults to your CEFR level)
+    """
+    args = _board_args(request, board)
+    if not args:
+        return Response({'error': 'Leaderboard not found'}, status=404)
+    board, level, limit = args
+    
+    if board == leaderboards.LEVEL and not level:
+        level = leaderboards.rank(board, request.user.id)['level']
+    
+    return Response({
+        'board': board,
+        'level': level,
+        'entries': leaderboards.top(board, limit, level=level),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_around_me(request, board):
+    """
+    GET /api/v1/users/leaderboard/<board>/around-me/?limit=5
+    Get the users ranked just above and below you (limit = radius)
+    """
+    args = _board_args(request, board)
+    if not args:
+        return Response({'error': 'Leaderboard not found'}, status=404)
+    board, level, radius = args
+    
+    return Response({
+        **leaderboards.rank(board, request.user.id, level=level),
+        'entries': leaderboards.around(board, request.user.id, radius, level=level),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_rank(request, board):
+    """
+    GET /api/v1/users/leaderboard/<board>/rank/
+    Get your rank and score on a leaderboard
+    """
+    args = _board_args(request, board)
+    if not args:
+        return Response({'error': 'Leaderboard not found'}, status=404)
+    board, level, _ = args
+    
+    return Response(leaderboards.rank(board, request.user.id, level=level))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def activity_chart(request):
+    """
+    GET /api/v1/users/charts/?period=week|month&months=12
+    Get weekly or monthly totals (minutes, XP, exercises, words) for charts
+    """
+    period = request.query_params.get('period', 'week')
+    if period not in ActivityRollups.PERIODS:
+        return Response({'error': 'period must be week or month'}, status=400)
+    
+    try:
+        months = min(max(int(request.query_params.get('months', 12)), 1), 24)
+    except ValueError:
+        months = 12
+    
+    return Response({
+        'period': period,
+        'months': months,
+        'series': ActivityRollups().series(request.user, period, months),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_my_data(request):
+    """
+    GET /api/v1/users/export/?output=ndjson|csv
+    Download all your data, streamed (NDJSON, or a zip with one CSV per table)
+    """
+    exporter = UserDataExporter()
+    fmt = request.query_params.get('output', exporter.NDJSON)
+    if fmt not in exporter.FORMATS:
+        return Response({'error': 'output must be ndjson or csv'}, status=400)
+    
+    response = StreamingHttpResponse(
+        exporter.iter_export(request.user, fmt),
+        content_type=exporter.content_type(fmt),
+    )
+    response['Content-Disposition'] = f'attachment; filename="{exporter.filename(request.user, fmt)}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def provision_users(request):
+    """
+    POST /api/v1/users/provision/
+    Create a cohort of accounts (staff only)
+    
+    Body: JSON {"users": [...], "defaults": {...}, "complete_onboarding": false}
+    or multipart with a CSV "file" (header: username,email,password,...)
+    plus optional "defaults" (JSON string) and "complete_onboarding"
+    """
+    upload = request.FILES.get('file')
+    defaults = request.data.get('defaults') or {}
+    complete = request.data.get('complete_onboarding', False)
+    
+    try:
+        if upload:
+            rows = UserProvisioner.parse_csv(upload.read())
+        else:
+            rows = request.data.get('users') or []
+        if isinstance(defaults, str):
+            defaults = json.loads(defaults)
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({'error': f'Invalid input: {e}'}, status=400)
+    
+    if not isinstance(rows, list) or not isinstance(defaults, dict) or not rows:
+        return Response({'error': 'Provide a non-empty "users" list or a CSV "file"'}, status=400)
+    
+    result = UserProvisioner().provision(
+        rows,
+        defaults=defaults,
+        complete_onboarding=str(complete).lower() in ('1', 'true', 'yes'),
+    )
+    return Response({
+        'created_count': len(result['created']),
+        'skipped_count': len(result['skipped']),
+        **result,
+    }, status=201 if result['created'] else 200)
@@ -3,6 +3,8 @@
 Fix display names encoding for tags
 """
 
+from django.utils import timezone
+
 from apps.memory_palace.models import Tag
 
 LABEL_FIXES = {
@@ -58,7 +60,7 @@ LABEL_FIXES = {
 print("Fixing display names...")
 
 for (tag_type, value), label in LABEL_FIXES.items():
-    updated = Tag.objects.filter(type=tag_type, value=value).update(display_name=label)
+    updated = Tag.objects.filter(type=tag_type, value=value).update(display_name=label, updated_at=timezone.now())
     if updated:
         print(f"Fixed: {tag_type}:{value} -> {label}")
 
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'corsheaders',
     
     # YoPuedo360 apps
+    'apps.core',
     'apps.users',
     'apps.onboarding',
     'apps.content',
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     'apps.ai_engine',
     'apps.recommendations',
     'apps.exercises',
+    'apps.events',
 ]
 
 MIDDLEWARE = [
@@ -58,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.users.middleware.ActivityBatchMiddleware',
 ]
 
 ROOT_URLCONF = 'yopuedo360.urls'
@@ -103,6 +106,29 @@ else:
     }
 
 
+# Cache
+# Shared by every worker: learning sessions, placement tests, onboarding
+# drafts, dashboard snapshots, warmup flags and catalogue versions live
+# here. Redis when REDIS_URL is set, otherwise a table in the main
+# database (created by the core app's migrations).
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -192,6 +218,62 @@ LEARNING_CONFIG = {
     'streak_freeze_cost': 50,  # XP cost for streak freeze
 }
 
+# Learning events (attempts, reviews, progress) are written behind the request
+LEARNING_EVENTS = {
+    'write_behind': os.environ.get('LEARNING_EVENTS_WRITE_BEHIND', 'True') == 'True',
+    'max_batch': 200,
+    'flush_interval_seconds': 1.0,
+    'spool_dir': BASE_DIR / 'var' / 'spool',
+    'fsync': True,
+}
+
+# Learning event log: projections fed by run_event_consumers
+EVENT_LOG = {
+    'consumers': [
+        'apps.progress.services.LearningStatsProjection',
+        'apps.progress.services.ScenarioStatsProjection',
+    ],
+    'batch_size': 1000,
+}
+
+# Recommendation call logging (sampled, written by a background thread)
+RECOMMENDATION_LOG = {
+    'enabled': True,
+    'sample_rate': float(os.environ.get('RECOMMENDATION_LOG_SAMPLE_RATE', '0.1')),
+    'max_queue': 10000,
+    'batch_size': 200,
+    'flush_interval_seconds': 2.0,
+}
+
+# Background ranking of a user's scenarios right after onboarding
+RECOMMENDATION_WARMUP = {
+    'enabled': True,
+    'max_workers': 2,
+    'in_flight_seconds': 120,  # engine serves a local ordering meanwhile
+}
+
+# AI re-ranking: only a locally scored shortlist goes into the prompt
+RECOMMENDATION_AI_RANKING = {
+    'shortlist_size': int(os.environ.get('RECOMMENDATION_AI_SHORTLIST', '30')),
+    'max_prompt_tokens': 1500,
+    'max_response_tokens': 1000,  # cap; the request asks for what the shortlist needs
+}
+
+# Recommendation stage timings go to these sinks: callable(stage, elapsed_ms)
+RECOMMENDATION_TIMING = {
+    'sinks': [
+        'apps.recommendations.services.timing.stage_metrics',
+        'apps.recommendations.services.timing.log_stage',
+    ],
+}
+
+# XP leaderboards (in-memory, checkpointed to disk)
+LEADERBOARDS = {
+    'checkpoint_path': BASE_DIR / 'var' / 'leaderboards.json',
+    'checkpoint_seconds': 60,
+    'refresh_seconds': 900,
+}
+
 # Spaced Repetition (SM-2 Algorithm) Configuration
 SPACED_REPETITION = {
     'initial_ease_factor': 2.5,
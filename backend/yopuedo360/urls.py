@@ -27,8 +27,10 @@ urlpatterns = [
     # Progress API
     path('api/v1/progress/', include('apps.progress.urls')),
     
+    # Users API (streaks)
+    path('api/v1/users/', include('apps.users.urls')),
+    
     # Future: Other APIs
-    # path('api/v1/users/', include('apps.users.urls')),
     # path('api/v1/content/', include('apps.content.urls')),
     # path('api/v1/worlds/', include('apps.memory_palace.urls')),
     # path('api/v1/avatar/', include('apps.avatar.urls')),